@@ -6,19 +6,29 @@
 
 from __future__ import unicode_literals
 
+import functools
+
 from csv import (QUOTE_MINIMAL, QUOTE_ALL, QUOTE_NONNUMERIC, QUOTE_NONE,
                  Error, Dialect, excel, excel_tab, field_size_limit,
                  register_dialect, get_dialect, list_dialects,
                  unregister_dialect)
 
-from ._common import ENCODING, DIALECT, ROWTYPE
+from ._common import ENCODING, DIALECT, ROWTYPE, BUFFER_SIZE
 from .dialects import unix_dialect
-from .extras import NamedTupleReader, NamedTupleWriter
-from .openers import open_reader, open_writer
+from .extras import (NamedTupleReader, NamedTupleWriter,
+                     DataclassReader, DataclassWriter)
+from .lazy import LazyReader, LazyWriter
+from .openers import open_reader, open_writer, RowIterator
 from .readers import reader, DictReader
+from .stats import Stats
 from .writers import writer, DictWriter
 
-from .shortcuts import read_csv, write_csv
+from .shortcuts import read_csv, write_csv, count_rows, tail
+from .external import sort_csv, join_csv
+from .sharding import RollingWriter, PartitionedWriter
+from .parallel import read_many
+from .schema import infer_schema
+from .dbapi import to_sqlite, write_cursor
 
 __all__ = ['open_csv',
            'open_reader', 'open_writer',
@@ -27,7 +37,16 @@ __all__ = ['open_csv',
            'DictReader', 'DictWriter',
            'unix_dialect',
            'NamedTupleReader', 'NamedTupleWriter',
-           'read_csv', 'write_csv']
+           'LazyReader', 'LazyWriter',
+           'DataclassReader', 'DataclassWriter',
+           'read_csv', 'write_csv',
+           'count_rows', 'tail',
+           'sort_csv', 'join_csv',
+           'read_many',
+           'infer_schema',
+           'to_sqlite', 'write_cursor',
+           'RollingWriter', 'PartitionedWriter',
+           'Stats']
 
 __all__ += ['QUOTE_MINIMAL', 'QUOTE_ALL', 'QUOTE_NONNUMERIC', 'QUOTE_NONE',
             'Error', 'Dialect', 'excel', 'excel_tab', 'field_size_limit',
@@ -55,7 +74,9 @@ def open_csv(filename, mode='r', encoding=ENCODING, dialect=DIALECT,
         rowtype (str):
             ``'list'`` for a :func:`csv23.reader`/:func:`csv23.writer`,
             ``'dict'`` for a :class:`csv23.DictReader`/:class:`csv23.DictWriter`,
-            ``'namedtuple'`` for a :class:`csv23.NamedTupleReader`/:class:`csv23.NamedTupleWriter`.
+            ``'namedtuple'`` for a :class:`csv23.NamedTupleReader`/:class:`csv23.NamedTupleWriter`,
+            ``'lazy'`` for a :class:`csv23.LazyReader`/:class:`csv23.LazyWriter`,
+            ``'dataclass'`` for a :class:`csv23.DataclassReader`/:class:`csv23.DataclassWriter`.
         \**fmtparams: Keyword arguments (formatting parameters) for the
             :func:`csv23.reader`/:func:`csv23.writer` (must include
             ``fieldnames`` if ``mode='w'`` and ``rowtype='dict'``).
@@ -87,7 +108,9 @@ def open_csv(filename, mode='r', encoding=ENCODING, dialect=DIALECT,
 
 
 def iterrows(filename, encoding=ENCODING, dialect=DIALECT,
-             rowtype=ROWTYPE, **fmtparams):
+             rowtype=ROWTYPE, prefilter=None, checkpoints=False, resume=None,
+             prefetch=None, buffer_size=BUFFER_SIZE, on_error='raise', quarantine=None,
+             max_field_size=None, large_fields='spill', **fmtparams):
     r"""Iterator yielding rows from a CSV file (closed on exaustion or error).
 
     Args:
@@ -97,7 +120,28 @@ def iterrows(filename, encoding=ENCODING, dialect=DIALECT,
         rowtype (str):
             ``'list'`` for ``list`` rows,
             ``'dict'`` for :class:`py:dict` rows,
-            ``'namedtuple'`` for :func:`py:collections.namedtuple` rows.
+            ``'namedtuple'`` for :func:`py:collections.namedtuple` rows,
+            ``'lazy'`` for :class:`csv23.lazy.LazyRow` rows (splitting fields on demand),
+            ``'dataclass'`` for instances of the ``row_cls`` keyword argument.
+        prefilter: :class:`py:str`, :class:`py:bytes`, or compiled :func:`py:re.compile`
+            pattern: skip records not containing/matching it before parsing
+            (see :func:`csv23.open_reader`).
+        checkpoints (bool): Enable the ``checkpoint()`` method of the returned iterator
+            (see :func:`csv23.open_reader`).
+        resume: :class:`csv23.openers.Checkpoint` token (or a sequence of its three
+            values) to continue reading from (implies ``checkpoints=True``).
+        prefetch (int): Number of blocks to read ahead in a background thread
+            (see :func:`csv23.read_csv`).
+        buffer_size (int): Size in bytes of the file buffer and of the chunks
+            decoded at once (``None`` for the :mod:`py:io` defaults).
+        on_error (str): ``'raise'`` or ``'quarantine'`` to skip malformed records
+            passing them to ``quarantine`` (see :func:`csv23.open_reader`).
+        quarantine: Callable taking a :class:`csv23.openers.BadRecord` for each
+            malformed record, or filename/:class:`py:os.PathLike` to write them into.
+        max_field_size (int): Return fields longer than this number of characters as
+            :class:`csv23.openers.LargeField` (see :func:`csv23.open_reader`).
+        large_fields (str): ``'spill'`` to copy them into temporary files,
+            ``'slice'`` to reference their raw bytes in the file if possible.
         \**fmtparams: Keyword arguments (formatting parameters) for the
             :func:`csv23.reader`.
 
@@ -115,15 +159,40 @@ def iterrows(filename, encoding=ENCODING, dialect=DIALECT,
     [u'Wonderful Spam', u'Lovely Spam']
     >>> rows.close()  # doctest: +SKIP
 
+    >>> rows = iterrows('spam.csv', checkpoints=True)  # doctest: +SKIP
+    >>> next(rows)  # doctest: +SKIP
+    [u'Wonderful Spam', u'Lovely Spam']
+    >>> token = rows.checkpoint()  # doctest: +SKIP
+    >>> token  # doctest: +SKIP
+    Checkpoint(offset=29, line_num=1, header=[u'Wonderful Spam', u'Lovely Spam'])
+    >>> rows.close()  # doctest: +SKIP
+    >>> list(iterrows('spam.csv', resume=token))  # doctest: +SKIP
+    [[u'Lovely Spam', u'Wonderful Spam']]
+
+    >>> bad = []
+    >>> list(iterrows('spam.csv', on_error='quarantine', quarantine=bad.append))  # doctest: +SKIP
+    [[u'Wonderful Spam', u'Lovely Spam']]
+    >>> bad  # doctest: +SKIP
+    [BadRecord(offset=29, line_num=2, error='expected 2 fields, saw 1', text='Spam!\r\n')]
+
     Notes:
         - The rows are ``list`` or :class:`py:dict` of :func:`py:unicode` strings (PY3: :class:`py3:str`).
         - The underlying opened file object is closed automatically, i.e.
           on exhaustion, in case of an exception, or by garbage collection.
-          To do it manually, call the ``.close()``.method  of the returned generator object.
+          To do it manually, call the ``.close()``.method  of the returned iterator object.
+        - The ``.checkpoint()`` method of the returned iterator object returns a token
+          for resuming after the last row returned (also after it has been closed).
         - If ``encoding=None`` is given, :func:`py:locale.getpreferredencoding` is used.
         - Under Python 2, an optimized implementation is used for 8-bit encodings
           that are ASCII-compatible (e.g. the default ``'utf-8'``).
+        - Pass ``intern=['country', 'status']`` (optionally with a ``categories`` dict
+          for integer codes) to share one string object for repeated values of
+          low-cardinality columns (see :class:`csv23.readers.InterningReader`).
     """
-    with open_reader(filename, encoding, dialect, rowtype, **fmtparams) as reader:
-        for row in reader:
-            yield row
+    open_func = functools.partial(open_reader, filename, encoding, dialect, rowtype,
+                                  prefilter=prefilter, checkpoints=checkpoints,
+                                  resume=resume, prefetch=prefetch,
+                                  buffer_size=buffer_size, on_error=on_error,
+                                  quarantine=quarantine, max_field_size=max_field_size,
+                                  large_fields=large_fields, **fmtparams)
+    return RowIterator(open_func, checkpoints=checkpoints, resume=resume)
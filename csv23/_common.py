@@ -12,6 +12,8 @@ DIALECT = 'excel'
 
 ROWTYPE = 'list'
 
+BUFFER_SIZE = 2 ** 20
+
 EIGHT_BIT_CLEAN = {
     'ascii',
     'cp437', 'cp720', 'cp737', 'cp775',
@@ -8,7 +8,7 @@ __all__ = ['register_reader', 'register_writer', 'get_reader', 'get_writer']
 REGISTRY = {}
 
 KIND = ('reader', 'writer')
-ROWTYPE = ('list', 'dict', 'namedtuple')
+ROWTYPE = ('list', 'dict', 'namedtuple', 'lazy', 'dataclass')
 LINETYPE = ('bytes', 'text')
 
 KEYS = set(itertools.product(KIND, ROWTYPE, LINETYPE))
@@ -0,0 +1,416 @@
+"""Reading fields larger than max_field_size as slices of the file or spilled to disk."""
+
+import codecs
+import collections
+import csv
+import io
+import os
+import re
+import shutil
+import tempfile
+import weakref
+
+from ._common import is_8bit_clean
+from . import _records
+from . import readers
+
+__all__ = ['LARGE_FIELDS', 'SPILL_ENCODING', 'check_large_fields',
+           'LargeField', 'LargeFieldReader']
+
+LARGE_FIELDS = ('spill', 'slice')
+
+SPILL_ENCODING = 'utf-8'
+
+CHUNK_SIZE = 2 ** 16
+
+NEWLINES = ('\r', '\n')
+
+(START_RECORD, START_FIELD, IN_FIELD, IN_QUOTED, QUOTE_IN_QUOTED,
+ ESCAPE, ESCAPE_IN_QUOTED) = range(7)
+
+
+def check_large_fields(max_field_size, large_fields, encoding=None):
+    """Raise ValueError for invalid max_field_size and large_fields arguments."""
+    if not (isinstance(max_field_size, int) and max_field_size > 0):
+        raise ValueError('max_field_size must be None or a positive int: %r'
+                         % max_field_size)
+    if large_fields not in LARGE_FIELDS:
+        raise ValueError('large_fields must be one of %r: %r' % (LARGE_FIELDS, large_fields))
+    if large_fields == 'slice' and encoding is not None and not is_8bit_clean(encoding):
+        raise ValueError("large_fields='slice' requires an 8-bit clean encoding: %r"
+                         % encoding)
+
+
+class LargeField(object):
+    """Field value of more than ``max_field_size`` characters (stored outside of the row).
+
+    ``length`` bytes at ``offset`` of the file ``path`` in ``encoding``: a slice of the
+    CSV file or a temporary spill file (removed when the object is garbage collected).
+    """
+
+    __slots__ = ('path', 'offset', 'length', 'encoding', 'temporary', '__weakref__')
+
+    def __init__(self, path, offset, length, encoding, temporary=False):
+        self.path = path
+        self.offset = offset
+        self.length = length
+        self.encoding = encoding
+        self.temporary = temporary
+        if temporary:
+            weakref.finalize(self, os.remove, path)
+
+    def __repr__(self):
+        return '<%s.%s path=%r offset=%d length=%d>' % (
+               self.__module__, self.__class__.__name__,
+               self.path, self.offset, self.length)
+
+    def open(self):
+        """Return a new text stream reading the field value."""
+        binary = io.BufferedReader(_Slice(self.path, self.offset, self.length))
+        return io.TextIOWrapper(binary, encoding=self.encoding, newline='')
+
+    def read(self):
+        """Return the field value as :class:`py:str` (loading it into memory)."""
+        with self.open() as f:
+            return f.read()
+
+
+class _Slice(io.RawIOBase):
+    """Readable binary stream of length bytes at offset of the file path."""
+
+    def __init__(self, path, offset, length):
+        self._file = io.open(path, 'rb', buffering=0)
+        self._file.seek(offset)
+        self._left = length
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        if not self._left:
+            return 0
+        n = self._file.readinto(memoryview(b)[:self._left])
+        self._left -= n
+        return n
+
+    def close(self):
+        try:
+            self._file.close()
+        finally:
+            super(_Slice, self).close()
+
+
+class _Oversized(Exception):
+    """Raised from _Lines to abort the csv.reader record."""
+
+
+def byte_counter(encoding):
+    """Return a function returning the number of bytes of text in encoding."""
+    if codecs.lookup(encoding).name in ('utf-8', 'cp65001'):
+        return lambda text: len(text.encode(encoding, 'surrogateescape'))
+    return len  # other 8-bit clean encodings have one byte per character
+
+
+class _Lines(object):
+    """Iterator over stream.readline() lines raising _Oversized for large records.
+
+    Counts the bytes of the lines with nbytes (if given): byte is the offset of the
+    first pending line.
+    """
+
+    def __init__(self, stream, limit, nbytes=None):
+        self._readline = stream.readline
+        self._limit = limit
+        self._nbytes = nbytes
+        self.pending = []
+        self.size = 0
+        self.rest = collections.deque()
+        self.line_num = 0
+        self.byte = 0 if nbytes is not None else None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.rest:
+            line = self.rest.popleft()
+            if not self.rest and not line.endswith(NEWLINES):
+                line += self._readline(max(self._limit - len(line), 0))
+        else:
+            line = self._readline(self._limit)
+        if not line:
+            raise StopIteration
+        self.pending.append(line)
+        self.size += len(line)
+        if self._nbytes is not None:
+            self._pending_bytes += self._nbytes(line)
+        # NOTE: a cut line might also end with the '\r' of a '\r\n'
+        if self.size > self._limit or (len(line) >= self._limit
+                                       and not line.endswith('\n')):
+            raise _Oversized
+        return line
+
+    _pending_bytes = 0
+
+    def clear(self, line_num=None, byte=None):
+        """Start the next record (after line_num lines and at byte, default: after
+        the pending lines)."""
+        self.line_num += len(self.pending) if line_num is None else line_num
+        if self.byte is not None:
+            self.byte = self.byte + self._pending_bytes if byte is None else byte
+            self._pending_bytes = 0
+        del self.pending[:]
+        self.size = 0
+
+
+class LargeFieldReader(object):
+    """Proxy for a CSV reader over stream returning fields larger than limit as LargeField.
+
+    Records are parsed with :func:`py:csv.reader` unless they are larger than
+    ``limit``: these are parsed from chunks of the stream without loading them.
+    """
+
+    def __init__(self, stream, dialect, limit, large_fields='spill', encoding=None,
+                 source=None, **fmtparams):
+        self._stream = stream
+        if large_fields != 'slice':
+            source = None
+        self._lines = _Lines(stream, limit, byte_counter(encoding)
+                             if source is not None else None)
+        self._reader = csv.reader(self._lines, dialect, **fmtparams)
+        d = self._reader.dialect
+        if readers.is_quote_free(d) and d.lineterminator not in readers.NEWLINES:
+            raise ValueError('max_field_size is not supported with lineterminator %r'
+                             % d.lineterminator)
+        self._parser = _Parser(self._reader.dialect, limit, encoding, source)
+
+    @property
+    def dialect(self):
+        return self._reader.dialect
+
+    @property
+    def line_num(self):
+        """The number of lines read from the file."""
+        return self._lines.line_num
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        lines = self._lines
+        try:
+            row = next(self._reader)
+        except _Oversized:
+            pass
+        except csv.Error as e:
+            if not str(e).startswith('field larger than field limit'):
+                raise
+        else:
+            lines.clear()
+            return row
+        text = ''.join(lines.pending)
+        text += ''.join(lines.rest)
+        lines.rest.clear()
+        row, rest, line_num, byte = self._parser.parse(text, self._stream.read, lines.byte)
+        lines.clear(line_num, byte)
+        lines.rest.extend(_records.LINES.findall(rest))
+        return row
+
+
+class _Parser(object):
+    """Parse one record from text chunks with the csv.reader rules (strict=False).
+
+    Fields larger than limit are spilled to temporary files, or (with source)
+    referenced as slices of source if their raw text is their value.
+    """
+
+    def __init__(self, dialect, limit, encoding=None, source=None):
+        quotechar = dialect.quotechar if dialect.quoting != csv.QUOTE_NONE else None
+        self.quotechar, self.escapechar = quotechar, dialect.escapechar
+        self.delimiter = dialect.delimiter
+        self.doublequote = dialect.doublequote
+        self.skipinitialspace = dialect.skipinitialspace
+        stops = [c for c in (dialect.delimiter, '\r', '\n', dialect.escapechar) if c]
+        self._unquoted = re.compile('[%s]' % ''.join(map(re.escape, stops))).search
+        stops = [c for c in (quotechar, dialect.escapechar) if c]
+        self._quoted = (re.compile('[%s]' % ''.join(map(re.escape, stops))).search
+                        if stops else None)
+        self.limit = limit
+        self.encoding = encoding
+        self.source = source
+        self.nbytes = byte_counter(encoding) if source is not None else None
+
+    def parse(self, text, read, byte=None):
+        """Return the row at the start of text (continued with read(size)), the rest
+        of the text, the number of lines of the row, and the byte offset of the rest.
+
+        byte is the offset of text in source (for slicing fields).
+        """
+        self._text, self._pos, self._byte, self._read = text, 0, byte, read
+        self._lines, self._last = 0, None
+        row, state, field = [], START_RECORD, _Field(self)
+        while True:
+            if self._pos >= len(self._text) and not self._more():
+                if state == ESCAPE or state == ESCAPE_IN_QUOTED:
+                    field.add('\n', None)
+                row.append(field.value())
+                if self._last not in NEWLINES:  # incomplete last line
+                    self._lines += 1
+                return row, '', self._lines, self._byte
+            text, pos = self._text, self._pos
+            if state == START_RECORD:
+                c = text[pos]
+                if c in NEWLINES:  # empty line
+                    self._skip(1)
+                    return self._end(row, c)
+                state = START_FIELD
+            elif state == START_FIELD:
+                c = text[pos]
+                if c == self.quotechar:
+                    self._skip(1)
+                    state = IN_QUOTED
+                elif c == ' ' and self.skipinitialspace:
+                    self._skip(1)
+                else:
+                    state = IN_FIELD
+            elif state == IN_FIELD or state == IN_QUOTED:
+                search = self._unquoted if state == IN_FIELD else self._quoted
+                m = search(text, pos) if search is not None else None
+                end = m.start() if m is not None else len(text)
+                if end > pos:
+                    field.add(text[pos:end], self._byte)
+                    self._skip(end - pos)
+                if m is None:
+                    continue
+                c = text[end]
+                self._skip(1)
+                if c == self.escapechar:
+                    state = ESCAPE if state == IN_FIELD else ESCAPE_IN_QUOTED
+                elif state == IN_QUOTED:  # end of the quoted part
+                    state = QUOTE_IN_QUOTED if self.doublequote else IN_FIELD
+                elif c == self.delimiter:
+                    row.append(field.value())
+                    state, field = START_FIELD, _Field(self)
+                else:
+                    row.append(field.value())
+                    return self._end(row, c)
+            elif state == ESCAPE or state == ESCAPE_IN_QUOTED:
+                c = text[pos]
+                field.add(c, self._byte)
+                self._skip(1)
+                state = IN_FIELD if state == ESCAPE else IN_QUOTED
+            else:  # QUOTE_IN_QUOTED
+                c = text[pos]
+                if c == self.quotechar:
+                    field.add(c, self._byte)
+                    self._skip(1)
+                    state = IN_QUOTED
+                elif c == self.delimiter:
+                    self._skip(1)
+                    row.append(field.value())
+                    state, field = START_FIELD, _Field(self)
+                elif c in NEWLINES:
+                    self._skip(1)
+                    row.append(field.value())
+                    return self._end(row, c)
+                else:  # also an escapechar is literal here
+                    field.add(c, self._byte)
+                    self._skip(1)
+                    state = IN_FIELD
+
+    def _end(self, row, c):
+        if c == '\r':
+            if self._pos >= len(self._text):
+                self._more()
+            if self._text.startswith('\n', self._pos):
+                self._skip(1)
+        rest = self._text[self._pos:]
+        while rest.endswith('\r'):  # the '\n' of a '\r\n' might follow
+            more = self._read(CHUNK_SIZE)
+            if not more:
+                break
+            rest += more
+        return row, rest, self._lines, self._byte
+
+    def _more(self):
+        text = self._read(CHUNK_SIZE)
+        if not text:
+            return False
+        self._text, self._pos = text, 0
+        return True
+
+    def _skip(self, n):
+        """Consume n characters, counting their bytes and line breaks."""
+        text, pos, end = self._text, self._pos, self._pos + n
+        if self._byte is not None:
+            self._byte += self.nbytes(text[pos:end])
+        lines = text.count('\n', pos, end) + text.count('\r', pos, end)
+        if lines:
+            lines -= text.count('\r\n', pos, end)
+            if self._last == '\r' and text[pos] == '\n':  # split '\r\n'
+                lines -= 1
+            self._lines += lines
+        self._pos, self._last = end, text[end - 1]
+
+
+class _Field(object):
+    """Accumulate field segments, moving them out of memory beyond the limit."""
+
+    def __init__(self, parser):
+        self._parser = parser
+        self._parts = []
+        self._size = 0
+        self._empty = True
+        self._start = self._end = None  # raw byte range in source (if contiguous)
+        self._sliced = False
+        self._spill = self._spill_path = None
+
+    def add(self, segment, byte):
+        """Append segment (found at byte offset in source, None if not tracked)."""
+        parser = self._parser
+        if self._empty:
+            self._empty = False
+            self._start = self._end = byte
+        contiguous = self._end is not None and byte == self._end
+        if self._sliced:
+            if contiguous:
+                self._end += parser.nbytes(segment)
+                return
+            # e.g. a doubled quotechar: copy the raw slice so far
+            self._open_spill()
+            with self._slice().open() as f:
+                shutil.copyfileobj(f, self._spill)
+            self._sliced = False
+        if self._spill is not None:
+            self._spill.write(segment)
+            return
+        self._end = self._end + parser.nbytes(segment) if contiguous else None
+        self._parts.append(segment)
+        self._size += len(segment)
+        if self._size > parser.limit:
+            if self._end is not None and parser.source is not None:
+                self._sliced = True
+            else:
+                self._open_spill()
+                self._spill.write(''.join(self._parts))
+            self._parts = None
+
+    def _open_spill(self):
+        fd, self._spill_path = tempfile.mkstemp(prefix='csv23-', suffix='.field')
+        self._spill = io.open(fd, 'w', encoding=SPILL_ENCODING, newline='',
+                              errors='surrogateescape')
+
+    def _slice(self):
+        return LargeField(self._parser.source, self._start, self._end - self._start,
+                          self._parser.encoding)
+
+    def value(self):
+        """Return the field as str or as LargeField."""
+        if self._sliced:
+            return self._slice()
+        if self._spill is not None:
+            self._spill.close()
+            path = self._spill_path
+            return LargeField(path, 0, os.path.getsize(path), SPILL_ENCODING,
+                              temporary=True)
+        return ''.join(self._parts)
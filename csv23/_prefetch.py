@@ -0,0 +1,106 @@
+"""Binary stream reading ahead in a background thread."""
+
+import io
+import queue
+import threading
+
+__all__ = ['BLOCK_SIZE', 'PrefetchStream']
+
+BLOCK_SIZE = 2 ** 18
+
+
+class PrefetchStream(io.BufferedIOBase):
+    """Read-only binary stream reading up to blocks blocks ahead of raw in a thread."""
+
+    _thread = None
+
+    _close_raw = False
+
+    def __init__(self, raw, blocks, block_size=BLOCK_SIZE, close=True):
+        if not (isinstance(blocks, int) and blocks > 0):
+            raise ValueError('prefetch must be a positive int: %r' % blocks)
+        self._raw = raw
+        self._block_size = block_size
+        self._close_raw = close
+        self._queue = queue.Queue(blocks)
+        self._stop = threading.Event()
+        self._block = b''
+        self._pos = 0
+        self._eof = False
+        self._thread = threading.Thread(target=self._run, name='csv23-prefetch',
+                                        daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            while not self._stop.is_set():
+                data = self._raw.read(self._block_size)
+                self._put(data)
+                if not data:
+                    break
+        except BaseException as e:  # re-raised in the reading thread
+            self._put(e)
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            return
+
+    def _next_block(self):
+        if self._eof:
+            return b''
+        item = self._queue.get()
+        if isinstance(item, BaseException):
+            self._eof = True
+            raise item
+        if not item:
+            self._eof = True
+        return item
+
+    def readable(self):
+        return True
+
+    def read1(self, size=-1):
+        if self._pos >= len(self._block):
+            self._block, self._pos = self._next_block(), 0
+        block, pos = self._block, self._pos
+        if size is None or size < 0 or pos + size >= len(block):
+            self._pos = len(block)
+            return block if not pos else block[pos:]
+        self._pos = pos + size
+        return block[pos:self._pos]
+
+    def read(self, size=-1):
+        chunks = []
+        while size is None or size < 0 or size > 0:
+            data = self.read1(size)
+            if not data:
+                break
+            chunks.append(data)
+            if size is not None and size >= 0:
+                size -= len(data)
+        return b''.join(chunks)
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            if self._thread is not None:
+                self._stop.set()
+                try:  # unblock a waiting put()
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    pass
+                self._thread.join()
+            if self._close_raw:
+                self._raw.close()
+        finally:
+            super().close()
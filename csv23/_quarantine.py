@@ -0,0 +1,137 @@
+"""Skipping malformed records, sending them to a quarantine sink."""
+
+import collections
+import contextlib
+import csv
+import io
+import re
+
+from ._common import ENCODING
+from . import _records
+
+__all__ = ['BadRecord', 'ON_ERROR', 'check_on_error', 'open_sink',
+           'tracked_lines', 'QuarantineReader']
+
+BadRecord = collections.namedtuple('BadRecord', ['offset', 'line_num', 'error', 'text'])
+
+ON_ERROR = ('raise', 'quarantine')
+
+ERRORS = 'surrogateescape'
+
+UNDECODABLE = re.compile('[\udc80-\udcff]')
+
+
+def check_on_error(on_error, quarantine):
+    """Raise ValueError for invalid on_error and quarantine arguments."""
+    if on_error not in ON_ERROR:
+        raise ValueError('on_error must be one of %r: %r' % (ON_ERROR, on_error))
+    if (on_error == 'quarantine') != (quarantine is not None):
+        raise ValueError("on_error='quarantine' requires a quarantine"
+                         " (and quarantine requires on_error='quarantine')")
+
+
+@contextlib.contextmanager
+def open_sink(quarantine, encoding=None):
+    """Context manager returning a callable taking BadRecord objects."""
+    if callable(quarantine):
+        yield quarantine
+        return
+    if encoding is None:
+        encoding = ENCODING
+    with io.open(quarantine, 'w', encoding=encoding, errors=ERRORS, newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(BadRecord._fields)
+        yield writer.writerow
+
+
+def tracked_lines(stream, pending):
+    """Yield the lines of stream.readline(), appending them to pending."""
+    # NOTE: iterating with next() disables tell()
+    for line in iter(stream.readline, ''):
+        pending.append(line)
+        yield line
+
+
+class QuarantineReader(object):
+    """Proxy for a CSV reader fed from tracked_lines() skipping malformed records.
+
+    Records raising :class:`py:csv.Error`, containing undecodable bytes (decoded with
+    ``errors='surrogateescape'``), or with another number of fields than the first row
+    (or ``n_fields``) are passed to ``sink`` as :class:`BadRecord` and skipped.
+
+    After a :class:`py:csv.Error`, the rest of the malformed record (up to the next
+    record boundary of the quoting rules) is read from ``stream`` into the same
+    :class:`BadRecord` instead of being parsed as the following rows.
+    """
+
+    def __init__(self, reader, stream, pending, sink, encoding=None, n_fields=None):
+        self._reader = reader
+        self._stream = stream
+        self._pending = pending
+        self._sink = sink
+        self._encoding = encoding
+        self._n_fields = n_fields
+        self._scanner = None
+        self._skipped = 0
+
+    def __getattr__(self, name):
+        return getattr(self._reader, name)
+
+    @property
+    def line_num(self):
+        return self._reader.line_num + self._skipped
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        pending, search = self._pending, UNDECODABLE.search
+        while True:
+            try:
+                row = next(self._reader)
+            except csv.Error as e:
+                self._resync()
+                self._quarantine(e)
+                continue
+            if self._n_fields is None and row:
+                self._n_fields = len(row)
+            if any(map(search, pending)):
+                self._quarantine('undecodable bytes')
+            elif row and len(row) != self._n_fields:
+                self._quarantine('expected %d fields, saw %d' % (self._n_fields, len(row)))
+            else:
+                del pending[:]
+                return row
+
+    def _resync(self):
+        """Read the lines up to the end of the malformed record into pending."""
+        if self._scanner is None:
+            self._scanner = _records.RecordScanner(self._reader.dialect)
+        if not self._scanner.specials:  # records end at the first line break
+            return
+        text = ''.join(self._pending)
+        # NOTE: lines read here bypass the reader (and its line_num)
+        while not self._scanner.spans(text)[0]:
+            line = self._stream.readline()
+            if not line:
+                break
+            self._pending.append(line)
+            self._skipped += 1
+            text += line
+
+    def _quarantine(self, error):
+        text = ''.join(self._pending)
+        line_num = self.line_num - len(self._pending) + 1
+        self._sink(BadRecord(self._offset(text), line_num, str(error), text))
+        del self._pending[:]
+
+    def _offset(self, text):
+        """Return the byte offset of text ending at the stream position (or None)."""
+        try:
+            pos = self._stream.tell()
+        except (OSError, ValueError):
+            return None
+        if self._encoding is None:
+            return None
+        encode = lambda s: s.encode(self._encoding, ERRORS)  # noqa: E731
+        return pos - (len(encode(text)) - len(encode('')))  # minus BOM
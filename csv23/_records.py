@@ -0,0 +1,291 @@
+"""Block-wise quote-aware scanning of raw records (below csv.reader)."""
+
+import csv
+import re
+
+from . import readers
+
+__all__ = ['BLOCK_SIZE', 'FMTPARAMS',
+           'get_dialect', 'check_lineterminator', 'iterblocks', 'RecordScanner', 'iterrecords',
+           'make_search', 'prefiltered']
+
+BLOCK_SIZE = 2 ** 20
+
+FMTPARAMS = frozenset({'delimiter', 'doublequote', 'escapechar', 'lineterminator',
+                       'quotechar', 'quoting', 'skipinitialspace', 'strict'})
+
+NEWLINE = re.compile(r'\r\n|\r|\n')
+
+LINES = re.compile(r'[^\r\n]*(?:\r\n|\r|\n)|[^\r\n]+')
+
+
+def get_dialect(dialect, fmtparams):
+    """Return the csv.Dialect resulting from dialect and the formatting fmtparams."""
+    kwargs = {k: v for k, v in fmtparams.items() if k in FMTPARAMS}
+    return csv.reader([], dialect, **kwargs).dialect
+
+
+def check_lineterminator(dialect, name):
+    """Raise ValueError if quote-free records of dialect do not end at line breaks."""
+    # readers.SplitReader splits quote-free records at any lineterminator,
+    # the scanning here (like csv.reader) only at '\r\n', '\r', or '\n'
+    if (readers.is_quote_free(dialect)
+            and dialect.lineterminator not in readers.NEWLINES):
+        raise ValueError('lineterminator not supported by %s: %r'
+                         % (name, dialect.lineterminator))
+
+
+def line_start(block, pos):
+    """Return the index after the last newline before pos."""
+    nl, cr = (b'\n', b'\r') if isinstance(block, bytes) else ('\n', '\r')
+    return max(block.rfind(nl, 0, pos), block.rfind(cr, 0, pos)) + 1
+
+
+def count_lines(block, final=False):
+    """Return the number of lines in block and the number of consumed characters."""
+    nl, cr, crlf = (b'\n', b'\r', b'\r\n') if isinstance(block, bytes) else ('\n', '\r', '\r\n')
+    n = block.count(nl)
+    if cr in block:
+        n += block.count(cr) - block.count(crlf)
+    consumed = len(block)
+    if not final:
+        consumed = line_start(block, consumed)
+    elif block and block[-1:] not in (nl, cr):
+        n += 1
+    return n, consumed
+
+
+def iterblocks(stream, size=BLOCK_SIZE):
+    """Yield (block, final) pairs from stream (text or bytes), blocks end with a full line."""
+    rest = None
+    while True:
+        data = stream.read(size)
+        if rest is None:
+            rest = data[:0]
+        if not data:
+            yield rest, True
+            return
+        block = rest + data
+        nl, cr = (b'\n', b'\r') if isinstance(block, bytes) else ('\n', '\r')
+        # a trailing '\r' might be the first half of a '\r\n'
+        cut = max(block.rfind(nl), block.rfind(cr, 0, len(block) - 1)) + 1
+        if cut:
+            yield block[:cut], False
+        rest = block[cut:]
+
+
+class RecordScanner(object):
+    """Split text blocks into records with the csv.reader quoting rules."""
+
+    def __init__(self, dialect):
+        quotechar = dialect.quotechar if dialect.quoting != csv.QUOTE_NONE else None
+        escapechar = dialect.escapechar
+        self.specials = [c for c in (quotechar, escapechar) if c]
+        # for scanning ASCII-compatible encoded blocks (see count())
+        self.bspecials = [c.encode('latin-1', 'replace') for c in self.specials]
+        self._escapechar = {str: escapechar,
+                            bytes: escapechar.encode('latin-1', 'replace') if escapechar else None}
+
+        delimiter = re.escape(dialect.delimiter)
+        stop = dialect.delimiter + '\r\n' + (escapechar or '')
+        stop = '[^%s]' % ''.join(re.escape(c) for c in stop)
+        escaped = (r'|%s.' % re.escape(escapechar)) if escapechar else ''
+        unquoted = r'(?:%s%s)*' % (stop, escaped)
+
+        if quotechar is not None:
+            q = re.escape(quotechar)
+            inner = '[^%s%s]' % (q, re.escape(escapechar) if escapechar else '')
+            if dialect.doublequote:
+                inner += '|%s%s' % (q, q)
+                # the escapechar is literal right after the closing quote
+                after = r'(?:[^%s\r\n]%s)?' % (delimiter, unquoted)
+            else:
+                after = unquoted
+            inner += escaped
+            space = ' *' if dialect.skipinitialspace else ''
+            # emulate an atomic group to prevent backtracking into quoted fields
+            field = r'(?:%s%s(?=(?P<{0}>(?:%s)*))(?P={0})%s%s|(?!%s%s)%s)' % (
+                space, q, inner, q, after, space, q, unquoted)
+
+            # for counting blocks without escapechar: strip complete quoted fields
+            if space:
+                start = r'(?<![^%s\r\n]) *%s' % (delimiter, q)
+            else:  # literal first for fast searching
+                start = r'%s(?<![^%s\r\n]%s)' % (q, delimiter, q)
+            body = '[^%s]*' % q
+            if dialect.doublequote:
+                body += '(?:%s%s%s)*' % (q, q, body)
+            quoted = r'%s(?=(?P<body>%s))(?P=body)%s' % (start, body, q)
+            self._quoted_patterns = (quoted, start)
+        else:
+            field = unquoted
+            self._quoted_patterns = None
+        self._quoted = {}
+
+        record = r'%s(?:%s%s)*' % (field.format('first'), delimiter, field.format('rest'))
+        self._match = re.compile(record + r'(?:\r\n|\r|\n)', re.DOTALL).match
+        self._match_final = re.compile(record + r'(?:\r\n|\r|\n|\Z)', re.DOTALL).match
+        self._match_field = re.compile(field.format('field'), re.DOTALL).match
+
+    _placeholder = {str: '_', bytes: b'_'}
+
+    def _get_quoted(self, type_):
+        try:
+            return self._quoted[type_]
+        except KeyError:
+            patterns = self._quoted_patterns
+            if type_ is bytes:
+                patterns = [p.encode('latin-1') for p in patterns]
+            result = self._quoted[type_] = tuple(re.compile(p, re.DOTALL) for p in patterns)
+            return result
+
+    def has_specials(self, block):
+        """Return True if block contains a quotechar or escapechar."""
+        specials = self.bspecials if isinstance(block, bytes) else self.specials
+        return any(c in block for c in specials)
+
+    def field_end(self, text, pos, endpos):
+        """Return the end of the raw field starting at pos (None if it is malformed)."""
+        m = self._match_field(text, pos, endpos)
+        return m.end() if m is not None else None
+
+    def spans(self, block, final=False):
+        """Return list of (start, end) record spans and the number of consumed characters."""
+        n = len(block)
+        if not self.has_specials(block):
+            spans, pos = [], 0
+            for m in NEWLINE.finditer(block):
+                spans.append((pos, m.end()))
+                pos = m.end()
+            if final and pos < n:
+                spans.append((pos, n))
+                pos = n
+            return spans, pos
+
+        match = self._match_final if final else self._match
+        spans, pos = [], 0
+        while pos < n:
+            m = match(block, pos)
+            if m is None:
+                if not final:
+                    break
+                # unterminated quoted field: the csv.reader takes the rest
+                end = n
+            else:
+                end = m.end()
+            spans.append((pos, end))
+            pos = end
+        return spans, pos
+
+    def count(self, block, final=False):
+        """Return the number of records in block and the number of consumed characters.
+
+        Also accepts bytes in an ASCII-compatible encoding if all dialect characters are ASCII.
+        """
+        if not self.has_specials(block):
+            return count_lines(block, final)
+        escapechar = self._escapechar[type(block)]
+        if self._quoted_patterns is not None and not (escapechar and escapechar in block):
+            quoted, open_quote = self._get_quoted(type(block))
+            residue = quoted.sub(self._placeholder[type(block)], block)
+            if open_quote.search(residue) is None:
+                return count_lines(residue, final)[0], len(block)
+        if isinstance(block, bytes):
+            # one code point per byte: same positions for ASCII characters
+            block = block.decode('latin-1')
+        spans, consumed = self.spans(block, final)
+        return len(spans), consumed
+
+
+def iterrecords(stream, dialect, size=BLOCK_SIZE):
+    """Yield the raw text of each record from the text stream."""
+    scanner = RecordScanner(dialect)
+    rest = ''
+    for block, final in iterblocks(stream, size):
+        block = rest + block
+        spans, consumed = scanner.spans(block, final)
+        for start, end in spans:
+            yield block[start:end]
+        rest = block[consumed:]
+
+
+def make_search(prefilter, encoding=None):
+    """Return search(text, pos) -> (start, end) or None for a prefilter argument."""
+    if hasattr(prefilter, 'search'):
+        pattern = prefilter
+        if isinstance(pattern.pattern, bytes):
+            if encoding is None:
+                raise TypeError('need encoding for bytes prefilter pattern')
+            pattern = re.compile(pattern.pattern.decode(encoding), pattern.flags | re.ASCII)
+
+        def search(text, pos=0):
+            m = pattern.search(text, pos)
+            return m.span() if m is not None else None
+
+    else:
+        if isinstance(prefilter, bytes):
+            if encoding is None:
+                raise TypeError('need encoding for bytes prefilter')
+            prefilter = prefilter.decode(encoding)
+        elif not isinstance(prefilter, str):
+            raise TypeError('prefilter must be str, bytes, or compiled regex: %r' % prefilter)
+        if not prefilter:
+            raise ValueError('empty prefilter')
+
+        sub, n = prefilter, len(prefilter)
+
+        def search(text, pos=0):
+            start = text.find(sub, pos)
+            return (start, start + n) if start != -1 else None
+
+    return search
+
+
+def prefiltered(stream, dialect, prefilter, encoding=None, size=BLOCK_SIZE):
+    """Yield the raw lines of the first record and each record matching prefilter."""
+    search = make_search(prefilter, encoding)
+    scanner = RecordScanner(dialect)
+    # plain substrings without newlines match the same in the whole block as
+    # in each line, regexes (anchors, lookarounds) must see one line at a time
+    blockwise = (not hasattr(prefilter, 'search')
+                 and not any(c in prefilter for c in ('\r', '\n', b'\r', b'\n')
+                             if type(c) is type(prefilter)))
+    first = True
+    rest = ''
+    for block, final in iterblocks(stream, size):
+        block = rest + block
+        if scanner.has_specials(block):
+            spans, consumed = scanner.spans(block, final)
+            for start, end in spans:
+                record = block[start:end]
+                if first or search(record) is not None:
+                    # feed multi-line records line by line like the file
+                    yield from LINES.findall(record)
+                first = False
+            rest = block[consumed:]
+            continue
+
+        pos = 0
+        if first and block:
+            m = NEWLINE.search(block)
+            pos = m.end() if m is not None else len(block)
+            yield block[:pos]
+            first = False
+
+        if not blockwise:
+            for m in LINES.finditer(block, pos):
+                if search(m.group()) is not None:
+                    yield m.group()
+            rest = ''
+            continue
+
+        while True:
+            span = search(block, pos)
+            if span is None:
+                break
+            start = line_start(block, span[0])
+            m = NEWLINE.search(block, span[1])
+            end = m.end() if m is not None else len(block)
+            yield block[max(start, pos):end]
+            pos = end
+        rest = ''
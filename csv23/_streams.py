@@ -0,0 +1,80 @@
+"""Opening (compressed) binary files as text streams with large buffers."""
+
+import io
+
+from ._common import BUFFER_SIZE
+from . import _prefetch
+
+__all__ = ['open_text', 'wrap_text', 'check_buffer_size', 'set_chunk_size',
+           'ClosingStream']
+
+
+def open_text(file, mode, encoding, newline='', open_module=None,
+              buffer_size=BUFFER_SIZE, prefetch=None, errors=None):
+    """Open ``file`` in text ``mode`` ('r' or 'w') through a binary file with ``buffer_size``."""
+    assert mode in ('r', 'w')
+    binary = io.open(file, mode + 'b', buffering=buffering(buffer_size))
+    try:
+        return wrap_text(binary, mode, encoding, newline=newline, open_module=open_module,
+                         buffer_size=buffer_size, prefetch=prefetch, close=True,
+                         errors=errors)
+    except Exception:
+        binary.close()
+        raise
+
+
+def wrap_text(binary, mode, encoding, newline='', open_module=None,
+              buffer_size=BUFFER_SIZE, prefetch=None, close=False, **textio_kwargs):
+    """Wrap the ``binary`` file-like object into (decompressing, prefetching) text layers."""
+    layer = binary
+    if open_module is not None:
+        layer = open_module.open(binary, mode + 'b')
+        if close:  # NOTE: the compressed file object does not close binary
+            layer = ClosingStream(layer, binary)
+        close = True
+    if prefetch is not None:
+        assert mode == 'r'
+        layer = _prefetch.PrefetchStream(layer, prefetch, close=close,
+                                         block_size=buffer_size or _prefetch.BLOCK_SIZE)
+    text = io.TextIOWrapper(layer, encoding=encoding, newline=newline, **textio_kwargs)
+    set_chunk_size(text, buffer_size)
+    return text
+
+
+def check_buffer_size(buffer_size):
+    """Raise ValueError if buffer_size is not None or an int greater than 1."""
+    if buffer_size is not None and (isinstance(buffer_size, bool)
+                                    or not isinstance(buffer_size, int) or buffer_size < 2):
+        # NOTE: io.open() would take 0 as unbuffered and 1 as line buffering
+        raise ValueError('buffer_size must be None or an int greater than 1: %r'
+                         % (buffer_size,))
+
+
+def buffering(buffer_size):
+    """Return the io.open() buffering argument for buffer_size."""
+    check_buffer_size(buffer_size)
+    return -1 if buffer_size is None else buffer_size
+
+
+def set_chunk_size(text, buffer_size):
+    """Make the text stream decode/encode in chunks of buffer_size."""
+    check_buffer_size(buffer_size)
+    if buffer_size is not None and isinstance(text, io.TextIOWrapper):
+        text._CHUNK_SIZE = buffer_size
+
+
+class ClosingStream(object):
+    """Proxy for a file-like object also closing inner when it is closed."""
+
+    def __init__(self, stream, inner):
+        self._stream = stream
+        self._inner = inner
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            self._inner.close()
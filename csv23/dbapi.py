@@ -0,0 +1,270 @@
+"""Loading CSV files into databases and exporting query results."""
+
+import contextlib
+import datetime
+import itertools
+import os
+import re
+import sqlite3
+
+from ._common import ENCODING, DIALECT
+from .schema import infer_schema, Column
+from .shortcuts import iterslices, read_csv, write_csv
+
+__all__ = ['to_sqlite', 'write_cursor']
+
+BATCH_SIZE = 10000
+
+FAST_PRAGMAS = {'journal_mode': 'MEMORY', 'synchronous': 'OFF'}
+
+IF_EXISTS = ('fail', 'replace', 'append')
+
+PRAGMA_NAME = re.compile(r'(?:[A-Za-z_]\w*\.)?[A-Za-z_]\w*', re.ASCII)
+
+PRAGMA_KEYWORD = re.compile(r'[A-Za-z_]\w*', re.ASCII)
+
+SAVEPOINT = 'csv23_to_sqlite'
+
+SQL_TYPES = {bool: 'INTEGER', int: 'INTEGER', float: 'REAL',
+             datetime.date: 'DATE', str: 'TEXT'}
+
+
+def to_sqlite(file, db, table, batch_size=BATCH_SIZE, schema=None, header=True,
+              if_exists='fail', pragmas=None, dialect=DIALECT, encoding=ENCODING,
+              autocompress=False):
+    r"""Load the rows of a CSV file into an SQLite table (in a single transaction).
+
+    Args:
+        file: Source as readable file-like object or filename/:class:`py:os.PathLike`.
+        db: :class:`py:sqlite3.Connection` or database filename/:class:`py:os.PathLike`.
+        table (str): Name of the table to insert the rows into.
+        batch_size (int): Number of rows inserted per :meth:`py:sqlite3.Cursor.executemany` call.
+        schema: :class:`py:dict` or sequence of ``(column, type)`` pairs for creating
+            the table, :func:`csv23.infer_schema` result, ``'infer'`` to infer it
+            from ``file`` (a filename/path), or ``None`` for the header columns without type.
+        header (bool): Use the first row as column names (skipping it). With
+            ``header=False``, ``schema`` is required.
+        if_exists (str): ``'fail'`` to raise if the table exists, ``'replace'``
+            to drop it before, ``'append'`` to insert into it.
+        pragmas: :class:`py:dict` of PRAGMA names and values (:class:`py:int` or
+            keyword such as ``'OFF'``) to set during the load (restored afterwards),
+            e.g. ``csv23.dbapi.FAST_PRAGMAS``.
+        dialect: CSV dialect argument for the :func:`csv23.reader`.
+        encoding (str): Name of the encoding used to decode the file content.
+        autocompress(bool): Decompress if ``file`` is a path that ends in
+            ``'.bz2'``, ``'.gz'``, or ``'.xz'``.
+
+    Returns:
+        int: The number of rows inserted.
+
+    >>> to_sqlite('spam.csv', 'spam.sqlite3', 'spam',  # doctest: +SKIP
+    ...           pragmas=csv23.dbapi.FAST_PRAGMAS)
+    2
+
+    Raises:
+        ValueError: If ``if_exists`` or ``batch_size`` is invalid,
+            if ``header=False`` is given without ``schema``,
+            or if ``schema='infer'`` is given with a file-like object or ``header=False``,
+            or if a ``pragmas`` name or value is not a plain identifier (or int).
+        sqlite3.OperationalError: With ``if_exists='fail'`` if the table exists.
+
+    Notes:
+        - The rows are read with :func:`csv23.read_csv` in chunks of ``batch_size``
+          rows (like with its ``chunksize`` argument), i.e. memory use is bounded by the batch (not the file) size.
+        - The table is created and the rows are inserted in one transaction
+          that is committed at the end (rolled back on error). If a transaction
+          is already open on ``db``, a ``SAVEPOINT`` inside it is used instead
+          (released at the end, rolled back to on error), i.e. the caller's
+          transaction is neither committed nor rolled back.
+        - ``journal_mode`` cannot be changed inside a transaction:
+          ``pragmas`` are applied before the transaction starts.
+        - The values are inserted as strings: SQLite converts them according
+          to the type affinity of the columns (e.g. ``INTEGER``, ``REAL``).
+        - With a :func:`csv23.infer_schema` result, the columns are created with
+          the :data:`csv23.dbapi.SQL_TYPES` of their type (``NOT NULL`` unless
+          ``nullable``), empty values inserted as ``NULL`` into nullable columns
+          that are not :class:`py:str`, and :class:`py:bool` values as ``0``/``1``.
+    """
+    if if_exists not in IF_EXISTS:
+        raise ValueError('if_exists must be one of %r: %r' % (IF_EXISTS, if_exists))
+    if not (isinstance(batch_size, int) and batch_size > 0):
+        raise ValueError('batch_size must be a positive int: %r' % batch_size)
+    if not header and schema is None:
+        raise ValueError('header=False requires a schema')
+    for name, value in (pragmas or {}).items():
+        _pragma(name, value)  # fail early
+    if isinstance(schema, str) and schema == 'infer':
+        if not header or not isinstance(file, (str, os.PathLike)):
+            raise ValueError("schema='infer' requires a filename/path with header")
+        schema = infer_schema(file, dialect=dialect, encoding=encoding,
+                              autocompress=autocompress)
+
+    with contextlib.ExitStack() as stack:
+        if isinstance(db, (str, os.PathLike)):
+            db = stack.enter_context(contextlib.closing(sqlite3.connect(db)))
+        rows = stack.enter_context(contextlib.closing(
+            read_csv(file, dialect=dialect, encoding=encoding, autocompress=autocompress)))
+        chunks = iterslices(rows, batch_size)
+        first, header_row = next(chunks, []), None
+        if header:
+            header_row, first = (first[0], first[1:]) if first else (None, first)
+        convert = None
+        if schema is not None:
+            columns = list(schema.items() if hasattr(schema, 'items') else schema)
+            if columns and all(isinstance(c, Column) for c in columns):
+                columns, convert = _typed_columns(columns)
+        elif header_row is not None:
+            columns = [(name, None) for name in header_row]
+        else:
+            raise ValueError('missing header row for to_sqlite()')
+
+        if pragmas:
+            stack.enter_context(_pragmas(db, pragmas))
+        with _transaction(db):
+            if convert is not None:
+                first, chunks = convert(first), map(convert, chunks)
+            return _load(db, table, columns, first, chunks, if_exists)
+
+
+def write_cursor(file, cursor, batch_size=BATCH_SIZE, header=True, **kwargs):
+    r"""Write the result rows of an executed DB-API cursor into a file-like object using CSV format.
+
+    Args:
+        file: Target as for :func:`csv23.write_csv` (file-like object, filename/
+            :class:`py:os.PathLike`, updateable hash, or ``None`` for string output).
+        cursor: :pep:`249` cursor object after ``.execute()`` (e.g. :class:`py:sqlite3.Cursor`).
+        batch_size (int): Number of rows to fetch per ``.fetchmany()`` call.
+        header (bool): Write the column names from ``cursor.description`` as first row.
+        \**kwargs: Keyword arguments for :func:`csv23.write_csv`
+            (e.g. ``encoding``, ``autocompress``, ``atomic``).
+
+    Returns:
+        The result of :func:`csv23.write_csv` for ``file``.
+
+    >>> import sqlite3
+    >>> conn = sqlite3.connect(':memory:')
+    >>> cursor = conn.execute("SELECT 'spam' AS name, 42 AS n UNION ALL SELECT 'eggs', NULL")
+    >>> write_cursor(None, cursor, encoding=None)
+    'name,n\r\nspam,42\r\neggs,\r\n'
+    >>> conn.close()
+
+    Raises:
+        ValueError: If ``batch_size`` is not a positive :class:`py:int`
+            or if ``header=True`` and the cursor has no result set.
+
+    Notes:
+        - At most ``batch_size`` rows are held in memory at once.
+        - ``None`` values are written as empty strings,
+          other non-string values formatted with :class:`py:str`.
+    """
+    if not (isinstance(batch_size, int) and batch_size > 0):
+        raise ValueError('batch_size must be a positive int: %r' % batch_size)
+    header_row = None
+    if header:
+        if cursor.description is None:
+            raise ValueError('cursor has no result set (description is None)')
+        header_row = [d[0] for d in cursor.description]
+    rows = itertools.chain.from_iterable(_fetchmany(cursor, batch_size))
+    return write_csv(file, rows, header=header_row, **kwargs)
+
+
+def _fetchmany(cursor, size):
+    while True:
+        rows = cursor.fetchmany(size)
+        if not rows:
+            break
+        yield rows
+
+
+def _typed_columns(schema):
+    """Return (column, type) pairs and a batch conversion function (or None)."""
+    columns = [(c.name, SQL_TYPES[c.type] + ('' if c.nullable else ' NOT NULL'))
+               for c in schema]
+    bools = [i for i, c in enumerate(schema) if c.type is bool]
+    nulls = [i for i, c in enumerate(schema)
+             if c.nullable and c.type not in (bool, str)]
+    if not (bools or nulls):
+        return columns, None
+
+    def convert(rows):
+        result = []
+        for row in rows:
+            row = list(row)
+            for i in bools:
+                row[i] = row[i].lower() == 'true' if row[i] else None
+            for i in nulls:
+                if not row[i]:
+                    row[i] = None
+            result.append(row)
+        return result
+
+    return columns, convert
+
+
+def _quote(identifier):
+    return '"%s"' % identifier.replace('"', '""')
+
+
+def _load(db, table, columns, first, chunks, if_exists):
+    if if_exists == 'replace':
+        db.execute('DROP TABLE IF EXISTS %s' % _quote(table))
+    db.execute('CREATE TABLE %s%s (%s)' % (
+               'IF NOT EXISTS ' if if_exists == 'append' else '', _quote(table),
+               ', '.join(_quote(c) if t is None else '%s %s' % (_quote(c), t)
+                         for c, t in columns)))
+    insert = 'INSERT INTO %s VALUES (%s)' % (_quote(table),
+                                             ', '.join(['?'] * len(columns)))
+    n = 0
+    for rows in itertools.chain([first], chunks):
+        db.executemany(insert, rows)
+        n += len(rows)
+    return n
+
+
+@contextlib.contextmanager
+def _transaction(db):
+    """Run the block in a new transaction (or in a savepoint of an open one)."""
+    if db.in_transaction:
+        db.execute('SAVEPOINT %s' % SAVEPOINT)
+        try:
+            yield
+        except BaseException:
+            db.execute('ROLLBACK TO SAVEPOINT %s' % SAVEPOINT)
+            db.execute('RELEASE SAVEPOINT %s' % SAVEPOINT)
+            raise
+        db.execute('RELEASE SAVEPOINT %s' % SAVEPOINT)
+        return
+
+    db.execute('BEGIN')
+    try:
+        yield
+    except BaseException:
+        db.rollback()
+        raise
+    db.commit()
+
+
+def _pragma(name, value):
+    """Return the PRAGMA statement setting name to value (raise ValueError if unsafe)."""
+    if not (isinstance(name, str) and PRAGMA_NAME.fullmatch(name)):
+        raise ValueError('invalid PRAGMA name: %r' % (name,))
+    if isinstance(value, bool):
+        value = int(value)
+    if not (isinstance(value, int)
+            or (isinstance(value, str) and PRAGMA_KEYWORD.fullmatch(value))):
+        raise ValueError('PRAGMA %s value must be an int or keyword: %r' % (name, value))
+    return 'PRAGMA %s = %s' % (name, value)
+
+
+@contextlib.contextmanager
+def _pragmas(db, pragmas):
+    old = {}
+    for name, value in pragmas.items():
+        statement = _pragma(name, value)
+        old[name], = db.execute('PRAGMA %s' % name).fetchone()
+        db.execute(statement)
+    try:
+        yield
+    finally:
+        for name, value in old.items():
+            db.execute(_pragma(name, value))
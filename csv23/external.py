@@ -0,0 +1,353 @@
+"""Sorting and joining CSV files larger than memory."""
+
+import concurrent.futures
+import contextlib
+import csv
+import gzip
+import heapq
+import io
+import itertools
+import math
+import operator
+import os
+import sys
+import tempfile
+
+from ._common import ENCODING, DIALECT
+from .shortcuts import read_csv, write_csv
+
+__all__ = ['sort_csv', 'join_csv']
+
+MEMORY_LIMIT = 2 ** 28
+
+MERGE_FANIN = 128
+
+MAX_PARTITIONS = 128
+
+DEFAULT_PARTITIONS = 64
+
+SPILL_ENCODING = 'utf-8'
+
+
+def sort_csv(src, dst, key=None, memory_limit=MEMORY_LIMIT, header=True,
+             dialect=DIALECT, encoding=ENCODING, autocompress=False,
+             reverse=False, workers=None, tmpdir=None):
+    r"""Sort the rows of a CSV file into another one (spilling sorted runs to disk).
+
+    Args:
+        src: Source as readable file-like object or filename/:class:`py:os.PathLike`.
+        dst: Target as writeable file-like object or filename/:class:`py:os.PathLike`.
+        key: Column name or index, sequence of column names/indexes,
+            or callable returning the sort key for a row (``None`` for the whole row).
+        memory_limit (int): Approximate number of bytes of rows to sort in memory at once.
+        header (bool): Keep the first row on top (required for column names in ``key``).
+        dialect: CSV dialect argument for the :func:`csv23.reader`/:func:`csv23.writer`.
+        encoding (str): Name of the encoding used to de/encode the file content.
+        autocompress(bool): Decompress/compress if ``src``/``dst`` is a path
+            that ends in ``'.bz2'``, ``'.gz'``, or ``'.xz'``.
+        reverse (bool): Sort in descending order.
+        workers (int): Number of processes for sorting and spilling the runs
+            (``None`` for sorting in the calling process).
+        tmpdir: Directory for the temporary run files (default: :func:`py:tempfile.gettempdir`).
+
+    Returns:
+        The result of :func:`csv23.write_csv` for ``dst``.
+
+    >>> sort_csv('spam.csv', 'spam-sorted.csv', key='id')  # doctest: +SKIP
+    PosixPath('spam-sorted.csv')
+
+    Raises:
+        ValueError: If ``key`` contains a column name that is not in the header.
+
+    Notes:
+        - The sort is stable: rows with equal keys keep their order.
+        - The key values are strings (compared lexicographically), unless ``key``
+          is a callable converting them (e.g. ``lambda row: int(row[0])``).
+        - Runs are spilled as gzipped CSV files with a k-way :func:`py:heapq.merge`
+          streaming into ``dst``, if all rows do not fit into ``memory_limit``.
+        - With ``workers``, ``key`` must be picklable (e.g. no ``lambda``) and up to
+          ``workers`` runs are held in memory additionally while being sorted.
+    """
+    rows = read_csv(src, dialect=dialect, encoding=encoding, autocompress=autocompress)
+    header_row = next(rows, None) if header else None
+    key = _make_key(key, header_row)
+
+    with tempfile.TemporaryDirectory(prefix='csv23-sort-', dir=tmpdir) as tmp:
+        runs, first = [], None
+        with _RunSorter(workers) as sort_run:
+            for run in _iterruns(rows, memory_limit):
+                if first is None and not runs:
+                    first = run
+                    continue
+                if first is not None:  # does not fit into memory
+                    runs.append(sort_run(first, key, reverse, _run_path(tmp, len(runs))))
+                    first = None
+                runs.append(sort_run(run, key, reverse, _run_path(tmp, len(runs))))
+                del run
+            runs = [r.result() for r in runs]
+
+        with contextlib.ExitStack() as stack:
+            if runs:
+                while len(runs) > MERGE_FANIN:
+                    runs = [_merge_runs(runs[i:i + MERGE_FANIN], key, reverse,
+                                        _run_path(tmp, 'merged-%d-%d' % (len(runs), i)))
+                            for i in range(0, len(runs), MERGE_FANIN)]
+                runs = [stack.enter_context(contextlib.closing(_iterrun(r))) for r in runs]
+                sorted_rows = heapq.merge(*runs, key=key, reverse=reverse)
+            else:  # fits into memory
+                sorted_rows = first if first is not None else []
+                sorted_rows.sort(key=key, reverse=reverse)
+
+            return write_csv(dst, sorted_rows, header=header_row, dialect=dialect,
+                             encoding=encoding, autocompress=autocompress)
+
+
+def _make_key(key, header):
+    if key is None or callable(key):
+        return key
+    return operator.itemgetter(*_column_indexes(key, header))
+
+
+def _column_indexes(columns, header):
+    if isinstance(columns, (str, int)):
+        columns = [columns]
+    indexes = []
+    for c in columns:
+        if isinstance(c, str):
+            if header is None or c not in header:
+                raise ValueError('key column %r not in header: %r' % (c, header))
+            c = header.index(c)
+        indexes.append(c)
+    return indexes
+
+
+def _iterruns(rows, memory_limit, getsizeof=sys.getsizeof):
+    """Yield lists of rows with an approximate size of memory_limit bytes."""
+    run, size = [], 0
+    for row in rows:
+        run.append(row)
+        size += getsizeof(row) + sum(map(getsizeof, row))
+        if size >= memory_limit:
+            yield run
+            run, size = [], 0
+    if run:
+        yield run
+
+
+def _run_path(tmp, name):
+    return os.path.join(tmp, 'run-%s.csv.gz' % name)
+
+
+class _Done(object):
+    """Stand-in for a finished concurrent.futures.Future."""
+
+    def __init__(self, result):
+        self._result = result
+
+    def result(self):
+        return self._result
+
+
+class _RunSorter(object):
+    """Context manager returning sort_run(rows, key, reverse, path) -> future(path)."""
+
+    def __init__(self, workers=None):
+        self._executor = None
+        self._pending = []
+        if workers is not None:
+            self._executor = concurrent.futures.ProcessPoolExecutor(workers)
+            self._workers = workers
+
+    def __enter__(self):
+        return self.sort_run
+
+    def __exit__(self, *exc_info):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=exc_info[0] is not None)
+
+    def sort_run(self, rows, key, reverse, path):
+        if self._executor is None:
+            return _Done(_sort_run(rows, key, reverse, path))
+        # bound the number of runs held in memory
+        self._pending = [f for f in self._pending if not f.done()]
+        if len(self._pending) >= self._workers:
+            concurrent.futures.wait(self._pending,
+                                    return_when=concurrent.futures.FIRST_COMPLETED)
+        future = self._executor.submit(_sort_run, rows, key, reverse, path)
+        self._pending.append(future)
+        return future
+
+
+def _sort_run(rows, key, reverse, path):
+    rows.sort(key=key, reverse=reverse)
+    return _write_run(rows, path)
+
+
+def _write_run(rows, path):
+    with gzip.open(path, 'wb', compresslevel=1) as f:
+        write_csv(f, rows, encoding=SPILL_ENCODING)
+    return path
+
+
+def _iterrun(path):
+    with gzip.open(path, 'rb') as f:
+        yield from read_csv(f, encoding=SPILL_ENCODING)
+
+
+def _merge_runs(paths, key, reverse, path):
+    with contextlib.ExitStack() as stack:
+        runs = [stack.enter_context(contextlib.closing(_iterrun(p))) for p in paths]
+        _write_run(heapq.merge(*runs, key=key, reverse=reverse), path)
+    for p in paths:
+        os.remove(p)
+    return path
+
+
+def join_csv(left, right, dst, on, how='inner', memory_limit=MEMORY_LIMIT,
+             dialect=DIALECT, encoding=ENCODING, autocompress=False, tmpdir=None):
+    r"""Join the rows of two CSV files with headers on key columns into another one.
+
+    Args:
+        left: Left source as readable file-like object or filename/:class:`py:os.PathLike`.
+        right: Right source as readable file-like object or filename/:class:`py:os.PathLike`.
+        dst: Target as writeable file-like object or filename/:class:`py:os.PathLike`.
+        on: Column name or sequence of column names present in both headers.
+        how (str): ``'inner'`` for only the rows with matches on both sides,
+            ``'left'`` to also keep left rows without match (with empty right values).
+        memory_limit (int): Approximate number of bytes of rows for the in-memory hash table.
+        dialect: CSV dialect argument for the :func:`csv23.reader`/:func:`csv23.writer`.
+        encoding (str): Name of the encoding used to de/encode the file content.
+        autocompress(bool): Decompress/compress if ``left``/``right``/``dst`` is a path
+            that ends in ``'.bz2'``, ``'.gz'``, or ``'.xz'``.
+        tmpdir: Directory for the temporary partition files (default: :func:`py:tempfile.gettempdir`).
+
+    Returns:
+        The result of :func:`csv23.write_csv` for ``dst``.
+
+    >>> join_csv('facts.csv', 'lookup.csv', 'joined.csv', on='id', how='left')  # doctest: +SKIP
+    PosixPath('joined.csv')
+
+    Raises:
+        ValueError: If ``how`` is invalid, if a source has no header,
+            or if ``on`` contains a column name that is not in both headers.
+
+    Notes:
+        - The output header are the left columns followed by the right columns
+          not in ``on``, each output row the matching left and right rows likewise.
+        - The hash table is built from the right rows with ``how='left'``.
+          With ``how='inner'``, it is built from the smaller file (if both are paths).
+        - If the table exceeds ``memory_limit``, both sides are partitioned by
+          the hash of their key into gzipped temporary CSV files that are joined
+          pair by pair (Grace hash join). The output row order then differs.
+    """
+    if how not in ('inner', 'left'):
+        raise ValueError("how must be 'inner' or 'left': %r" % how)
+
+    kwargs = {'dialect': dialect, 'encoding': encoding, 'autocompress': autocompress}
+    left_rows, right_rows = (read_csv(left, **kwargs), read_csv(right, **kwargs))
+    left_header, right_header = (next(left_rows, None), next(right_rows, None))
+    if left_header is None or right_header is None:
+        raise ValueError('missing header row for join_csv()')
+
+    left_key = operator.itemgetter(*_column_indexes(on, left_header))
+    right_on = _column_indexes(on, right_header)
+    right_key = operator.itemgetter(*right_on)
+    right_extra = [i for i in range(len(right_header)) if i not in right_on]
+    header = left_header + [right_header[i] for i in right_extra]
+
+    def extra(row):
+        return [row[i] for i in right_extra]
+
+    fill = [''] * len(right_extra) if how == 'left' else None
+
+    left_size, right_size = _file_size(left), _file_size(right)
+    build_left = (how == 'inner' and None not in (left_size, right_size)
+                  and left_size < right_size)
+    if build_left:
+        build, build_key, build_size = left_rows, left_key, left_size
+        probe, probe_key = right_rows, right_key
+    else:
+        build, build_key, build_size = right_rows, right_key, right_size
+        probe, probe_key = left_rows, left_key
+
+    def combine(build_row, probe_row):
+        if build_left:
+            return build_row + extra(probe_row)
+        return probe_row + extra(build_row)
+
+    with tempfile.TemporaryDirectory(prefix='csv23-join-', dir=tmpdir) as tmp:
+        table, size = _build_table(build, build_key, memory_limit)
+        if size is None:
+            rows = _probe(table, probe, probe_key, combine, fill)
+        else:
+            n = _partitions(table, size, build_size, memory_limit)
+            build = itertools.chain(itertools.chain.from_iterable(table.values()), build)
+            del table
+            rows = _grace_join(build, build_key, probe, probe_key, combine, fill, n, tmp)
+
+        return write_csv(dst, rows, header=header, **kwargs)
+
+
+def _file_size(file):
+    if hasattr(file, 'read'):
+        return None
+    return os.path.getsize(file)
+
+
+def _build_table(rows, key, memory_limit, getsizeof=sys.getsizeof):
+    """Return the table of rows by key and None, or the size if memory_limit is reached."""
+    table, size = {}, 0
+    for row in rows:
+        table.setdefault(key(row), []).append(row)
+        size += getsizeof(row) + sum(map(getsizeof, row))
+        if size >= memory_limit:
+            return table, size
+    return table, None
+
+
+def _partitions(table, size, file_size, memory_limit):
+    """Return the number of partitions from the in-memory/on-disk ratio of table rows."""
+    if file_size is None:
+        return DEFAULT_PARTITIONS
+    disk_size = sum(sum(map(len, row)) + len(row)
+                    for rows in table.values() for row in rows)
+    n = math.ceil(file_size * (size / max(disk_size, 1)) / memory_limit) + 1
+    return min(max(n, 2), MAX_PARTITIONS)
+
+
+def _probe(table, rows, key, combine, fill=None):
+    get = table.get
+    for row in rows:
+        matches = get(key(row))
+        if matches is not None:
+            for m in matches:
+                yield combine(m, row)
+        elif fill is not None:
+            yield row + fill
+
+
+def _grace_join(build, build_key, probe, probe_key, combine, fill, n, tmp):
+    build_paths = _partition(build, build_key, n, os.path.join(tmp, 'build-%d.csv.gz'))
+    probe_paths = _partition(probe, probe_key, n, os.path.join(tmp, 'probe-%d.csv.gz'))
+    for build_path, probe_path in zip(build_paths, probe_paths):
+        table = {}
+        for row in _iterrun(build_path):
+            table.setdefault(build_key(row), []).append(row)
+        with contextlib.closing(_iterrun(probe_path)) as rows:
+            yield from _probe(table, rows, probe_key, combine, fill)
+        os.remove(build_path)
+        os.remove(probe_path)
+
+
+def _partition(rows, key, n, path_template):
+    """Write rows into n gzipped CSV files by the hash of their key, return their paths."""
+    paths = [path_template % i for i in range(n)]
+    with contextlib.ExitStack() as stack:
+        writerows = []
+        for p in paths:
+            f = stack.enter_context(io.TextIOWrapper(gzip.open(p, 'wb', compresslevel=1),
+                                                     encoding=SPILL_ENCODING, newline=''))
+            writerows.append(csv.writer(f).writerow)
+        for row in rows:
+            writerows[hash(key(row)) % n](row)
+    return paths
@@ -1,16 +1,19 @@
-"""collections.namedtuple reader/writer."""
+"""collections.namedtuple and dataclass reader/writer."""
 
 from __future__ import unicode_literals
 
 import collections
+import dataclasses
 import functools
+import operator
 
 from ._common import PY2, DIALECT
 from ._dispatch import register_reader, register_writer
 from . import readers
 from . import writers
 
-__all__ = ['NamedTupleReader', 'NamedTupleWriter']
+__all__ = ['NamedTupleReader', 'NamedTupleWriter',
+           'DataclassReader', 'DataclassWriter']
 
 ROW_NAME = 'Row'
 
@@ -42,6 +45,8 @@ class NamedTupleReader(object):
           They cannot start with an underscore.
         - ``rename=True`` replaces invalid ``field_names`` with positional names (``_0``, ``_1``, etc.).
         - If ``rename`` is callable, it is applied to turn the first row strings into ``field_names``.
+        - ``intern`` (and ``categories``) columns are named by the first row strings
+          (see :class:`csv23.readers.InterningReader`).
 
     >>> import io
     >>> text = u'coordinate.x,coordinate.y\r\n11,22\r\n'
@@ -57,6 +62,7 @@ class NamedTupleReader(object):
         self._rename = rename
         self._row_name = row_name
         self._row_cls = None
+        self._header = None
 
     def __iter__(self):
         return self
@@ -76,7 +82,7 @@ class NamedTupleReader(object):
     def _make_row(self):
         assert self._row_cls is None
         try:
-            header = next(self._reader)
+            header = self._header = next(self._reader)
         except StopIteration:
             raise RuntimeError('missing header line for namedtuple fields')
         if callable(self._rename):
@@ -127,16 +133,214 @@ class NamedTupleWriter(object):
         """Write the row namedtuple to the writer's file object,
         formatted according to the current dialect."""
         self._writer.writerow(row._fields)
-        self._writer.writerow(row)
         self.writerow = self._writer.writerow
+        self.writerows = self._writer.writerows
+        return self._writer.writerow(row)
 
     def writerows(self, rows):
         """Write all the rows namedtuples to the writer's file object,
         formatted according to the current dialect."""
-        for r in rows:
+        rows = iter(rows)
+        for r in rows:  # header and first row
             self.writerow(r)
+            break
+        # NOTE: namedtuples are sequences of their values
+        return self._writer.writerows(rows)
 
     @property
     def dialect(self):
         """A read-only description of the dialect in use by the writer."""
         return self._writer.dialect
+
+
+def class_fields(cls):
+    """Return (name, init_name) pairs for the fields of a dataclass or attrs class."""
+    if dataclasses.is_dataclass(cls):
+        return [(f.name, f.name if f.init else None) for f in dataclasses.fields(cls)]
+    attributes = getattr(cls, '__attrs_attrs__', None)
+    if attributes is None:
+        raise TypeError('expected a dataclass or attrs class: %r' % cls)
+    # NOTE: attrs strips leading underscores from __init__ argument names
+    return [(a.name, (getattr(a, 'alias', None) or a.name.lstrip('_')) if a.init else None)
+            for a in attributes]
+
+
+def make_getter(getter_cls, keys):
+    """Return a function returning a tuple of values from getter_cls(*keys)."""
+    if len(keys) == 1:
+        get = getter_cls(*keys)
+        return lambda obj: (get(obj),)
+    elif not keys:
+        return lambda obj: ()
+    return getter_cls(*keys)
+
+
+@register_reader('dataclass', 'bytes', 'text')
+class DataclassReader(object):
+    r""":func:`csv23.reader` yielding dataclass instances of :func:`py:unicode` strings (PY3: :class:`py3:str`).
+
+    Args:
+        stream: Iterable of text (:func:`py:unicode`, PY3: :class:`py3:str`) lines.
+            If an ``encoding`` is given, iterable of encoded (:class:`py:str`, PY3: :class:`py3:bytes`)
+            lines in the given (8-bit clean) ``encoding``.
+        dialect: Dialect argument for the :func:`csv23.reader`.
+        row_cls: The :func:`py:dataclasses.dataclass` (or ``attrs``) class of the rows.
+        encoding: If not ``False`` (default): name of the encoding needed to
+            decode the encoded (:class:`py:str`, PY3: :class:`py3:bytes`) lines from ``stream``.
+        \**kwargs: Keyword arguments for the :func:`csv23.reader`.
+
+    Raises:
+        TypeError: If ``row_cls`` is missing or not a dataclass or ``attrs`` class.
+        NotImplementedError: If ``encoding`` is not 8-bit clean.
+        ValueError: When reading a row with fewer fields than needed for the
+            ``__init__`` fields (by their column in the header).
+
+    Notes:
+        - Matches the columns of the first row (header) to the ``__init__`` fields
+          of ``row_cls`` by name: other columns are ignored, missing fields need
+          a default value.
+        - The values are passed as keyword arguments (also for ``kw_only`` fields).
+        - The values are not converted (e.g. to the annotated field types).
+
+    >>> import io
+    >>> @dataclasses.dataclass(slots=True)
+    ... class Point:
+    ...     x: str
+    ...     y: str
+    >>> with io.StringIO(u'y,x\r\n1,2\r\n', newline='') as f:
+    ...     list(DataclassReader(f, row_cls=Point))
+    [Point(x='2', y='1')]
+    """
+
+    def __init__(self, stream, dialect=DIALECT, row_cls=None, encoding=False, **kwargs):
+        if row_cls is None:
+            raise TypeError('DataclassReader requires row_cls')
+        self._fields = class_fields(row_cls)
+        self._reader = readers.reader(stream, dialect, encoding, **kwargs)
+        self._row_cls = row_cls
+        self._header = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        """Return the next row of the reader's iterable object as dataclass instance,
+        parsed according to the current dialect."""
+        make_row = self._make_row
+        return make_row(next(self._reader))
+
+    @functools.cached_property
+    def _make_row(self):
+        try:
+            header = self._header = next(self._reader)
+        except StopIteration:
+            raise RuntimeError('missing header line for dataclass fields')
+        index = {h: i for i, h in reversed(list(enumerate(header)))}
+        present = [(arg, index[name]) for name, arg in self._fields
+                   if arg is not None and name in index]
+        args = [arg for arg, _ in present]
+        get = make_getter(operator.itemgetter, [i for _, i in present])
+        cls = self._row_cls
+
+        def make_row(row):
+            try:
+                values = get(row)
+            except IndexError:
+                raise ValueError('row on line %d has %d fields, header has %d: %r'
+                                 % (self.line_num, len(row), len(header), row))
+            return cls(**dict(zip(args, values)))
+
+        return make_row
+
+    @property
+    def dialect(self):
+        """A read-only description of the dialect in use by the parser."""
+        return self._reader.dialect
+
+    @property
+    def line_num(self):
+        """The number of lines read from the source iterator.
+        This is not the same as the number of records returned,
+        as records can span multiple lines."""
+        return self._reader.line_num
+
+    @property
+    def row_cls(self):
+        """The dataclass (or ``attrs`` class) of the rows."""
+        return self._row_cls
+
+
+@register_writer('dataclass', 'bytes', 'text')
+class DataclassWriter(object):
+    r""":func:`csv23.writer` for dataclasses where string values are :func:`py:unicode` strings (PY3: :class:`py3:str`).
+
+    Args:
+        stream: File-like object (in binary mode if ``encoding`` is given).
+        dialect: Dialect argument for the :func:`csv23.writer`.
+        row_cls: The :func:`py:dataclasses.dataclass` (or ``attrs``) class of the rows
+            (default: the class of the first row).
+        encoding: If not ``False`` (default): name of the encoding used to
+            encode the output lines.
+        header: ``True`` to write the field names as first row, ``False`` for no header,
+            or a sequence of strings to write instead.
+        \**kwargs: Keyword arguments for the :func:`csv23.writer`.
+
+    Raises:
+        TypeError: If ``row_cls`` is not a dataclass or ``attrs`` class.
+        NotImplementedError: If ``encoding`` is not 8-bit clean.
+
+    Notes:
+        - The field values are extracted with one :func:`py:operator.attrgetter`
+          (without :func:`py:dataclasses.asdict`) and ``writerows()`` passes
+          them to the ``writerows()`` of the :func:`csv23.writer`.
+    """
+
+    def __init__(self, stream, dialect=DIALECT, row_cls=None, encoding=False, header=True,
+                 **kwargs):
+        if row_cls is not None:
+            class_fields(row_cls)  # fail early
+        self._writer = writers.writer(stream, dialect, encoding, **kwargs)
+        self._row_cls = row_cls
+        self._header = header
+
+    def _start(self, row_cls):
+        names = [name for name, _ in class_fields(row_cls)]
+        header = names if self._header is True else self._header
+        if header:
+            self._writer.writerow(header)
+        getter = make_getter(operator.attrgetter, names)
+        self.writerow = functools.partial(_writerow, self._writer.writerow, getter)
+        self.writerows = functools.partial(_writerows, self._writer.writerows, getter)
+
+    def writerow(self, row):
+        """Write the row dataclass instance to the writer's file object,
+        formatted according to the current dialect."""
+        self._start(self._row_cls if self._row_cls is not None else type(row))
+        return self.writerow(row)
+
+    def writerows(self, rows):
+        """Write all the rows dataclass instances to the writer's file object,
+        formatted according to the current dialect."""
+        rows = iter(rows)
+        if self._row_cls is None:
+            for r in rows:  # header and first row
+                self.writerow(r)
+                break
+            else:
+                return None
+        else:
+            self._start(self._row_cls)
+        return self.writerows(rows)
+
+    @property
+    def dialect(self):
+        """A read-only description of the dialect in use by the writer."""
+        return self._writer.dialect
+
+
+def _writerow(writerow, getter, row):
+    return writerow(getter(row))
+
+
+def _writerows(writerows, getter, rows):
+    return writerows(map(getter, rows))
@@ -0,0 +1,339 @@
+"""Lazy row reader/writer splitting fields on demand."""
+
+from __future__ import unicode_literals
+
+import collections.abc
+import csv
+
+from ._common import DIALECT, none_encoding, is_8bit_clean
+from ._dispatch import register_reader, register_writer
+from . import _records
+from . import readers
+from . import writers
+
+__all__ = ['LazyReader', 'LazyRow', 'LazyWriter']
+
+FORMAT = ('delimiter', 'quotechar', 'escapechar', 'doublequote', 'quoting',
+          'skipinitialspace')
+
+VERBATIM_QUOTING = frozenset({csv.QUOTE_MINIMAL, csv.QUOTE_ALL, csv.QUOTE_NONE})
+
+
+def _format(dialect):
+    return tuple(getattr(dialect, a) for a in FORMAT)
+
+
+class _Layout(object):
+    """Dialect and header shared by the rows of a LazyReader."""
+
+    def __init__(self, dialect, scanner, fieldnames=None):
+        self.dialect = dialect
+        self.scanner = scanner
+        self.delimiter = dialect.delimiter
+        self.specials = list(scanner.specials)
+        if dialect.skipinitialspace:
+            self.specials.append(' ')
+        # with other quoting, csv.reader converts unquoted values
+        self.verbatim = dialect.quoting in VERBATIM_QUOTING
+        self.format = _format(dialect)
+        self.fieldnames = fieldnames
+        self.index = ({n: i for i, n in reversed(list(enumerate(fieldnames)))}
+                      if fieldnames is not None else None)
+
+    def has_specials(self, text):
+        return any(c in text for c in self.specials)
+
+    def parse(self, raw):
+        """Return the value of a raw field (with quoting or escaping)."""
+        if self.verbatim and not self.has_specials(raw):
+            return raw
+        # append a delimiter so that empty fields yield a value
+        return next(csv.reader([raw + self.delimiter], self.dialect))[0]
+
+    def split(self, text):
+        """Return the values of the whole raw record text."""
+        return next(csv.reader(_records.LINES.findall(text), self.dialect), [])
+
+
+class LazyRow(collections.abc.Sequence):
+    """Row of a :class:`csv23.LazyReader` splitting its raw record text on demand.
+
+    Supports ``len(row)``, iteration, indexing with :class:`py:int` or :class:`py:slice`,
+    and lookup of a value by column name (``row['status']``, from the header).
+    The start and end offsets of the fields are cached when they are found.
+
+    Notes:
+        - ``row[i]`` scans the ``text`` only up to the end of the ``i``-th field,
+          ``len(row)`` and negative indexes scan for all fields.
+        - Records that do not match the dialect (e.g. with an unterminated
+          quoted field) are split completely with :func:`py:csv.reader`.
+        - Rows compare equal to :class:`py:list` objects with their values.
+    """
+
+    __slots__ = ('text', '_layout', '_end', '_spans', '_pos', '_values')
+
+    def __init__(self, text, layout):
+        self.text = text
+        self._layout = layout
+        end = len(text)
+        if text.endswith('\r\n'):
+            end -= 2
+        elif text.endswith(('\r', '\n')):
+            end -= 1
+        self._end = end
+        self._spans = []
+        self._pos = 0 if end else None
+        self._values = None
+
+    @property
+    def raw(self):
+        """The raw record text without its line terminator."""
+        return self.text[:self._end]
+
+    @property
+    def fieldnames(self):
+        """The column names from the header (``None`` for the header row)."""
+        return self._layout.fieldnames
+
+    def __repr__(self):
+        return '%s(%r)' % (self.__class__.__name__, self.text)
+
+    def __len__(self):
+        if self._values is not None:
+            return len(self._values)
+        self._scan(None)
+        return len(self._values) if self._values is not None else len(self._spans)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            index = self._layout.index
+            if index is None:
+                raise KeyError(key)
+            key = index[key]
+        elif isinstance(key, slice):
+            return [self[i] for i in range(*key.indices(len(self)))]
+        elif key < 0:
+            key += len(self)
+            if key < 0:
+                raise IndexError('row index out of range')
+        if self._values is None:
+            self._scan(key)
+        if self._values is not None:
+            return self._values[key]
+        if key >= len(self._spans):
+            raise IndexError('row index out of range')
+        start, end = self._spans[key]
+        return self._layout.parse(self.text[start:end])
+
+    def get(self, name, default=None):
+        """Return the value of the column name (or default if the row has no such field)."""
+        try:
+            return self[name]
+        except (KeyError, IndexError):
+            return default
+
+    def __iter__(self):
+        if self._values is None:
+            self._scan(None)
+        if self._values is not None:
+            return iter(self._values)
+        return (self[i] for i in range(len(self._spans)))
+
+    def __eq__(self, other):
+        if isinstance(other, LazyRow):
+            other = list(other)
+        elif not isinstance(other, list):
+            return NotImplemented
+        return list(self) == other
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def _scan(self, upto):
+        """Find the field spans up to index upto (all if None)."""
+        pos, spans = self._pos, self._spans
+        if pos is None:
+            return
+        text, end = self.text, self._end
+        delimiter = self._layout.delimiter
+        plain = not self._layout.has_specials(text)
+        field_end = self._layout.scanner.field_end
+        while upto is None or len(spans) <= upto:
+            if plain:
+                stop = text.find(delimiter, pos, end)
+                if stop == -1:
+                    stop = end
+            else:
+                stop = field_end(text, pos, end)
+                if stop is None or (stop != end and text[stop] != delimiter):
+                    self._values = self._layout.split(text)
+                    self._pos = None
+                    return
+            spans.append((pos, stop))
+            if stop == end:
+                pos = None
+                break
+            pos = stop + 1
+        self._pos = pos
+
+
+@register_reader('lazy', 'bytes', 'text')
+class LazyReader(object):
+    r""":func:`csv23.reader` yielding :class:`csv23.lazy.LazyRow` objects splitting fields on demand.
+
+    Args:
+        stream: Iterable of text (:class:`py3:str`) lines.
+            If an ``encoding`` is given, iterable of encoded (:class:`py3:bytes`)
+            lines in the given (8-bit clean) ``encoding``.
+        dialect: Dialect argument for the :func:`py:csv.reader`.
+        encoding: If not ``False`` (default): name of the encoding needed to
+            decode the encoded (:class:`py3:bytes`) lines from ``stream``.
+        \**fmtparams: Keyword arguments (formatting parameters) for the dialect.
+
+    Raises:
+        NotImplementedError: If ``encoding`` is not 8-bit clean.
+        ValueError: For a dialect without quoting with another ``lineterminator``
+            than ``'\r\n'``, ``'\n'``, or ``'\r'`` (e.g. ``dialect='ascii'``).
+
+    Notes:
+        - Reads the first row (header) as ``fieldnames`` for lookup by column name.
+        - The lines of each record are joined into its raw ``text`` without splitting it.
+          Lines containing a ``quotechar`` or ``escapechar`` are scanned for quoted
+          line breaks to find the end of the record.
+        - Fields are split and unquoted when they are accessed (with the rules
+          of :func:`py:csv.reader`, errors with ``strict=True`` are raised then).
+        - :func:`py:csv.field_size_limit` is not enforced.
+        - With :class:`csv23.LazyWriter`, unchanged rows are written as their raw ``text``.
+
+    >>> import io
+    >>> text = u'id,status,comment\r\n1,ok,"spam, eggs"\r\n2,fail,ham\r\n'
+    >>> with io.StringIO(text, newline='') as f:
+    ...     rows = [r for r in LazyReader(f) if r['status'] == 'ok']
+    >>> rows
+    [LazyRow('1,ok,"spam, eggs"\r\n')]
+    >>> rows[0][-1]
+    'spam, eggs'
+    """
+
+    def __init__(self, stream, dialect=DIALECT, encoding=False, **fmtparams):
+        if encoding is not False:
+            if encoding is None:
+                encoding = none_encoding()
+            if not is_8bit_clean(encoding):
+                raise NotImplementedError
+            stream = (str(line, encoding) for line in stream)
+        self._dialect = csv.reader((), dialect, **fmtparams).dialect
+        if (readers.is_quote_free(self._dialect)
+                and self._dialect.lineterminator not in readers.NEWLINES):
+            raise ValueError('lineterminator not supported by LazyReader: %r'
+                             % self._dialect.lineterminator)
+        self._lines = iter(stream)
+        self._scanner = _records.RecordScanner(self._dialect)
+        self._layout = None
+        self._line_num = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        """Return the next row of the reader's iterable object as LazyRow."""
+        text = self._next_record()
+        if self._layout is None:
+            header = LazyRow(text, _Layout(self._dialect, self._scanner))
+            self._layout = _Layout(self._dialect, self._scanner, list(header))
+            text = self._next_record()
+        return LazyRow(text, self._layout)
+
+    def _next_record(self):
+        text = next(self._lines)
+        self._line_num += 1
+        if self._scanner.has_specials(text):
+            # the record continues if its line break is inside a quoted field
+            while self._scanner.spans(text)[1] != len(text):
+                try:
+                    line = next(self._lines)
+                except StopIteration:
+                    break
+                self._line_num += 1
+                text += line
+        return text
+
+    @property
+    def dialect(self):
+        """A read-only description of the dialect in use by the parser."""
+        return self._dialect
+
+    @property
+    def line_num(self):
+        """The number of lines read from the source iterator."""
+        return self._line_num
+
+    @property
+    def fieldnames(self):
+        """The column names from the first row (``None`` before it is read)."""
+        return self._layout.fieldnames if self._layout is not None else None
+
+
+@register_writer('lazy', 'bytes', 'text')
+class LazyWriter(object):
+    r""":func:`csv23.writer` for :class:`csv23.lazy.LazyRow` objects (or sequences of strings).
+
+    Args:
+        stream: File-like object (in binary mode if ``encoding`` is given).
+        dialect: Dialect argument for the :func:`csv23.writer`.
+        encoding: If not ``False`` (default): name of the encoding used to
+            encode the output lines.
+        header: Sequence of strings to write as first row (immediately), or ``None``
+            (default) to write the ``fieldnames`` of the first row if it has them.
+        \**kwargs: Keyword arguments for the :func:`csv23.writer`.
+
+    Raises:
+        NotImplementedError: If ``encoding`` is not 8-bit clean.
+
+    Notes:
+        - With ``header=None``, a first :class:`csv23.lazy.LazyRow` is preceded by the
+          ``fieldnames`` of its reader. Other first rows (e.g. :class:`py:list` objects)
+          are written without header, as is nothing if no rows are written.
+        - Rows read with the same formatting parameters (except ``lineterminator``)
+          are written as their raw record text (without splitting them)
+          followed by the ``lineterminator``. Other rows are formatted.
+    """
+
+    def __init__(self, stream, dialect=DIALECT, encoding=False, header=None, **kwargs):
+        self._writer = writers.writer(stream, dialect, encoding, **kwargs)
+        self._stream = stream
+        if encoding is None:
+            encoding = none_encoding()
+        self._encoding = encoding
+        self._format = _format(self._writer.dialect)
+        self._lineterminator = self._writer.dialect.lineterminator
+        if header is not None:
+            self._writer.writerow(header)
+            self.writerow = self._writerow
+
+    def writerow(self, row):
+        """Write the first row (after the fieldnames of a LazyRow) to the writer's file object."""
+        fieldnames = getattr(row, 'fieldnames', None)
+        if fieldnames is not None:
+            self._writer.writerow(fieldnames)
+        self.writerow = self._writerow
+        return self._writerow(row)
+
+    def _writerow(self, row):
+        if isinstance(row, LazyRow) and row._layout.format == self._format:
+            line = row.raw + self._lineterminator
+            if self._encoding is not False:
+                line = line.encode(self._encoding)
+            return self._stream.write(line)
+        return self._writer.writerow(list(row))
+
+    def writerows(self, rows):
+        """Write all the rows to the writer's file object."""
+        for r in rows:
+            self.writerow(r)
+
+    @property
+    def dialect(self):
+        """A read-only description of the dialect in use by the writer."""
+        return self._writer.dialect
@@ -4,18 +4,36 @@
 
 from __future__ import unicode_literals
 
+import collections
 import contextlib
+import csv
 import functools
 import io
+import itertools
 
-from ._common import (PY2, ENCODING, DIALECT, ROWTYPE,
+from ._common import (PY2, ENCODING, DIALECT, ROWTYPE, BUFFER_SIZE,
                       none_encoding, is_8bit_clean)
 from ._dispatch import get_reader, get_writer
+from . import _fields
+from . import _quarantine
+from . import _records
+from . import _streams
+from . import readers
+from . import stats as _stats
 
-__all__ = ['open_reader', 'open_writer']
+__all__ = ['open_reader', 'open_writer', 'Checkpoint', 'BadRecord', 'LargeField']
 
+Checkpoint = collections.namedtuple('Checkpoint', ['offset', 'line_num', 'header'])
 
-def open_reader(filename, encoding=ENCODING, dialect=DIALECT, rowtype=ROWTYPE, **fmtparams):
+BadRecord = _quarantine.BadRecord
+
+LargeField = _fields.LargeField
+
+
+def open_reader(filename, encoding=ENCODING, dialect=DIALECT, rowtype=ROWTYPE,
+                stats=None, prefilter=None, checkpoints=False, resume=None,
+                prefetch=None, buffer_size=BUFFER_SIZE, on_error='raise', quarantine=None,
+                max_field_size=None, large_fields='spill', **fmtparams):
     r"""Context manager returning a CSV reader (closing the file on exit).
 
     Args:
@@ -24,13 +42,49 @@ def open_reader(filename, encoding=ENCODING, dialect=DIALECT, rowtype=ROWTYPE, *
         dialect: Dialect argument for the :func:`csv23.reader`.
         rowtype (str): ``'list'`` for a :func:`csv23.reader`,
            ``'dict'`` for a :class:`csv23.DictReader`,
-           ``'namedtuple'`` for a :class:`csv23.NamedTupleReader`.
+           ``'namedtuple'`` for a :class:`csv23.NamedTupleReader`,
+           ``'lazy'`` for a :class:`csv23.LazyReader`,
+           ``'dataclass'`` for a :class:`csv23.DataclassReader`.
+        stats: ``True`` or a :class:`csv23.Stats` instance to count rows and bytes
+            and time the stages (exposed as ``.stats`` attribute of the reader).
+        prefilter: :class:`py:str`, :class:`py:bytes`, or compiled :func:`py:re.compile`
+            pattern: skip records not containing/matching it before parsing.
+        checkpoints (bool): Give the reader a ``checkpoint()`` method returning
+            a :class:`csv23.openers.Checkpoint` token for resuming after the last row read.
+        resume: :class:`csv23.openers.Checkpoint` token (or a sequence of its three
+            values) to continue reading from (implies ``checkpoints=True``).
+        prefetch (int): Number of blocks to read ahead in a background thread.
+        buffer_size (int): Size in bytes of the file buffer and of the chunks
+            decoded at once (``None`` for the :mod:`py:io` defaults).
+        on_error (str): ``'raise'`` for exceptions on malformed records,
+            ``'quarantine'`` to pass them to ``quarantine`` and continue.
+        quarantine: Callable taking a :class:`csv23.openers.BadRecord` for each
+            malformed record, or filename/:class:`py:os.PathLike` to write them
+            into as CSV (with ``encoding``).
+        max_field_size (int): Return fields longer than this number of characters as
+            :class:`csv23.openers.LargeField` (``None`` for :func:`py:csv.field_size_limit`).
+        large_fields (str): ``'spill'`` to copy them into temporary files,
+            ``'slice'`` to reference their raw bytes in the file if possible.
         \**fmtparams: Keyword arguments (formatting parameters) for the
-            :func:`csv23.reader`.
+            :func:`csv23.reader` (must include ``row_cls`` with ``rowtype='dataclass'``).
 
     Returns:
         A context manager returning a Python 3 :func:`py3:csv.reader` stand-in when entering.
 
+    Raises:
+        ValueError: If ``checkpoints`` or ``resume`` is combined with ``prefilter`` or ``prefetch``,
+            if ``on_error`` is invalid or does not match ``quarantine``,
+            or if ``on_error='quarantine'`` is combined with ``prefilter``,
+            ``checkpoints``, or ``resume``. Also if ``max_field_size`` or ``large_fields``
+            is invalid, or if ``max_field_size`` is combined with ``prefilter``,
+            ``checkpoints``, ``resume``, or ``on_error='quarantine'``
+            (``large_fields='slice'`` also with ``prefetch``).
+            Also if the ``intern``, ``categories``, or ``max_distinct`` keyword argument
+            is invalid or combined with ``checkpoints``, ``resume``, or ``max_field_size``.
+            Also if ``rowtype='lazy'`` is combined with ``on_error='quarantine'``,
+            ``max_field_size``, or ``intern``, or if ``prefilter`` is used with a ``dialect``
+            without ``quotechar`` and ``escapechar`` that has a non-newline ``lineterminator``.
+
     >>> with open_reader('spam.csv', encoding='utf-8') as reader:  # doctest: +SKIP
     ...     for row in reader:
     ...         print(row)
@@ -45,7 +99,41 @@ def open_reader(filename, encoding=ENCODING, dialect=DIALECT, rowtype=ROWTYPE, *
         - If ``encoding=None`` is given, :func:`py:locale.getpreferredencoding` is used.
         - Under Python 2, an optimized implementation is used for 8-bit encodings
           that are ASCII-compatible (e.g. the default ``'utf-8'``).
+        - With ``prefilter``, the raw text of each record is searched before it is parsed.
+          Records spanning multiple lines (quoted newlines) are searched as a whole.
+          The first record (header) is always kept. Surviving rows might still need
+          to be checked on their parsed values, e.g. if the match spans fields.
+          The reader's ``line_num`` counts only the lines of the surviving records.
+        - The ``offset`` of a :class:`csv23.openers.Checkpoint` is the position of the
+          next record from :meth:`py:io.TextIOBase.tell` (the byte offset for 8-bit
+          clean encodings like ``'utf-8'``), ``line_num`` the reader's ``line_num``,
+          and ``header`` the first row (``fieldnames`` with ``rowtype='dict'``).
+          Resuming seeks to ``offset`` without parsing the rows before it.
+        - With ``on_error='quarantine'``, records raising :class:`py:csv.Error`, with
+          undecodable bytes (decoded with ``errors='surrogateescape'``), or with
+          another number of fields than the first row (``fieldnames`` with
+          ``rowtype='dict'``) are skipped. Their :class:`csv23.openers.BadRecord`
+          has the byte ``offset`` of the record (``None`` with ``prefetch``),
+          the ``line_num`` of its first line, the ``error`` message, and its raw
+          ``text`` (undecodable bytes as surrogates: written back as the original
+          bytes into a ``quarantine`` file). Reading resumes at the next record
+          boundary (after a :class:`py:csv.Error` found by the quoting rules).
+        - With ``max_field_size``, the lines are read with a size limit: records longer
+          than ``max_field_size`` are parsed from chunks of the file without loading
+          them (like :func:`py:csv.reader` with ``strict=False``). With
+          ``large_fields='slice'`` (8-bit clean ``encoding``), fields whose raw text is
+          their value (no escaping) reference ``filename`` instead of being copied.
+          Spilled files are removed when their :class:`csv23.openers.LargeField` is
+          garbage collected.
+        - The ``intern``, ``categories``, and ``max_distinct`` keyword arguments
+          (see :class:`csv23.readers.InterningReader`) are applied to the rows
+          returned after ``prefilter`` and ``on_error='quarantine'``.
     """
+    _quarantine.check_on_error(on_error, quarantine)
+    if rowtype == 'lazy' and (on_error == 'quarantine' or max_field_size is not None
+                              or 'intern' in fmtparams):
+        raise ValueError("rowtype='lazy' is not supported with on_error='quarantine',"
+                         ' max_field_size, or intern')
     if encoding is None:
         encoding = none_encoding()
     if PY2 and is_8bit_clean(encoding):  # avoid recoding
@@ -55,10 +143,50 @@ def open_reader(filename, encoding=ENCODING, dialect=DIALECT, rowtype=ROWTYPE, *
     else:
         open_kwargs = {'mode': 'r', 'encoding': encoding, 'newline': ''}
         reader_func = get_reader(rowtype, 'text')
-    return _open_csv(filename, open_kwargs, reader_func, dialect, fmtparams)
+    if (checkpoints or resume is not None) and prefetch is not None:
+        raise ValueError('checkpoints/resume are not supported with prefetch')
+    if prefilter is not None:
+        if checkpoints or resume is not None:
+            raise ValueError('checkpoints/resume are not supported with prefilter')
+        _records.check_lineterminator(_records.get_dialect(dialect, fmtparams), 'prefilter')
+        reader_func = _prefiltering(reader_func, prefilter, encoding)
+    elif checkpoints or resume is not None:
+        reader_func = _resumable(reader_func, rowtype, resume)
+    if on_error == 'quarantine':
+        if prefilter is not None or checkpoints or resume is not None:
+            raise ValueError("on_error='quarantine' is not supported with"
+                             " prefilter or checkpoints/resume")
+        open_kwargs['errors'] = _quarantine.ERRORS
+    if max_field_size is not None:
+        _fields.check_large_fields(max_field_size, large_fields, encoding)
+        if (prefilter is not None or checkpoints or resume is not None
+                or on_error == 'quarantine'):
+            raise ValueError('max_field_size is not supported with prefilter,'
+                             " checkpoints/resume, or on_error='quarantine'")
+        if large_fields == 'slice' and prefetch is not None:
+            raise ValueError("large_fields='slice' is not supported with prefetch")
+        reader_func = _large_fields(reader_func, rowtype, max_field_size, large_fields,
+                                    encoding, filename)
+    interning = {k: fmtparams.pop(k) for k in ('intern', 'categories', 'max_distinct')
+                 if k in fmtparams}
+    if interning:
+        readers.check_intern(**interning)
+        if checkpoints or resume is not None or max_field_size is not None:
+            raise ValueError('intern is not supported with checkpoints/resume'
+                             ' or max_field_size')
+    open_csv = functools.partial(_open_csv, filename, open_kwargs, dialect=dialect,
+                                 reader_kwargs=fmtparams, stats=_stats.get_stats(stats),
+                                 prefetch=prefetch, buffer_size=buffer_size)
+    if on_error == 'quarantine':
+        return _open_quarantined(open_csv, reader_func, rowtype, quarantine, encoding,
+                                 interning)
+    if interning:
+        reader_func = _interning(reader_func, rowtype, **interning)
+    return open_csv(csv_func=reader_func)
 
 
-def open_writer(filename, encoding=ENCODING, dialect=DIALECT, rowtype=ROWTYPE, **fmtparams):
+def open_writer(filename, encoding=ENCODING, dialect=DIALECT, rowtype=ROWTYPE,
+                stats=None, buffer_size=BUFFER_SIZE, **fmtparams):
     r"""Context manager returning a CSV writer (closing the file on exit).
 
     Args:
@@ -67,7 +195,13 @@ def open_writer(filename, encoding=ENCODING, dialect=DIALECT, rowtype=ROWTYPE, *
         dialect: Dialect argument for the :func:`csv23.writer`.
         rowtype (str): ``'list'`` for a :func:`csv23.writer`,
             ``'dict'`` for a :class:`csv23.DictWriter`,
-            ``'namedtuple'`` for a :class:`csv23.NamedTupleWriter`.
+            ``'namedtuple'`` for a :class:`csv23.NamedTupleWriter`,
+            ``'lazy'`` for a :class:`csv23.LazyWriter`,
+            ``'dataclass'`` for a :class:`csv23.DataclassWriter`.
+        stats: ``True`` or a :class:`csv23.Stats` instance to count rows and bytes
+            and time the stages (exposed as ``.stats`` attribute of the writer).
+        buffer_size (int): Size in bytes of the file buffer and of the chunks
+            encoded at once (``None`` for the :mod:`py:io` defaults).
         \**fmtparams: Keyword arguments (formatting parameters) for the
             :func:`csv23.writer` (must include ``fieldnames`` with
             ``rowtype='dict'``).
@@ -101,14 +235,222 @@ def open_writer(filename, encoding=ENCODING, dialect=DIALECT, rowtype=ROWTYPE, *
     if rowtype == 'dict' and 'fieldnames' not in fmtparams:
         raise TypeError("open_writer(rowtype='dict') requires a 'fieldnames' "
                         "keyword argument to be passed to csv.DictWriter")
-    return _open_csv(filename, open_kwargs, writer_func, dialect, fmtparams)
+    return _open_csv(filename, open_kwargs, writer_func, dialect, fmtparams,
+                     stats=_stats.get_stats(stats), buffer_size=buffer_size)
+
+
+def _prefiltering(reader_func, prefilter, encoding):
+    """Return reader_func variant skipping records not matching prefilter."""
+    _records.make_search(prefilter, encoding)  # fail early
+
+    def prefiltering_reader(f, dialect=DIALECT, **kwargs):
+        lines = _records.prefiltered(f, _records.get_dialect(dialect, kwargs),
+                                     prefilter, encoding)
+        return reader_func(lines, dialect=dialect, **kwargs)
+
+    return prefiltering_reader
+
+
+def _resumable(reader_func, rowtype, resume):
+    """Return reader_func variant returning a ResumableReader (continuing from resume)."""
+    offset, line_num, header = resume if resume is not None else (0, 0, None)
+
+    def resumable_reader(f, dialect=DIALECT, **kwargs):
+        if offset:
+            f.seek(offset)
+        # NOTE: iterating with next() disables tell()
+        lines = iter(f.readline, '')
+        base = line_num
+        if offset and header is not None:
+            if rowtype == 'dict':
+                kwargs.setdefault('fieldnames', header)
+            elif rowtype in ('namedtuple', 'lazy', 'dataclass'):
+                header_lines = _format_lines(header, _records.get_dialect(dialect, kwargs))
+                lines = itertools.chain(header_lines, lines)
+                base -= len(header_lines)
+        reader = reader_func(lines, dialect=dialect, **kwargs)
+        return ResumableReader(reader, f, rowtype, line_num=base, header=header)
+
+    return resumable_reader
 
 
 @contextlib.contextmanager
-def _open_csv(filename, open_kwargs, csv_func, dialect, reader_kwargs):
+def _open_quarantined(open_csv, reader_func, rowtype, quarantine, encoding,
+                      interning=None):
+    """open_csv() context manager with reader_func skipping records into quarantine."""
+    with _quarantine.open_sink(quarantine, encoding) as sink:
+        reader_func = _quarantining(reader_func, rowtype, sink, encoding)
+        if interning:
+            reader_func = _interning(reader_func, rowtype, **interning)
+        with open_csv(csv_func=reader_func) as reader:
+            yield reader
+
+
+def _quarantining(reader_func, rowtype, sink, encoding):
+    """Return reader_func variant passing malformed records to sink."""
+
+    def quarantining_reader(f, dialect=DIALECT, **kwargs):
+        pending = []
+        reader = reader_func(_quarantine.tracked_lines(f, pending),
+                             dialect=dialect, **kwargs)
+        if rowtype == 'list':
+            return _quarantine.QuarantineReader(reader, f, pending, sink, encoding)
+        # NOTE: skip on the list rows of the wrapped csv23.reader
+        name = _LIST_READER[rowtype]
+        fieldnames = kwargs.get('fieldnames')
+        inner = _quarantine.QuarantineReader(getattr(reader, name), f, pending, sink,
+                                             encoding, n_fields=len(fieldnames)
+                                             if fieldnames is not None else None)
+        setattr(reader, name, inner)
+        return reader
+
+    return quarantining_reader
+
+
+_LIST_READER = {'dict': 'reader', 'namedtuple': '_reader', 'dataclass': '_reader'}
+
+
+def _large_fields(reader_func, rowtype, max_field_size, large_fields, encoding, source):
+    """Return reader_func variant returning fields larger than max_field_size as LargeField."""
+
+    def large_field_reader(f, dialect=DIALECT, **kwargs):
+        fmtparams = {k: v for k, v in kwargs.items() if k in _records.FMTPARAMS}
+        inner = _fields.LargeFieldReader(f, dialect, max_field_size, large_fields,
+                                         encoding, source=source, **fmtparams)
+        if rowtype == 'list':
+            return inner
+        reader = reader_func(iter(()), dialect=dialect, **kwargs)
+        setattr(reader, _LIST_READER[rowtype], inner)
+        return reader
+
+    return large_field_reader
+
+
+def _interning(reader_func, rowtype, intern=None, categories=None,
+               max_distinct=readers.MAX_DISTINCT):
+    """Return reader_func variant sharing repeated values of the intern columns."""
+
+    def interning_reader(f, dialect=DIALECT, **kwargs):
+        reader = reader_func(f, dialect=dialect, **kwargs)
+        if rowtype == 'list':
+            return readers.InterningReader(reader, intern, categories, max_distinct)
+        name = _LIST_READER[rowtype]
+        inner = readers.InterningReader(getattr(reader, name), intern, categories,
+                                        max_distinct, header=kwargs.get('fieldnames'))
+        setattr(reader, name, inner)
+        return reader
+
+    return interning_reader
+
+
+def _format_lines(row, dialect):
+    """Return the lines of row formatted as CSV record with dialect."""
+    with io.StringIO() as f:
+        csv.writer(f, dialect).writerow(row)
+        return _records.LINES.findall(f.getvalue())
+
+
+class ResumableReader(object):
+    """Proxy for a CSV reader fed from ``stream.readline()`` returning checkpoint tokens."""
+
+    def __init__(self, reader, stream, rowtype, line_num=0, header=None):
+        self._reader = reader
+        self._stream = stream
+        self._rowtype = rowtype
+        self._line_num = line_num
+        self._header = header
+
+    def __getattr__(self, name):
+        return getattr(self._reader, name)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        row = next(self._reader)
+        if self._header is None:
+            if self._rowtype == 'dict':
+                self._header = list(self._reader.fieldnames)
+            elif self._rowtype in ('namedtuple', 'dataclass'):
+                self._header = list(self._reader._header)
+            elif self._rowtype == 'lazy':
+                self._header = list(self._reader.fieldnames)
+            else:
+                self._header = list(row)
+        return row
+
+    @property
+    def line_num(self):
+        """The number of lines read from the file (including the ones before resuming)."""
+        return self._line_num + self._reader.line_num
+
+    def checkpoint(self):
+        """Return a :class:`csv23.openers.Checkpoint` for resuming after the last row read."""
+        return Checkpoint(self._stream.tell(), self.line_num, self._header)
+
+
+class RowIterator(object):
+    """Iterator over the rows of an open_reader() call (closed on exhaustion or error)."""
+
+    def __init__(self, open_func, checkpoints=False, resume=None):
+        self._checkpoints = checkpoints or resume is not None
+        self._checkpoint = Checkpoint(*resume) if resume is not None else Checkpoint(0, 0, None)
+        self._reader = None
+        self._rows = self._iterrows(open_func)
+
+    def _iterrows(self, open_func):
+        with open_func() as reader:
+            self._reader = reader
+            try:
+                for row in reader:
+                    yield row
+            finally:
+                self._reader = None
+                if self._checkpoints:
+                    self._checkpoint = reader.checkpoint()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._rows)
+
+    def close(self):
+        """Close the underlying file."""
+        self._rows.close()
+
+    def checkpoint(self):
+        """Return a :class:`csv23.openers.Checkpoint` for resuming after the last row."""
+        if not self._checkpoints:
+            raise RuntimeError('checkpoint() requires checkpoints=True or resume')
+        if self._reader is not None:
+            return self._reader.checkpoint()
+        return self._checkpoint
+
+
+@contextlib.contextmanager
+def _open_csv(filename, open_kwargs, csv_func, dialect, reader_kwargs, stats=None,
+              prefetch=None, buffer_size=None):
     """io.open() context manager returning csv_func(<file>, dialect=dialect)."""
-    f = io.open(filename, **open_kwargs)
+    _streams.check_buffer_size(buffer_size)
+    if stats is not None:
+        f = _stats.open_timed(filename, stats, prefetch=prefetch,
+                              buffer_size=buffer_size, **open_kwargs)
+    elif prefetch is not None:
+        f = _streams.open_text(filename, prefetch=prefetch,
+                               buffer_size=buffer_size, **open_kwargs)
+    else:
+        if buffer_size is not None:
+            open_kwargs = dict(open_kwargs, buffering=buffer_size)
+        f = io.open(filename, **open_kwargs)
+        _streams.set_chunk_size(f, buffer_size)
     try:
-        yield csv_func(f, dialect=dialect, **reader_kwargs)
+        result = csv_func(f, dialect=dialect, **reader_kwargs)
+        if stats is not None:
+            if open_kwargs['mode'] == 'r':
+                result = _stats.StatsReader(result, stats)
+            else:
+                result = _stats.StatsWriter(result, stats)
+        yield result
     finally:
         f.close()
@@ -0,0 +1,120 @@
+"""Reading many CSV files concurrently."""
+
+import collections
+import concurrent.futures
+import glob
+import itertools
+import os
+import pathlib
+
+from ._common import ENCODING, DIALECT
+from .shortcuts import read_csv
+
+__all__ = ['read_many']
+
+
+def read_many(paths, workers=None, ordered=True, processes=False, header=True,
+              source=False, dialect=DIALECT, encoding=ENCODING, autocompress=False,
+              as_list=False):
+    r"""Iterator yielding the rows of many CSV files read concurrently.
+
+    Args:
+        paths: Glob pattern (:func:`py:glob.glob` with ``recursive=True``), directory
+            (all files in it), or iterable of filenames/:class:`py:os.PathLike` objects.
+        workers (int): Number of threads or processes (default: :func:`py:os.cpu_count`).
+        ordered (bool): Yield the rows file by file in the order of ``paths``
+            instead of in the order the files are finished.
+        processes (bool): Use a :class:`py:concurrent.futures.ProcessPoolExecutor`
+            instead of a :class:`py:concurrent.futures.ThreadPoolExecutor`.
+        header (bool): Check that the first row of all files is the same and
+            yield it only once (as first row).
+        source (bool): Yield ``(path, row)`` pairs with the :class:`py:pathlib.Path` of the file.
+        dialect: CSV dialect argument for the :func:`csv23.reader`.
+        encoding (str): Name of the encoding used to decode the file content.
+        autocompress(bool): Decompress the paths that end in ``'.bz2'``, ``'.gz'``, or ``'.xz'``.
+        as_list (bool): Return a :class:`py:list` of rows instead of an iterator.
+
+    Returns:
+        An iterator yielding a :class:`py:list` of row values (or ``(path, row)``) for each row.
+
+    >>> for row in read_many('data/*.csv.gz', workers=8, autocompress=True):  # doctest: +SKIP
+    ...     print(row)
+    ['id', 'spam']
+    ['1', 'eggs']
+
+    Raises:
+        ValueError: If ``header=True`` and the first row of a file differs.
+
+    Notes:
+        - Each file is read completely by a worker, with at most ``2 * workers`` files
+          held in memory, i.e. it is meant for many files of moderate size.
+        - Threads can overlap decompression and I/O (releasing the GIL),
+          processes also parsing (at the cost of pickling the rows).
+        - Files without rows are skipped.
+    """
+    paths = _resolve_paths(paths)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    kwargs = {'dialect': dialect, 'encoding': encoding, 'autocompress': autocompress}
+    rows = _iterrows(paths, workers, ordered, processes, header, source, kwargs)
+    if as_list:
+        return list(rows)
+    return rows
+
+
+def _resolve_paths(paths):
+    if isinstance(paths, (str, os.PathLike)):
+        if os.path.isdir(paths):
+            return sorted(p for p in pathlib.Path(paths).iterdir() if p.is_file())
+        return sorted(pathlib.Path(p) for p in glob.glob(str(paths), recursive=True))
+    return [pathlib.Path(p) for p in paths]
+
+
+def _read_file(path, kwargs):
+    return read_csv(path, as_list=True, **kwargs)
+
+
+def _iterfiles(paths, workers, ordered, processes, kwargs):
+    """Yield (path, rows) pairs with at most 2 * workers files in flight."""
+    executor_cls = (concurrent.futures.ProcessPoolExecutor if processes else
+                    concurrent.futures.ThreadPoolExecutor)
+    executor = executor_cls(workers)
+    try:
+        paths = iter(paths)
+        pending = collections.OrderedDict()
+        while True:
+            for path in paths:
+                pending[executor.submit(_read_file, path, kwargs)] = path
+                if len(pending) >= 2 * workers:
+                    break
+            if not pending:
+                break
+            if ordered:
+                future = next(iter(pending))
+            else:
+                done, _ = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                future = next(f for f in pending if f in done)
+            path = pending.pop(future)
+            yield path, future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _iterrows(paths, workers, ordered, processes, header, source, kwargs):
+    first = None
+    for path, rows in _iterfiles(paths, workers, ordered, processes, kwargs):
+        if not rows:
+            continue
+        if header:
+            if first is None:
+                first = rows[0]
+            elif rows[0] != first:
+                raise ValueError('header %r of %s differs from %r' % (rows[0], path, first))
+            else:
+                rows = itertools.islice(rows, 1, None)
+        if source:
+            for row in rows:
+                yield path, row
+        else:
+            yield from rows
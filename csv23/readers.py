@@ -10,10 +10,16 @@ from ._dispatch import register_reader
 from ._workarounds import warn_if_issue31590
 
 __all__ = ['reader', 'DictReader',
-           'UnicodeTextReader', 'UnicodeBytesReader']
+           'UnicodeTextReader', 'UnicodeBytesReader',
+           'SplitReader', 'InterningReader']
 
+NEWLINES = ('\r\n', '\n', '\r')
 
-def reader(stream, dialect=DIALECT, encoding=False, **fmtparams):
+MAX_DISTINCT = 2 ** 16
+
+
+def reader(stream, dialect=DIALECT, encoding=False, intern=None, categories=None,
+           max_distinct=MAX_DISTINCT, **fmtparams):
     r"""CSV reader yielding lists of :func:`py:unicode` strings (PY3: :class:`py3:str`).
 
     Args:
@@ -23,6 +29,12 @@ def reader(stream, dialect=DIALECT, encoding=False, **fmtparams):
         dialect: Dialect argument for the underlying :func:`py:csv.reader`.
         encoding: If not ``False`` (default): name of the encoding needed to
             decode the encoded (:class:`py:str`, PY3: :class:`py3:bytes`) lines from ``stream``.
+        intern: ``'auto'`` or sequence of column names (from the first row) or indexes:
+            return a :class:`csv23.readers.InterningReader` sharing one string object
+            for repeated values of these columns.
+        categories (dict): Return integer codes for the ``intern`` columns instead,
+            filling ``categories`` with a list of their distinct values for each column.
+        max_distinct (int): Maximal number of distinct values kept per column.
         \**fmtparams: Keyword arguments (formatting parameters) for the
             underlying :func:`py:csv.reader`.
 
@@ -40,14 +52,20 @@ def reader(stream, dialect=DIALECT, encoding=False, **fmtparams):
 
     Raises:
         NotImplementedError: If ``encoding`` is not 8-bit clean.
+        ValueError: If ``intern``, ``categories``, or ``max_distinct`` is invalid.
     """
+    check_intern(intern, categories, max_distinct)
     if encoding is False:
-        return UnicodeTextReader(stream, dialect, **fmtparams)
-    if encoding is None:
-        encoding = none_encoding()
-    if not is_8bit_clean(encoding):
-        raise NotImplementedError
-    return UnicodeBytesReader(stream, dialect, encoding, **fmtparams)
+        result = UnicodeTextReader(stream, dialect, **fmtparams)
+    else:
+        if encoding is None:
+            encoding = none_encoding()
+        if not is_8bit_clean(encoding):
+            raise NotImplementedError
+        result = UnicodeBytesReader(stream, dialect, encoding, **fmtparams)
+    if intern is not None:
+        result = InterningReader(result, intern, categories, max_distinct)
+    return result
 
 
 @register_reader('dict', 'bytes', 'text')
@@ -55,10 +73,15 @@ class DictReader(csv.DictReader):
     """:func:`csv23.reader` yielding dicts of :func:`py:unicode` strings (PY3: :class:`py3:str`)."""
 
     def __init__(self, f, fieldnames=None, restkey=None, restval=None,
-                 dialect=DIALECT, encoding=False, **kwds):
+                 dialect=DIALECT, encoding=False, intern=None, categories=None,
+                 max_distinct=MAX_DISTINCT, **kwds):
         # NOTE: csv.DictReader is an old-style class on PY2
         csv.DictReader.__init__(self, [], fieldnames, restkey, restval)
+        check_intern(intern, categories, max_distinct)
         self.reader = reader(f, dialect, encoding, **kwds)
+        if intern is not None:
+            self.reader = InterningReader(self.reader, intern, categories, max_distinct,
+                                          header=fieldnames)
 
 
 class Reader(object):
@@ -116,9 +139,13 @@ if PY2:
             self._decode = lambda s: unicode(s, encoding)
 
 else:
-    #: Unicode CSV reader for iterables of text (``str``) lines.
-    UnicodeTextReader = csv.reader
-    register_reader('list', 'text')(UnicodeTextReader)
+    @register_reader('list', 'text')
+    def UnicodeTextReader(stream, dialect=DIALECT, **kwargs):  # noqa: N802
+        """Unicode CSV reader for iterables of text (``str``) lines."""
+        reader = csv.reader(stream, dialect, **kwargs)
+        if is_quote_free(reader.dialect):
+            return SplitReader(stream, reader.dialect)
+        return reader
 
 
     @register_reader('list', 'bytes')
@@ -127,3 +154,198 @@ else:
         def __init__(self, stream, dialect=DIALECT, encoding=ENCODING, **kwargs):
             text_stream = (str(line, encoding) for line in stream)
             super(UnicodeBytesReader, self).__init__(text_stream, dialect, **kwargs)
+            if is_quote_free(self.dialect):
+                self._reader = SplitReader(text_stream, self.dialect)
+
+
+def is_quote_free(dialect):
+    """Return if records in dialect can be split with ``str.split()``."""
+    return ((dialect.quoting == csv.QUOTE_NONE or dialect.quotechar is None)
+            and dialect.escapechar is None and not dialect.skipinitialspace)
+
+
+class SplitReader(object):
+    r"""CSV reader splitting records with ``str.split()`` for dialects without quoting.
+
+    Args:
+        stream: Iterable of text (:class:`py3:str`) lines.
+        dialect: Dialect argument for :func:`py:csv.reader` (without ``quotechar``
+            or with ``quoting=QUOTE_NONE``, and without ``escapechar``).
+        \**fmtparams: Keyword arguments (formatting parameters) for the dialect.
+
+    Notes:
+        - Used by :func:`csv23.reader` for such dialects, e.g. ``dialect='ascii'``.
+        - With a ``lineterminator`` other than ``'\r\n'``, ``'\n'``, or ``'\r'``
+          (e.g. ``'\x1e'``), records are split at it instead of at line breaks
+          (which can then occur inside values) and ``line_num`` counts records.
+        - :func:`py:csv.field_size_limit` is not enforced.
+    """
+
+    def __init__(self, stream, dialect=DIALECT, **fmtparams):
+        self.dialect = csv.reader((), dialect, **fmtparams).dialect
+        if not is_quote_free(self.dialect):
+            raise ValueError('dialect needs quoting: %r' % dialect)
+        self.line_num = 0
+        if self.dialect.lineterminator in NEWLINES:
+            self._rows = self._iterlines(stream, self.dialect.delimiter)
+        else:
+            self._rows = self._iterrecords(stream, self.dialect.delimiter,
+                                           self.dialect.lineterminator)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._rows)
+
+    def _iterlines(self, stream, delimiter):
+        for line in stream:
+            self.line_num += 1
+            line = line.rstrip('\r\n')
+            yield line.split(delimiter) if line else []
+
+    def _iterrecords(self, stream, delimiter, terminator):
+        pending = ''
+        for line in stream:
+            records = (pending + line).split(terminator)
+            pending = records.pop()
+            for r in records:
+                self.line_num += 1
+                yield r.split(delimiter) if r else []
+        if pending:
+            self.line_num += 1
+            yield pending.split(delimiter)
+
+
+def check_intern(intern=None, categories=None, max_distinct=MAX_DISTINCT):
+    """Raise ValueError for invalid intern, categories, and max_distinct arguments."""
+    if intern is None:
+        if categories is not None:
+            raise ValueError('categories requires intern columns')
+        return
+    if isinstance(intern, (str, bytes)) and intern != 'auto':
+        raise ValueError("intern must be 'auto' or a sequence of columns: %r" % intern)
+    if not (isinstance(max_distinct, int) and max_distinct > 0):
+        raise ValueError('max_distinct must be a positive int: %r' % max_distinct)
+
+
+class _Interned(dict):
+    """Table of a column returning the first value equal to key (up to max_distinct)."""
+
+    __slots__ = ('max_distinct',)
+
+    def __init__(self, max_distinct):
+        self.max_distinct = max_distinct
+
+    def __missing__(self, key):
+        if len(self) < self.max_distinct:
+            self[key] = key
+        return key
+
+
+class _Coded(dict):
+    """Table of a column returning the integer code of key, appending new ones to values."""
+
+    __slots__ = ('column', 'values', 'max_distinct')
+
+    def __init__(self, column, values, max_distinct):
+        self.column = column
+        self.values = values
+        self.max_distinct = max_distinct
+
+    def __missing__(self, key):
+        if len(self.values) >= self.max_distinct:
+            raise ValueError('column %r has more than %d distinct values'
+                             % (self.column, self.max_distinct))
+        code = self[key] = len(self.values)
+        self.values.append(key)
+        return code
+
+
+class InterningReader(object):
+    r"""Proxy for a CSV reader sharing one string object for repeated values of columns.
+
+    Args:
+        reader: CSV reader yielding lists of :class:`py3:str` (first row: header).
+        columns: ``'auto'`` for all columns of the header, or sequence of column
+            names (from the header) or indexes.
+        categories (dict): Return integer codes for the ``columns`` instead of strings,
+            setting ``categories[column]`` to the list of the distinct values
+            of the column (indexed by code).
+        max_distinct (int): Maximal number of distinct values kept per column.
+        header: Column names (e.g. ``fieldnames``) if the first row is not a header.
+
+    Raises:
+        ValueError: If a column name is not in the header.
+            With ``categories``: if a column has more than ``max_distinct`` values.
+
+    Notes:
+        - The header row is returned unchanged.
+        - Values of columns with more than ``max_distinct`` distinct values
+          (e.g. identifiers) are passed through once the table of the column is full.
+        - Rows with fewer fields than the header keep their values (e.g. for quarantining).
+
+    >>> import io
+    >>> codes = {}
+    >>> text = u'country,city\r\nDE,Berlin\r\nFR,Paris\r\nDE,Leipzig\r\n'
+    >>> with io.StringIO(text, newline='') as f:
+    ...     list(reader(f, intern=['country'], categories=codes))
+    [['country', 'city'], [0, 'Berlin'], [1, 'Paris'], [0, 'Leipzig']]
+    >>> codes
+    {'country': ['DE', 'FR']}
+    """
+
+    def __init__(self, reader, columns='auto', categories=None,
+                 max_distinct=MAX_DISTINCT, header=None):
+        check_intern(columns, categories, max_distinct)
+        self._reader = reader
+        self._columns = columns
+        self._categories = categories
+        self._max_distinct = max_distinct
+        self._tables = None
+        self._width = None
+        if header is not None:
+            self._init_tables(list(header))
+
+    def __getattr__(self, name):
+        return getattr(self._reader, name)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        row = next(self._reader)
+        tables = self._tables
+        if tables is None:
+            self._init_tables(row)
+        elif len(row) >= self._width:
+            for i, table in tables:
+                row[i] = table[row[i]]
+        else:
+            n = len(row)
+            for i, table in tables:
+                if i < n:
+                    row[i] = table[row[i]]
+        return row
+
+    def _init_tables(self, header):
+        if self._columns == 'auto':
+            columns = [(h, i) for i, h in enumerate(header)]
+        else:
+            columns = [(c, c if isinstance(c, int) else self._index(header, c))
+                       for c in self._columns]
+        if self._categories is None:
+            self._tables = [(i, _Interned(self._max_distinct)) for _, i in columns]
+        else:
+            self._tables = []
+            for c, i in columns:
+                values = self._categories[c] = []
+                self._tables.append((i, _Coded(c, values, self._max_distinct)))
+        self._width = max([i + 1 for i, _ in self._tables], default=0)
+
+    @staticmethod
+    def _index(header, column):
+        try:
+            return header.index(column)
+        except ValueError:
+            raise ValueError('intern column %r not in header: %r' % (column, header))
@@ -0,0 +1,204 @@
+"""Inferring column types from a sample of rows."""
+
+import collections
+import contextlib
+import csv
+import datetime
+import io
+import itertools
+import os
+import re
+
+from ._common import ENCODING, DIALECT, is_8bit_clean
+from . import _records
+from .shortcuts import read_csv
+
+__all__ = ['infer_schema', 'Column']
+
+SAMPLE_ROWS = 10000
+
+SAMPLE_RANGES = 16
+
+SAMPLE_BLOCK_SIZE = 2 ** 16
+
+SAMPLE_RESYNC = 8
+
+STRATEGIES = ('head', 'stride')
+
+TYPES = (bool, int, float, datetime.date, str)
+
+_PATTERNS = {bool: re.compile(r'(?i)true|false'),
+             int: re.compile(r'[+-]?\d+'),
+             float: re.compile(r'(?i)[+-]?(?:\d+\.?\d*|\.\d+)(?:e[+-]?\d+)?|[+-]?(?:inf|nan)'),
+             datetime.date: re.compile(r'\d{4}-\d{2}-\d{2}')}
+
+_NEWLINE = re.compile(rb'\r\n|\r|\n')
+
+
+class Column(collections.namedtuple('Column', ['name', 'type', 'nullable', 'width'])):
+    """Inferred column: ``name``, ``type`` (one of :class:`py:bool`, :class:`py:int`,
+    :class:`py:float`, :class:`py:datetime.date`, :class:`py:str`), ``nullable``
+    (empty values seen), and ``width`` (maximal number of characters seen)."""
+
+    __slots__ = ()
+
+    def parse(self, value):
+        """Return the CSV string ``value`` converted to ``type`` (``None`` if empty)."""
+        if not value:
+            return None if self.nullable or self.type is not str else value
+        if self.type is bool:
+            return value.lower() == 'true'
+        if self.type is datetime.date:
+            return datetime.date.fromisoformat(value)
+        return self.type(value)
+
+
+def infer_schema(file, sample_rows=SAMPLE_ROWS, sample_strategy='head',
+                 dialect=DIALECT, encoding=ENCODING, autocompress=False):
+    r"""Return the column names, types, nullability, and widths from a sample of rows.
+
+    Args:
+        file: Source as readable file-like object or filename/:class:`py:os.PathLike`
+            (the first row is the header).
+        sample_rows (int): Maximal number of rows to sample (after the header).
+        sample_strategy (str): ``'head'`` for the first ``sample_rows`` rows,
+            ``'stride'`` for rows from byte ranges spread over the whole file.
+        dialect: CSV dialect argument for the :func:`csv23.reader`.
+        encoding (str): Name of the encoding used to decode the file content.
+        autocompress(bool): Decompress if ``file`` is a path that ends in
+            ``'.bz2'``, ``'.gz'``, or ``'.xz'``.
+
+    Returns:
+        A :class:`py:list` of :class:`csv23.schema.Column` (one for each header column).
+
+    >>> infer_schema(io.BytesIO(b'id,price,day,ok,name\r\n1,1.5,2026-10-19,true,spam\r\n'
+    ...                         b'2,,2026-10-20,false,\r\n'), encoding='ascii')  # doctest: +NORMALIZE_WHITESPACE
+    [Column(name='id', type=<class 'int'>, nullable=False, width=1),
+     Column(name='price', type=<class 'float'>, nullable=True, width=3),
+     Column(name='day', type=<class 'datetime.date'>, nullable=False, width=10),
+     Column(name='ok', type=<class 'bool'>, nullable=False, width=5),
+     Column(name='name', type=<class 'str'>, nullable=True, width=4)]
+
+    Raises:
+        ValueError: If ``sample_strategy`` is invalid or if the file has no header.
+
+    Notes:
+        - Columns with :class:`py:int` and :class:`py:float` values are :class:`py:float`,
+          columns with other mixes (or only empty values) :class:`py:str`.
+        - Dates are recognized in ISO format (``YYYY-MM-DD``), booleans as
+          ``true``/``false`` (case-insensitive).
+        - ``'stride'`` reads ``sample_rows`` rows from ``16`` byte ranges evenly spaced
+          over uncompressed files in 8-bit clean encodings (e.g. ``'utf-8'``),
+          starting each range at the first of the next 8 line starts after its offset
+          that is followed by rows with as many fields as the header (i.e. not inside
+          a quoted field, ranges without one are skipped). Other files are sampled
+          with ``'head'``.
+        - Each distinct value of a column is only checked once.
+    """
+    if sample_strategy not in STRATEGIES:
+        raise ValueError('sample_strategy must be one of %r: %r' % (STRATEGIES, sample_strategy))
+
+    rows = read_csv(file, dialect=dialect, encoding=encoding, autocompress=autocompress)
+    strided = (sample_strategy == 'stride' and isinstance(file, (str, os.PathLike))
+               and is_8bit_clean(encoding)
+               and not (autocompress and str(file).lower().endswith(('.bz2', '.gz', '.xz'))))
+    with contextlib.closing(rows):
+        header = next(rows, None)
+        if header is None:
+            raise ValueError('missing header row for infer_schema()')
+        if strided:
+            rows.close()
+            rows = _stride_rows(file, sample_rows, dialect, encoding, len(header))
+        sample = list(itertools.islice(rows, sample_rows))
+
+    columns = itertools.zip_longest(*sample, fillvalue='') if sample else [()] * len(header)
+    return [_infer_column(name, values) for name, values in zip(header, columns)]
+
+
+def _infer_column(name, values):
+    values = set(values)
+    nullable = '' in values
+    values.discard('')
+    width = max(map(len, values), default=0)
+    candidates = list(TYPES[:-1])
+    for v in values:
+        candidates = [t for t in candidates if _PATTERNS[t].fullmatch(v)]
+        if not candidates:
+            break
+    if values and candidates:
+        type_ = candidates[0]
+        if type_ is datetime.date and not _valid_dates(values):
+            type_ = str
+    else:
+        type_ = str
+    return Column(name, type_, nullable, width)
+
+
+def _valid_dates(values):
+    try:
+        for v in values:
+            datetime.date.fromisoformat(v)
+    except ValueError:
+        return False
+    return True
+
+
+def _stride_rows(filename, sample_rows, dialect, encoding, n_fields):
+    """Yield up to sample_rows rows from SAMPLE_RANGES byte ranges of filename."""
+    dialect = _records.get_dialect(dialect, {})
+    per_range = -(-sample_rows // SAMPLE_RANGES)
+    with io.open(filename, 'rb') as f:
+        size = f.seek(0, io.SEEK_END)
+        end = 0  # of the rows from the previous range (a line start)
+        for i in range(SAMPLE_RANGES):
+            offset = size * i // SAMPLE_RANGES
+            pos, line_start = max(offset, end), offset <= end
+            for _ in range(SAMPLE_RESYNC):
+                rows, pos = _range_rows(f, pos, line_start, per_range + (not i),
+                                        dialect, encoding, n_fields)
+                if rows is not None:
+                    break
+                line_start = False  # retry from the next line start
+            else:
+                continue
+            if rows:
+                end = pos
+            yield from rows if i else rows[1:]  # skip the header
+
+
+def _range_rows(f, pos, line_start, n, dialect, encoding, n_fields):
+    """Return up to n rows starting at the first line start from pos, and their end.
+
+    Return None and the line start if the rows there do not have n_fields.
+    """
+    block_size = SAMPLE_BLOCK_SIZE
+    while True:
+        f.seek(pos)
+        data = f.read(block_size)
+        final = len(data) < block_size
+        start = pos
+        if not line_start:
+            m = _NEWLINE.search(data)
+            if m is None or (m.end() == len(data) and not final):
+                if final:
+                    return [], pos + len(data)
+                block_size *= 2
+                continue
+            data, start = data[m.end():], pos + m.end()
+        if not final:  # cut the incomplete last line
+            data = data[:max(data.rfind(b'\n'), data.rfind(b'\r')) + 1]
+        lines = _records.LINES.findall(data.decode(encoding))
+        reader, rows = csv.reader(lines, dialect), []
+        try:
+            for row in reader:
+                if row:
+                    if len(row) != n_fields:  # e.g. started inside a quoted field
+                        return None, start
+                    rows.append(row)
+                    if len(rows) == n:
+                        break
+        except csv.Error:
+            return None, start
+        if len(rows) == n or final:
+            return rows, start + len(''.join(lines[:reader.line_num]).encode(encoding))
+        block_size *= 2
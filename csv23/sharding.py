@@ -0,0 +1,366 @@
+"""Writers spreading rows over multiple CSV files."""
+
+import collections
+import hashlib
+import io
+import itertools
+import operator
+import pathlib
+import urllib.parse
+
+from ._common import ENCODING, DIALECT, BUFFER_SIZE
+from . import _streams
+from .shortcuts import _get_open_module, _compress_module
+from .writers import writer as csv23_writer
+
+__all__ = ['RollingWriter', 'PartitionedWriter']
+
+Shard = collections.namedtuple('Shard', ['path', 'rows', 'size', 'hash'])
+
+
+class RollingWriter(object):
+    r"""CSV writer starting a new numbered file (shard) whenever a limit is reached.
+
+    Args:
+        pattern (str): :meth:`py:str.format` pattern for the shard paths,
+            formatted with the shard number (starting with 0).
+        max_rows (int): Maximal number of rows per shard (excluding the header).
+        max_bytes (int): Number of bytes after which a shard is finished.
+        header: Iterable of first row values repeated in every shard
+            or ``None`` for no header.
+        dialect: Dialect argument for the :func:`csv23.writer`.
+        encoding (str): Name of the encoding used to encode the file content.
+        autocompress(bool): Compress if ``pattern`` ends in ``'.bz2'``, ``'.gz'``, or ``'.xz'``.
+        hash_name (str): Name of a :func:`py:hashlib.new` algorithm for
+            the hash of each shard file (``None`` for no hashes).
+        buffer_size (int): Size in bytes of the file buffer and of the chunks
+            encoded at once (``None`` for the :mod:`py:io` defaults).
+        \**fmtparams: Keyword arguments (formatting parameters) for the :func:`csv23.writer`.
+
+    Attributes:
+        manifest (list): One :class:`csv23.sharding.Shard` ``(path, rows, size, hash)``
+            for each finished shard (``path`` as :class:`py:pathlib.Path`, ``size`` in
+            bytes, and ``hash`` as :meth:`py:hashlib.hash.hexdigest` or ``None``).
+
+    Raises:
+        ValueError: If neither ``max_rows`` nor ``max_bytes`` is given,
+            or if one of them is not a positive int.
+
+    >>> with RollingWriter('spam-{:03d}.csv.gz', max_rows=1000, header=['spam', 'eggs'],
+    ...                    autocompress=True, hash_name='sha256') as writer:  # doctest: +SKIP
+    ...     writer.writerows(rows)
+    >>> writer.manifest[0]  # doctest: +SKIP
+    Shard(path=PosixPath('spam-000.csv.gz'), rows=1000, size=2453, hash='9f86d081...')
+
+    Notes:
+        - Shards are opened like with :func:`csv23.write_csv` (not :func:`csv23.open_writer`,
+          which cannot compress, append, or count the bytes written to the file).
+        - A new shard is started lazily with the next row, i.e. there are no empty shards
+          (except for a single shard with only the header if no rows are written).
+        - ``max_bytes`` is checked against the bytes written to the file after each row.
+          Compressed shards may end up larger by the size of the compressor's buffer.
+    """
+
+    def __init__(self, pattern, max_rows=None, max_bytes=None, header=None,
+                 dialect=DIALECT, encoding=ENCODING, autocompress=False,
+                 hash_name=None, buffer_size=BUFFER_SIZE, **fmtparams):
+        if max_rows is None and max_bytes is None:
+            raise ValueError('RollingWriter requires max_rows or max_bytes')
+        for name, value in [('max_rows', max_rows), ('max_bytes', max_bytes)]:
+            if value is not None and (isinstance(value, bool)
+                                      or not isinstance(value, int) or value < 1):
+                raise ValueError('%s must be None or a positive int: %r' % (name, value))
+        self._pattern = pattern
+        self._max_rows = max_rows
+        self._max_bytes = max_bytes
+        self._header = list(header) if header is not None else None
+        self._hash_name = hash_name
+        self._open_kwargs = dict(fmtparams, dialect=dialect, encoding=encoding,
+                                 autocompress=autocompress, buffer_size=buffer_size)
+        self._shard = None
+        self.manifest = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _open_shard(self):
+        path = pathlib.Path(self._pattern.format(len(self.manifest)))
+        hash = hashlib.new(self._hash_name) if self._hash_name is not None else None
+        self._shard = _ShardFile(path, hash=hash, **self._open_kwargs)
+        if self._header is not None:
+            self._shard.writer.writerow(self._header)
+
+    def _close_shard(self):
+        shard, self._shard = self._shard, None
+        self.manifest.append(shard.close())
+
+    def _full(self):
+        shard = self._shard
+        return ((self._max_rows is not None and shard.rows >= self._max_rows)
+                or (self._max_bytes is not None and shard.size >= self._max_bytes))
+
+    def writerow(self, row):
+        """Write the row (starting a new shard before it if the current one is full)."""
+        if self._shard is None:
+            self._open_shard()
+        self._shard.writer.writerow(row)
+        self._shard.rows += 1
+        if self._full():
+            self._close_shard()
+
+    def writerows(self, rows):
+        """Write all rows (starting new shards when needed)."""
+        if self._max_bytes is not None:
+            for row in rows:
+                self.writerow(row)
+            return
+
+        rows = iter(rows)
+        while True:
+            remaining = self._max_rows - (self._shard.rows if self._shard is not None else 0)
+            chunk = list(itertools.islice(rows, remaining))
+            if not chunk:
+                break
+            if self._shard is None:
+                self._open_shard()
+            self._shard.writer.writerows(chunk)
+            self._shard.rows += len(chunk)
+            if self._full():
+                self._close_shard()
+
+    def close(self):
+        """Finish the current shard and return the :attr:`manifest`."""
+        if self._shard is not None:
+            self._close_shard()
+        elif not self.manifest:  # header-only shard
+            self._open_shard()
+            self._close_shard()
+        return self.manifest
+
+
+class PartitionedWriter(object):
+    r"""CSV writer routing each row into one file per partition key (in its own subdirectory).
+
+    Args:
+        directory: Base directory for the partition subdirectories.
+        partition_by: Callable returning the partition key for a row,
+            or column index/name (``header`` required for names) of the key.
+        filename (str): Name of the file inside each partition subdirectory.
+        header: Iterable of first row values written to every partition file
+            or ``None`` for no header.
+        dialect: Dialect argument for the :func:`csv23.writer`.
+        encoding (str): Name of the encoding used to encode the file content.
+        autocompress(bool): Compress if ``filename`` ends in ``'.bz2'``, ``'.gz'``, or ``'.xz'``.
+        hash_name (str): Name of a :func:`py:hashlib.new` algorithm for
+            the hash of each partition file (``None`` for no hashes).
+        max_open (int): Maximal number of simultaneously open files
+            (least recently used ones are closed and later reopened for appending).
+        buffer_rows (int): Number of rows buffered per partition before writing them.
+        max_buffered (int): Number of rows buffered over all partitions
+            that triggers writing all buffers.
+        buffer_size (int): Size in bytes of the file buffer of each open partition file
+            and of the chunks encoded at once (default ``None`` for the :mod:`py:io` defaults,
+            which keeps the memory for ``max_open`` files small).
+        \**fmtparams: Keyword arguments (formatting parameters) for the :func:`csv23.writer`.
+
+    Attributes:
+        manifest (dict): Partition key to :class:`csv23.sharding.Shard`
+            ``(path, rows, size, hash)`` (complete after :meth:`close`).
+
+    Raises:
+        ValueError: If ``partition_by`` is a column name that is not in ``header``.
+
+    >>> with PartitionedWriter('out', partition_by='date', filename='part.csv.gz',
+    ...                        header=['date', 'spam'], autocompress=True) as writer:  # doctest: +SKIP
+    ...     writer.writerows(rows)
+    >>> writer.manifest['2026-10-17'].path  # doctest: +SKIP
+    PosixPath('out/date=2026-10-17/part.csv.gz')
+
+    Notes:
+        - With a column name (or with an index and ``header``), the subdirectories are
+          named ``'{column}={key}'``, otherwise after the key. Keys are percent-encoded
+          (:func:`py:urllib.parse.quote`) to be safe as directory names.
+        - Partition files are opened like with :func:`csv23.write_csv` (not
+          :func:`csv23.open_writer`, which cannot compress, append, or count the bytes
+          written to the file).
+        - Existing partition files are overwritten when first written to.
+        - Reopened compressed files are continued with an additional stream (member),
+          which the decompressors read transparently.
+    """
+
+    def __init__(self, directory, partition_by, filename='part.csv', header=None,
+                 dialect=DIALECT, encoding=ENCODING, autocompress=False,
+                 hash_name=None, max_open=64, buffer_rows=1000, max_buffered=100000,
+                 buffer_size=None, **fmtparams):
+        self._header = list(header) if header is not None else None
+        if callable(partition_by):
+            self._get_key = partition_by
+            self._template = '{}'
+        else:
+            index = partition_by
+            if isinstance(partition_by, str):
+                if self._header is None or partition_by not in self._header:
+                    raise ValueError('partition_by column %r not in header: %r'
+                                     % (partition_by, self._header))
+                index = self._header.index(partition_by)
+            self._get_key = operator.itemgetter(index)
+            self._template = ('%s={}' % _quote(self._header[index])
+                              if self._header is not None else '{}')
+        self._directory = pathlib.Path(directory)
+        self._filename = filename
+        self._hash_name = hash_name
+        self._max_open = max_open
+        self._buffer_rows = buffer_rows
+        self._max_buffered = max_buffered
+        self._open_kwargs = dict(fmtparams, dialect=dialect, encoding=encoding,
+                                 autocompress=autocompress, buffer_size=buffer_size)
+        self._buffers = {}
+        self._buffered = 0
+        self._handles = collections.OrderedDict()
+        self._partitions = {}
+        self.manifest = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def writerow(self, row):
+        """Buffer the row for its partition (writing the buffer if it is full)."""
+        key = self._get_key(row)
+        try:
+            buf = self._buffers[key]
+        except KeyError:
+            buf = self._buffers[key] = []
+        buf.append(row)
+        self._buffered += 1
+        if len(buf) >= self._buffer_rows:
+            self._flush(key)
+        elif self._buffered >= self._max_buffered:
+            self.flush()
+
+    def writerows(self, rows):
+        """Buffer all rows for their partitions (writing full buffers)."""
+        writerow = self.writerow
+        for row in rows:
+            writerow(row)
+
+    def flush(self):
+        """Write the buffered rows of all partitions."""
+        for key in list(self._buffers):
+            self._flush(key)
+
+    def _flush(self, key):
+        rows = self._buffers.pop(key)
+        self._buffered -= len(rows)
+        handle = self._get_handle(key)
+        handle.writer.writerows(rows)
+        handle.rows += len(rows)
+
+    def _get_handle(self, key):
+        handle = self._handles.get(key)
+        if handle is not None:
+            self._handles.move_to_end(key)
+            return handle
+
+        if len(self._handles) >= self._max_open:
+            old_key, old_handle = self._handles.popitem(last=False)
+            self._close_handle(old_key, old_handle)
+
+        partition = self._partitions.get(key)
+        if partition is None:
+            path = self._directory / self._template.format(_quote(key)) / self._filename
+            path.parent.mkdir(parents=True, exist_ok=True)
+            hash = hashlib.new(self._hash_name) if self._hash_name is not None else None
+            partition = self._partitions[key] = Shard(path, 0, 0, hash)
+            handle = _ShardFile(path, hash=hash, **self._open_kwargs)
+            if self._header is not None:
+                handle.writer.writerow(self._header)
+        else:
+            handle = _ShardFile(partition.path, hash=partition.hash, append=True,
+                                **self._open_kwargs)
+        self._handles[key] = handle
+        return handle
+
+    def _close_handle(self, key, handle):
+        shard = handle.close()
+        partition = self._partitions[key]
+        self._partitions[key] = partition._replace(rows=partition.rows + shard.rows,
+                                                   size=partition.size + shard.size)
+
+    def close(self):
+        """Write all buffered rows, close all files, and return the :attr:`manifest`."""
+        self.flush()
+        while self._handles:
+            self._close_handle(*self._handles.popitem(last=False))
+        self.manifest = {key: p._replace(hash=p.hash.hexdigest() if p.hash is not None else None)
+                         for key, p in self._partitions.items()}
+        return self.manifest
+
+
+def _quote(value):
+    result = urllib.parse.quote(str(value), safe=' =-.,:;@+').replace('_', '%5F')
+    if result in ('.', '..'):
+        result = result.replace('.', '%2E')
+    return result or '_'
+
+
+class _ShardFile(object):
+    """CSV writer on a (compressed) file counting rows, bytes, and hashing the content."""
+
+    def __init__(self, path, dialect=DIALECT, encoding=ENCODING, autocompress=False,
+                 hash=None, append=False, buffer_size=BUFFER_SIZE, **fmtparams):
+        self.path = path
+        self.rows = 0
+        open_module = _compress_module(_get_open_module(str(path), autocompress=autocompress))
+        mode = 'a' if append else 'w'
+        binary = io.open(path, mode + 'b', buffering=_streams.buffering(buffer_size))
+        self._binary = _CountingFile(binary, hash=hash)
+        try:
+            # NOTE: appending to compressed files adds a new stream (member)
+            self._text = _streams.wrap_text(self._binary, mode, encoding,
+                                            open_module=open_module,
+                                            buffer_size=buffer_size, write_through=True)
+        except Exception:
+            self._binary.close()
+            raise
+        self.writer = csv23_writer(self._text, dialect, **fmtparams)
+
+    @property
+    def size(self):
+        return self._binary.size
+
+    def close(self):
+        try:
+            self._text.close()
+        finally:
+            self._binary.close()  # NOTE: not closed by the compressed file object
+        hash = self._binary.hash
+        return Shard(self.path, self.rows, self._binary.size,
+                     hash.hexdigest() if hash is not None else None)
+
+
+class _CountingFile(object):
+    """Proxy for a binary file counting and optionally hashing the written bytes."""
+
+    def __init__(self, file, hash=None):
+        self._file = file
+        self.hash = hash
+        self.size = 0
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+    def write(self, data):
+        n = self._file.write(data)
+        self.size += n
+        if self.hash is not None:
+            self.hash.update(data)
+        return n
+
+    def close(self):
+        self._file.close()
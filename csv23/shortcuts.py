@@ -1,17 +1,27 @@
 """Overloaded functions (Python 3 only)."""
 
+import contextlib
 import functools
 import io
 import itertools
+import os
+import re
 import warnings
 
-from ._common import PY2
+from ._common import PY2, BUFFER_SIZE, is_8bit_clean
 
-from . import (DIALECT, ENCODING,
+from . import (DIALECT, ENCODING, ROWTYPE,
                reader as csv23_reader,
                writer as csv23_writer)
+from . import _fields
+from . import _quarantine
+from . import _records
+from . import _streams
+from . import stats as _stats
+from .extras import DataclassWriter
+from .readers import MAX_DISTINCT, InterningReader, check_intern
 
-__all__ = ['read_csv', 'write_csv']
+__all__ = ['read_csv', 'write_csv', 'count_rows', 'tail']
 
 
 def iterslices(iterable, size):
@@ -20,30 +30,66 @@ def iterslices(iterable, size):
     return iter(lambda: list(next_slice()), [])
 
 
-def iterrows(f, dialect=DIALECT):
-    with f as _f:
-        reader = csv23_reader(_f, dialect=dialect, encoding=False)
+def iterrows(f, dialect=DIALECT, stats=None, prefilter=None, encoding=None,
+             quarantine=None, max_field_size=None, large_fields='spill', source=None,
+             intern=None, categories=None, max_distinct=MAX_DISTINCT):
+    with contextlib.ExitStack() as stack:
+        _f = stack.enter_context(f)
+        if prefilter is not None:
+            _f = _records.prefiltered(_f, _records.get_dialect(dialect, {}),
+                                      prefilter, encoding)
+        if quarantine is not None:
+            sink = stack.enter_context(_quarantine.open_sink(quarantine, encoding))
+            pending = []
+            reader = csv23_reader(_quarantine.tracked_lines(_f, pending),
+                                  dialect=dialect, encoding=False)
+            reader = _quarantine.QuarantineReader(reader, _f, pending, sink,
+                                                  getattr(_f, 'encoding', None))
+        elif max_field_size is not None:
+            reader = _fields.LargeFieldReader(_f, dialect, max_field_size, large_fields,
+                                              encoding, source=source)
+        else:
+            reader = csv23_reader(_f, dialect=dialect, encoding=False)
+        if intern is not None:
+            reader = InterningReader(reader, intern, categories, max_distinct)
+        if stats is not None:
+            reader = _stats.StatsReader(reader, stats)
         for row in reader:
             yield row
 
 
 if PY2:
     def read_csv(file, dialect=DIALECT, encoding=ENCODING, as_list=False,
-                 autocompress=False):
+                 autocompress=False, stats=None, prefilter=None, prefetch=None,
+                 buffer_size=BUFFER_SIZE, chunksize=None, on_error='raise',
+                 quarantine=None, max_field_size=None, large_fields='spill',
+                 intern=None, categories=None, max_distinct=MAX_DISTINCT):
         """Iterator yielding rows from a file-like object with CSV data."""
         raise NotImplementedError('Python 3 only')
 
 
     def write_csv(file, rows, header=None, dialect=DIALECT, encoding=ENCODING,
-                  autocompress=False):
+                  autocompress=False, stats=None, atomic=False, fsync=None,
+                  buffer_size=BUFFER_SIZE, fast=False, rowtype=ROWTYPE):
         """Write rows into a file-like object using CSV format."""
         raise NotImplementedError('Python 3 only')
 
+    def count_rows(file, dialect=DIALECT, encoding=ENCODING, autocompress=False):
+        """Return the number of rows in a file-like object with CSV data."""
+        raise NotImplementedError('Python 3 only')
+
+    def tail(file, n=10, dialect=DIALECT, encoding=ENCODING, autocompress=False):
+        """Return the header row and the last n rows of a CSV file."""
+        raise NotImplementedError('Python 3 only')
+
 
 else:
+    import collections
+    import csv
     import operator
     import pathlib
     import platform
+    import tempfile
     from contextlib import nullcontext
 
     # workaround https://foss.heptapod.net/pypy/pypy/issues/3217
@@ -72,9 +118,23 @@ else:
                 warnings.warn(msg)
         return result
 
+    def _compress_module(open_module):
+        return None if open_module is builtins else open_module
+
+    @contextlib.contextmanager
+    def _detaching(f):
+        """Context manager detaching the text stream f from its buffer on exit."""
+        try:
+            yield f
+        finally:
+            f.detach()
+
 
     def read_csv(file, dialect=DIALECT, encoding=ENCODING, as_list=False,
-                 autocompress=False):
+                 autocompress=False, stats=None, prefilter=None, prefetch=None,
+                 buffer_size=BUFFER_SIZE, chunksize=None, on_error='raise',
+                 quarantine=None, max_field_size=None, large_fields='spill',
+                 intern=None, categories=None, max_distinct=MAX_DISTINCT):
         r"""Iterator yielding rows from a file-like object with CSV data.
 
         Args:
@@ -84,17 +144,70 @@ else:
             as_list (bool): Return a :class:`py:list` of rows instead of an iterator.
             autocompress(bool): Decompress if ``file`` is a path that ends in
                 ``'.bz2'``, ``'.gz'``, or ``'.xz'``.
+            stats: :class:`csv23.Stats` instance to count rows and bytes
+                and time the stages while reading.
+            prefilter: :class:`py:str`, :class:`py:bytes`, or compiled :func:`py:re.compile`
+                pattern: skip records not containing/matching it before parsing
+                (the first row is always kept, see :func:`csv23.open_reader`).
+            prefetch (int): Number of blocks to read (and decompress) ahead
+                in a background thread (if ``file`` is binary or a filesystem path).
+            buffer_size (int): Size in bytes of the file buffer and of the chunks
+                decompressed and decoded at once (``None`` for the :mod:`py:io` defaults).
+            chunksize (int): Yield lists of (up to) ``chunksize`` rows instead of single rows.
+            on_error (str): ``'raise'`` or ``'quarantine'`` to skip malformed records
+                passing them to ``quarantine`` (see :func:`csv23.open_reader`).
+            quarantine: Callable taking a :class:`csv23.openers.BadRecord` for each
+                malformed record, or filename/:class:`py:os.PathLike` to write them into.
+            max_field_size (int): Return fields longer than this number of characters
+                as :class:`csv23.openers.LargeField` (see :func:`csv23.open_reader`).
+            large_fields (str): ``'spill'`` to copy them into temporary files,
+                ``'slice'`` to reference their raw bytes in ``file`` (a path) if possible.
+            intern: ``'auto'`` or sequence of column names (from the first row) or indexes:
+                share one string object for repeated values of these columns.
+            categories (dict): Yield integer codes for the ``intern`` columns instead,
+                filling ``categories`` with a list of their distinct values for each column.
+            max_distinct (int): Maximal number of distinct values kept per ``intern`` column.
 
         Returns:
-            An iterator yielding a :class:`py:list` of row values for each row.
+            An iterator yielding a :class:`py:list` of row values for each row
+            (or a :class:`py:list` of up to ``chunksize`` rows for each chunk).
 
         >>> read_csv(io.BytesIO(b'spam,eggs\r\n'), encoding='ascii', as_list=True)
         [['spam', 'eggs']]
 
+        >>> list(read_csv(io.BytesIO(b'spam\r\neggs\r\nham\r\n'), encoding='ascii', chunksize=2))
+        [[['spam'], ['eggs']], [['ham']]]
+
+        >>> bad = []
+        >>> read_csv(io.BytesIO(b'a,b\r\n1,2\r\n3\r\n4,5\r\n'), encoding='ascii', as_list=True,
+        ...          on_error='quarantine', quarantine=bad.append)
+        [['a', 'b'], ['1', '2'], ['4', '5']]
+        >>> bad
+        [BadRecord(offset=10, line_num=3, error='expected 2 fields, saw 1', text='3\r\n')]
+
+        >>> codes = {}
+        >>> read_csv(io.BytesIO(b'id,status\r\n1,ok\r\n2,fail\r\n3,ok\r\n'), encoding='ascii',
+        ...          as_list=True, intern=['status'], categories=codes)
+        [['id', 'status'], ['1', 0], ['2', 1], ['3', 0]]
+        >>> codes
+        {'status': ['ok', 'fail']}
+
         Raises:
             TypeError: If ``file`` is a binary buffer or filename/path
                 and ``encoding`` is ``None``. Also if ``file`` is a text buffer
                 and ``encoding`` is not ``None``.
+            ValueError: If ``chunksize`` is not a positive :class:`py:int`,
+                if ``on_error`` is invalid or does not match ``quarantine``,
+                or if ``on_error='quarantine'`` is combined with ``prefilter``.
+                Also if ``prefilter`` is used with a ``dialect`` without
+                ``quotechar`` and ``escapechar`` that has a non-newline ``lineterminator``.
+                Also if ``max_field_size`` or ``large_fields`` is invalid,
+                if ``max_field_size`` is combined with ``prefilter`` or ``on_error='quarantine'``,
+                or if ``large_fields='slice'`` is used with ``prefetch``,
+                ``autocompress``-ed paths, or file-like objects.
+                Also if ``intern``, ``categories``, or ``max_distinct`` is invalid,
+                if ``intern`` is combined with ``max_field_size``, or (when reading)
+                if a ``categories`` column has more than ``max_distinct`` values.
 
         Warns:
             UserWarning: If file is a path that ends in
@@ -103,34 +216,108 @@ else:
         Notes:
             - ``encoding`` is required if ``file`` is binary or a filesystem path.
             - if ``file`` is a text stream, ``encoding`` needs to be ``None``.
+            - ``prefetch`` overlaps reading and decompression (which release the GIL)
+              with parsing. It is ignored if ``file`` is a text stream.
+            - The large default ``buffer_size`` reduces the number of system calls
+              and decoder invocations per row (at the cost of 1 MiB per buffer).
+            - With ``chunksize``, at most one chunk of rows is held in memory
+              (e.g. for batched database inserts).
+            - With ``on_error='quarantine'``, binary and path sources are decoded
+              with ``errors='surrogateescape'`` to detect undecodable records.
+              The ``offset`` of a :class:`csv23.openers.BadRecord` is ``None``
+              with ``prefetch`` or for text streams without ``encoding`` attribute.
+            - With ``max_field_size``, memory use per row is bounded by it (plus 64 KiB):
+              longer fields are spilled to temporary files or sliced from ``file``.
+            - With ``intern``, each value of these columns is looked up in a table
+              of the column (at most ``max_distinct`` values, further ones are
+              passed through): repeated values share one string object
+              (or are replaced by their code with ``categories``). The first row
+              (header) is returned unchanged. ``categories`` is filled while reading.
         """
+        if chunksize is not None and not (isinstance(chunksize, int) and chunksize > 0):
+            raise ValueError('chunksize must be None or a positive int: %r' % chunksize)
+        _streams.check_buffer_size(buffer_size)
+        _quarantine.check_on_error(on_error, quarantine)
+        if quarantine is not None and prefilter is not None:
+            raise ValueError("on_error='quarantine' is not supported with prefilter")
+        if prefilter is not None:
+            _records.check_lineterminator(_records.get_dialect(dialect, {}), 'prefilter')
+        check_intern(intern, categories, max_distinct)
+        if intern is not None and max_field_size is not None:
+            raise ValueError('intern is not supported with max_field_size')
+        source = None
+        if max_field_size is not None:
+            _fields.check_large_fields(max_field_size, large_fields, encoding)
+            if prefilter is not None or quarantine is not None:
+                raise ValueError('max_field_size is not supported with prefilter'
+                                 " or on_error='quarantine'")
+            if large_fields == 'slice':
+                if (hasattr(file, 'read') or prefetch is not None
+                        or _get_open_module(str(file), autocompress) is not builtins):
+                    raise ValueError("large_fields='slice' requires an uncompressed"
+                                     ' filename/path without prefetch')
+                source = file
+
         open_kwargs = {'encoding': encoding, 'newline': ''}
+        if quarantine is not None:
+            open_kwargs['errors'] = _quarantine.ERRORS
+        stats = _stats.get_stats(stats)
 
         if hasattr(file, 'read'):
             if isinstance(file, io.TextIOBase):
                 if encoding is not None:
                     raise TypeError('bytes-like object expected')
+                open_kwargs.pop('errors', None)
                 f = file
+                if stats is not None:
+                    f = _stats.TimedStream(f, stats, 'io')
+                f = nullcontext(f)
             else:
                 if encoding is None:
                     raise TypeError('need encoding for wrapping byte-stream')
-                f = io.TextIOWrapper(file, **open_kwargs)
-            f = nullcontext(f)
+                if stats is not None:
+                    f = _stats.wrap_timed(file, stats, 'r', prefetch=prefetch,
+                                          buffer_size=buffer_size, **open_kwargs)
+                else:
+                    f = _streams.wrap_text(file, 'r', prefetch=prefetch,
+                                           buffer_size=buffer_size, **open_kwargs)
+                # NOTE: with prefetch, closing f stops its thread but keeps file open
+                if prefetch is None:
+                    f = _detaching(f)
         else:
             if encoding is None:
                 raise TypeError('need encoding for opening file by path')
             filepath = str(file)
             open_module = _get_open_module(filepath, autocompress=autocompress)
-            f = open_module.open(filepath, 'rt', **open_kwargs)
-
-        rows = iterrows(f, dialect=dialect)
+            if stats is not None:
+                f = _stats.open_timed(filepath, stats, 'r',
+                                      open_module=_compress_module(open_module),
+                                      prefetch=prefetch, buffer_size=buffer_size,
+                                      **open_kwargs)
+            else:
+                f = _streams.open_text(filepath, 'r',
+                                       open_module=_compress_module(open_module),
+                                       prefetch=prefetch, buffer_size=buffer_size,
+                                       **open_kwargs)
+
+        if prefilter is not None:
+            _records.make_search(prefilter, encoding)  # fail early
+
+        rows = iterrows(f, dialect=dialect, stats=stats,
+                        prefilter=prefilter, encoding=encoding, quarantine=quarantine,
+                        max_field_size=max_field_size, large_fields=large_fields,
+                        source=source, intern=intern, categories=categories,
+                        max_distinct=max_distinct)
+        if chunksize is not None:
+            rows = iterslices(rows, chunksize)
         if as_list:
             rows = list(rows)
         return rows
 
 
     def write_csv(file, rows, header=None, dialect=DIALECT, encoding=ENCODING,
-                  autocompress=False):
+                  autocompress=False, stats=None, atomic=False, fsync=None,
+                  buffer_size=BUFFER_SIZE, fast=False, rowtype=ROWTYPE):
         r"""Write rows into a file-like object using CSV format.
 
         Args:
@@ -143,6 +330,20 @@ else:
             encoding (str): Name of the encoding used to encode the file content.
             autocompress(bool): Compress if ``file`` is a path that ends in
                 ``'.bz2'``, ``'.gz'``, or ``'.xz'``.
+            stats: :class:`csv23.Stats` instance to count rows and bytes
+                and time the stages while writing.
+            atomic (bool): If ``file`` is a filename/path, write to a temporary file
+                in the same directory and rename it over ``file`` when finished.
+            fsync: If ``file`` is a filename/path, ``'end'`` to :func:`py:os.fsync`
+                the file before closing (and renaming) it, or an :class:`py:int` N
+                to also do so after every N bytes written.
+            buffer_size (int): Size in bytes of the file buffer and of the chunks
+                encoded at once (``None`` for the :mod:`py:io` defaults).
+            fast (bool): Format blocks of rows that need no quoting with
+                :meth:`py:str.join` (see :class:`csv23.writers.QuoteFreeWriter`).
+            rowtype (str): ``'list'`` for sequences of values, ``'dataclass'`` for
+                dataclass (or ``attrs``) instances (see :class:`csv23.DataclassWriter`):
+                their field names are the ``header`` if it is ``None``.
 
         Returns:
             If ``file`` is a filename/path, return it as :class:`py:pathlib.Path`.
@@ -152,10 +353,18 @@ else:
         >>> write_csv(io.BytesIO(), iter([('spam', 'eggs')]), encoding='ascii').getvalue()
         b'spam,eggs\r\n'
 
+        >>> import dataclasses
+        >>> Point = dataclasses.make_dataclass('Point', ['x', 'y'], slots=True)
+        >>> write_csv(None, [Point(1, 2), Point(3, 4)], encoding=None, rowtype='dataclass')
+        'x,y\r\n1,2\r\n3,4\r\n'
+
         Raises:
             TypeError: If ``file`` is a binary buffer or filename/path
                 and ``encoding`` is ``None``. Also if ``file`` is a text buffer
                 and ``encoding`` is not ``None``.
+            ValueError: If ``fsync`` is neither ``None``, ``'end'``, nor a positive :class:`py:int`
+                (:class:`py:bool` is rejected).
+                Also if ``rowtype`` is neither ``'list'`` nor ``'dataclass'``.
 
         Warns:
             UserWarning: If file is a path that ends in
@@ -164,39 +373,78 @@ else:
         Notes:
             - ``encoding`` is required if ``file`` is binary or a filesystem path.
             - if ``file`` is a text stream, ``encoding`` needs to be ``None``.
+            - With ``atomic=True`` readers of ``file`` see either its previous content
+              or the complete new content. If writing fails, the temporary file is removed.
         """
+        if fsync not in (None, 'end') and (isinstance(fsync, bool)
+                                           or not isinstance(fsync, int) or fsync < 1):
+            raise ValueError("fsync must be None, 'end', or a positive int: %r" % fsync)
+        if rowtype not in ('list', 'dataclass'):
+            raise ValueError("rowtype must be 'list' or 'dataclass': %r" % rowtype)
+        _streams.check_buffer_size(buffer_size)
+
         open_kwargs = {'encoding': encoding, 'newline': ''}
         textio_kwargs = dict(write_through=True, **open_kwargs)
 
+        stats = _stats.get_stats(stats)
+
+        if stats is not None:
+            def textio(binary):
+                return _stats.wrap_timed(binary, stats, 'w', buffer_size=buffer_size,
+                                         **textio_kwargs)
+        else:
+            def textio(binary):
+                return _streams.wrap_text(binary, 'w', buffer_size=buffer_size,
+                                          **textio_kwargs)
+
         hashsum = None
 
         if file is None:
             if encoding is None:
                 f = io.StringIO()
             else:
-                f = io.TextIOWrapper(io.BytesIO(), **textio_kwargs)
+                f = textio(io.BytesIO())
         elif hasattr(file, 'write'):
             result = file
             if encoding is None:
                 f = file
+                if stats is not None:
+                    f = _stats.TimedStream(f, stats, 'io')
             else:
-                f = io.TextIOWrapper(file, **textio_kwargs)
+                f = textio(file)
             f = nullcontext(f)
         elif hasattr(file, 'hexdigest'):
             result = hashsum = file
             if encoding is None:
                 raise TypeError('need encoding for wrapping byte-stream')
-            f = io.TextIOWrapper(io.BytesIO(), **textio_kwargs)
+            f = textio(io.BytesIO())
         else:
             result = pathlib.Path(file)
             if encoding is None:
                 raise TypeError('need encoding for opening file by path')
             filepath = str(file)
             open_module = _get_open_module(filepath, autocompress=autocompress)
-            f = open_module.open(filepath, 'wt', **open_kwargs)
+            if atomic or fsync is not None:
+                f = _open_durable(filepath, open_module, stats, open_kwargs,
+                                  atomic=atomic, fsync=fsync, buffer_size=buffer_size)
+            elif stats is not None:
+                f = _stats.open_timed(filepath, stats, 'w',
+                                      open_module=_compress_module(open_module),
+                                      buffer_size=buffer_size, **open_kwargs)
+            else:
+                f = _streams.open_text(filepath, 'w',
+                                       open_module=_compress_module(open_module),
+                                       buffer_size=buffer_size, **open_kwargs)
 
         with f as f:
-            writer = csv23_writer(f, dialect=dialect, encoding=False)
+            if rowtype == 'dataclass':
+                writer = DataclassWriter(f, dialect=dialect, encoding=False, fast=fast,
+                                         header=True if header is None else header)
+                header = None
+            else:
+                writer = csv23_writer(f, dialect=dialect, encoding=False, fast=fast)
+            if stats is not None:
+                writer = _stats.StatsWriter(writer, stats)
 
             if header is not None:
                 writer.writerows([header])
@@ -221,3 +469,309 @@ else:
             f.detach()
 
         return result
+
+    @contextlib.contextmanager
+    def _open_durable(filepath, open_module, stats, open_kwargs, atomic=False, fsync=None,
+                      buffer_size=None):
+        buffering = _streams.buffering(buffer_size)
+        if atomic:
+            directory, name = os.path.split(os.path.abspath(filepath))
+            fd, tmp = tempfile.mkstemp(prefix='.%s.' % name, suffix='.tmp', dir=directory)
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp, 0o666 & ~umask)
+            binary = io.open(fd, 'wb', buffering=buffering)
+        else:
+            binary = io.open(filepath, 'wb', buffering=buffering)
+
+        try:
+            if fsync is not None:
+                binary = _SyncingFile(binary, every=None if fsync == 'end' else fsync)
+            compress = _compress_module(open_module)
+            if stats is not None:
+                f = _stats.wrap_timed(binary, stats, 'w', open_module=compress,
+                                      buffer_size=buffer_size, **open_kwargs)
+            else:
+                f = _streams.wrap_text(binary, 'w', open_module=compress,
+                                       buffer_size=buffer_size, **open_kwargs)
+            with f as f:
+                yield f
+            binary.close()  # NOTE: not closed by the compressed file object
+        except BaseException:
+            binary.close()
+            if atomic:
+                os.remove(tmp)
+            raise
+
+        if atomic:
+            os.replace(tmp, filepath)
+            if fsync is not None:
+                _fsync_directory(directory)
+
+    class _SyncingFile(object):
+        """Proxy for a binary file calling os.fsync() every N bytes and on close."""
+
+        def __init__(self, file, every=None):
+            self._file = file
+            self._every = every
+            self._pending = 0
+
+        def __getattr__(self, name):
+            return getattr(self._file, name)
+
+        def write(self, data):
+            n = self._file.write(data)
+            if self._every is not None:
+                self._pending += n
+                if self._pending >= self._every:
+                    self._sync()
+            return n
+
+        def _sync(self):
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._pending = 0
+
+        def close(self):
+            if not self._file.closed:
+                try:
+                    self._sync()
+                finally:
+                    self._file.close()
+
+    def _fsync_directory(directory):
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:  # pragma: no cover
+            return  # e.g. on Windows
+        try:
+            os.fsync(fd)
+        except OSError:  # pragma: no cover
+            pass
+        finally:
+            os.close(fd)
+
+    def count_rows(file, dialect=DIALECT, encoding=ENCODING, autocompress=False):
+        r"""Return the number of rows in a file-like object with CSV data (without parsing them).
+
+        Args:
+            file: Source as readable file-like object or filename/:class:`py:os.PathLike`.
+            dialect: CSV dialect argument for the :func:`csv23.reader`.
+            encoding (str): Name of the encoding used to decode the file content.
+            autocompress(bool): Decompress if ``file`` is a path that ends in
+                ``'.bz2'``, ``'.gz'``, or ``'.xz'``.
+
+        Returns:
+            int: The number of rows :func:`csv23.read_csv` would yield (including the header).
+
+        >>> count_rows(io.BytesIO(b'spam,eggs\r\n"spam\r\nspam",eggs\r\n'), encoding='ascii')
+        2
+
+        Raises:
+            TypeError: If ``file`` is a binary buffer or filename/path
+                and ``encoding`` is ``None``. Also if ``file`` is a text buffer
+                and ``encoding`` is not ``None``.
+            ValueError: If the ``dialect`` has neither ``quotechar`` nor ``escapechar``
+                and a ``lineterminator`` other than ``'\r\n'``, ``'\n'``, or ``'\r'``.
+
+        Warns:
+            UserWarning: If file is a path that ends in
+                ``'.bz2'``, ``'.gz'``, or ``'.xz'`` but ``autocompress=False`` is given.
+
+        Notes:
+            - Counts line terminators in large blocks, only blocks that contain
+              the ``quotechar`` or ``escapechar`` of the ``dialect``
+              are split into records respecting the quoting rules.
+            - For 8-bit clean encodings (e.g. the default ``'utf-8'``)
+              the blocks are scanned without decoding them.
+        """
+        dialect = _records.get_dialect(dialect, {})
+        _records.check_lineterminator(dialect, 'count_rows()')
+        scanner = _records.RecordScanner(dialect)
+
+        if hasattr(file, 'read'):
+            if isinstance(file, io.TextIOBase):
+                if encoding is not None:
+                    raise TypeError('bytes-like object expected')
+                f = nullcontext(file)
+            else:
+                if encoding is None:
+                    raise TypeError('need encoding for wrapping byte-stream')
+                f = nullcontext(file)
+        else:
+            if encoding is None:
+                raise TypeError('need encoding for opening file by path')
+            filepath = str(file)
+            open_module = _get_open_module(filepath, autocompress=autocompress)
+            f = open_module.open(filepath, 'rb')
+
+        with f as f:
+            if encoding is not None and not _scan_bytes(dialect, encoding):
+                f = _detaching(io.TextIOWrapper(f, encoding=encoding, newline=''))
+            else:
+                f = nullcontext(f)
+            with f as f:
+                result, rest = 0, None
+                for block, final in _records.iterblocks(f):
+                    if rest:
+                        block = rest + block
+                    n, consumed = scanner.count(block, final)
+                    result += n
+                    rest = block[consumed:]
+        return result
+
+    def _scan_bytes(dialect, encoding):
+        """Return True if dialect characters can be found in the undecoded bytes."""
+        chars = [dialect.delimiter, dialect.quotechar, dialect.escapechar]
+        return (is_8bit_clean(encoding)
+                and all(c is None or ord(c) < 128 for c in chars))
+
+    TAIL_BLOCK_SIZE = 2 ** 16
+
+    _BYTES_NEWLINE = re.compile(rb'\r\n|\r|\n')
+
+    def tail(file, n=10, dialect=DIALECT, encoding=ENCODING, autocompress=False):
+        r"""Return the header row and the last ``n`` rows of a CSV file (seeking from the end).
+
+        Args:
+            file: Source as seekable binary file-like object or filename/:class:`py:os.PathLike`.
+            n (int): Number of rows to return (at most, excluding the header).
+            dialect: CSV dialect argument for the :func:`csv23.reader`.
+            encoding (str): Name of the encoding used to decode the file content.
+            autocompress(bool): Decompress if ``file`` is a path that ends in
+                ``'.bz2'``, ``'.gz'``, or ``'.xz'``.
+
+        Returns:
+            A pair of the header row (``None`` for an empty file)
+            and a :class:`py:list` with the last ``n`` rows.
+
+        >>> tail(io.BytesIO(b'spam,eggs\r\n1,2\r\n3,"4\r\n5"\r\n'), n=1, encoding='ascii')
+        (['spam', 'eggs'], [['3', '4\r\n5']])
+
+        Raises:
+            TypeError: If ``encoding`` is ``None``.
+            ValueError: If ``n`` is negative. Also if the ``dialect`` has neither
+                ``quotechar`` nor ``escapechar`` and a ``lineterminator`` other than
+                ``'\r\n'``, ``'\n'``, or ``'\r'``.
+
+        Warns:
+            UserWarning: If file is a path that ends in
+                ``'.bz2'``, ``'.gz'``, or ``'.xz'`` but ``autocompress=False`` is given.
+
+        Notes:
+            - Reads blocks backwards from the end of the file until they contain ``n`` records.
+            - If the ``dialect`` has a ``quotechar`` or ``escapechar``, the blocks are
+              scanned from their first line start assuming each possible quoting state
+              there. Rows are taken after the first record end where all scans agree
+              (states continuing a field beyond the :func:`py:csv.field_size_limit`
+              are ruled out). Otherwise reading continues backwards (up to the header).
+            - Compressed files and encodings that are not 8-bit clean
+              (e.g. ``'utf-16'``) are read from the start.
+        """
+        if encoding is None:
+            raise TypeError('need encoding for reading bytes')
+        if n < 0:
+            raise ValueError('n must be non-negative: %r' % n)
+
+        dialect = _records.get_dialect(dialect, {})
+        _records.check_lineterminator(dialect, 'tail()')
+
+        if hasattr(file, 'read'):
+            f = nullcontext(file)
+            open_module = builtins
+        else:
+            filepath = str(file)
+            open_module = _get_open_module(filepath, autocompress=autocompress)
+            f = open_module.open(filepath, 'rb')
+
+        with f as f:
+            seekable = (open_module is builtins and f.seekable()
+                        and _scan_bytes(dialect, encoding))
+            if not seekable:
+                f = io.TextIOWrapper(f, encoding=encoding, newline='')
+                try:
+                    rows = csv23_reader(f, dialect=dialect, encoding=False)
+                    header = next(rows, None)
+                    rows = list(collections.deque(rows, maxlen=n)) if n else []
+                finally:
+                    f.detach()
+                return header, rows
+
+            return _seek_tail(f, n, dialect, encoding, TAIL_BLOCK_SIZE)
+
+    def _seek_tail(f, n, dialect, encoding, size):
+        scanner = _records.RecordScanner(dialect)
+
+        start = f.tell()
+        header_end, rest = start, b''
+        for block, final in _records.iterblocks(f, size):
+            block = rest + block
+            spans, _ = scanner.spans(block.decode('latin-1'), final)
+            if spans:
+                header_end += spans[0][1]
+                header = block[:spans[0][1]].decode(encoding)
+                break
+            rest = block
+        else:
+            return None, []
+
+        header, = csv.reader(_records.LINES.findall(header), dialect)
+        if not n:
+            return header, []
+
+        pos = f.seek(0, io.SEEK_END)
+        data = b''
+        while True:
+            step = min(size, pos - header_end)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+            size *= 2
+
+            if pos <= header_end:
+                lines = _records.LINES.findall(data.decode(encoding))
+                return header, list(collections.deque(csv.reader(lines, dialect), maxlen=n))
+
+            m = _BYTES_NEWLINE.search(data)
+            if m is None:
+                continue
+            region = data[m.end():]
+            if scanner.specials:
+                offset = _record_start(scanner, dialect, region.decode('latin-1'), encoding)
+                if offset is None:
+                    continue
+                region = region[offset:]
+            lines = _records.LINES.findall(region.decode(encoding))
+            rows = list(csv.reader(lines, dialect))
+            if len(rows) >= n:
+                return header, rows[-n:]
+
+    def _record_start(scanner, dialect, text, encoding):
+        """Return the first offset in text that is a record start from any line break state.
+
+        A line start can be a record start, inside a quoted field,
+        or inside an unquoted field (after an escaped line break).
+        The records found from each of these states converge after the
+        first record end that they share. States continuing a field that
+        would exceed the :func:`py:csv.field_size_limit` are ruled out.
+        """
+        limit = 2 * csv.field_size_limit()  # a raw char pair can be one value char
+        hypotheses = [('', {0})]
+        if dialect.quoting != csv.QUOTE_NONE:
+            hypotheses.append((dialect.quotechar, set()))
+        if dialect.escapechar:
+            hypotheses.append((next(c for c in 'x_' if c != dialect.delimiter), set()))
+
+        common = None
+        for p, ends in hypotheses:
+            if p:
+                field_end = scanner.field_end(p + text, 0, len(p) + len(text))
+                field = text[:field_end - len(p)] if field_end is not None else text
+                if len(field) > limit and (len(field.encode('latin-1')
+                                               .decode(encoding, 'replace')) > limit):
+                    continue
+            spans, _ = scanner.spans(p + text, final=True)
+            ends.update(end - len(p) for _, end in spans)
+            common = ends if common is None else common & ends
+        common.discard(len(text))
+        return min(common) if common else None
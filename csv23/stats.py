@@ -0,0 +1,307 @@
+"""Throughput counters and cumulative stage timings."""
+
+import io
+import itertools
+import threading
+import time
+
+from . import _prefetch
+from . import _streams
+
+__all__ = ['Stats']
+
+STAGES = ('parse', 'format', 'decode', 'encode', 'prefetch', 'compress', 'io')
+
+
+class Stats(object):
+    r"""Row and byte counters with the cumulative time spent per processing stage.
+
+    Args:
+        progress: Callable invoked with the :class:`csv23.Stats` instance
+            every ``every_rows`` rows and/or every ``every_bytes`` bytes.
+        every_rows (int): Row interval for calling ``progress``.
+        every_bytes (int): Interval of bytes read or written for calling ``progress``.
+
+    Attributes:
+        rows (int): Number of rows (records) read or written.
+        bytes_in (int): Number of bytes read from the underlying file.
+        bytes_out (int): Number of bytes written to the underlying file.
+
+    >>> stats = Stats()
+    >>> with open_reader('spam.csv', stats=stats) as reader:  # doctest: +SKIP
+    ...     rows = list(reader)
+    >>> stats.rows, stats.bytes_in  # doctest: +SKIP
+    (2, 52)
+    >>> sorted(stats.times)  # doctest: +SKIP
+    ['decode', 'io', 'parse']
+
+    Notes:
+        - The stages of a reader are ``'parse'``, ``'decode'``, ``'compress'``
+          (decompression), and ``'io'``, the stages of a writer are
+          ``'format'``, ``'encode'``, ``'compress'``, and ``'io'``.
+        - :attr:`times` reports the time spent in each stage itself,
+          i.e. excluding the time spent in the stages called from it
+          (also for work done when closing, e.g. flushing the compressor).
+          Each thread keeps its own stack of running stages.
+        - With ``prefetch``, the ``'compress'`` and ``'io'`` stages run in a background
+          thread and ``'prefetch'`` is the time spent waiting for it.
+    """
+
+    def __init__(self, progress=None, every_rows=None, every_bytes=None):
+        if progress is not None and not (every_rows or every_bytes):
+            raise ValueError('progress callback requires every_rows or every_bytes')
+        self.rows = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self._progress = progress
+        self._every_rows = every_rows
+        self._every_bytes = every_bytes
+        self._next_rows = every_rows
+        self._next_bytes = every_bytes
+        self._due = False
+        self._times = {}
+        self._local = threading.local()
+
+    def __repr__(self):
+        times = ', '.join('%s=%.3fs' % kv for kv in self.times.items())
+        return ('<%s.%s rows=%d bytes_in=%d bytes_out=%d (%s)>'
+                % (self.__class__.__module__, self.__class__.__name__,
+                   self.rows, self.bytes_in, self.bytes_out, times))
+
+    @property
+    def times(self):
+        """:class:`py:dict` of seconds spent in each stage (excluding the stages below it)."""
+        return {s: self._times[s] for s in STAGES if s in self._times}
+
+    def _add_stage(self, stage):
+        self._times.setdefault(stage, 0.0)
+
+    def _start(self):
+        """Push a stage onto the stack of the current thread and return its start time."""
+        try:
+            stack = self._local.stack
+        except AttributeError:
+            stack = self._local.stack = []
+        stack.append(0.0)  # time spent in the stages called from it
+        return time.perf_counter()
+
+    def _stop(self, stage, start):
+        """Pop the stage started at start and add its exclusive time."""
+        elapsed = time.perf_counter() - start
+        stack = self._local.stack
+        nested = stack.pop()
+        self._times[stage] = self._times.get(stage, 0.0) + max(elapsed - nested, 0.0)
+        if stack:
+            stack[-1] += elapsed
+
+    def _add_rows(self, n=1):
+        self.rows += n
+        if self._next_rows is not None and self.rows >= self._next_rows:
+            while self._next_rows <= self.rows:
+                self._next_rows += self._every_rows
+            self._due = True
+        if self._due:
+            self._due = False
+            self._notify()
+
+    def _add_bytes(self, n, attr):
+        setattr(self, attr, getattr(self, attr) + n)
+        if self._next_bytes is not None:
+            total = self.bytes_in + self.bytes_out
+            if total >= self._next_bytes:
+                while self._next_bytes <= total:
+                    self._next_bytes += self._every_bytes
+                # NOTE: deferred to the next row for consistent timings
+                self._due = True
+
+    def _notify(self):
+        if self._progress is not None:
+            self._progress(self)
+
+
+def get_stats(stats):
+    """Return a :class:`Stats` instance for the ``stats`` argument (or ``None``)."""
+    if stats is None or stats is False:
+        return None
+    if stats is True:
+        return Stats()
+    if not isinstance(stats, Stats):
+        raise TypeError('stats must be a bool or a csv23.Stats instance: %r' % stats)
+    return stats
+
+
+class TimedStream(object):
+    """Proxy for a file-like object adding call durations to a stats stage."""
+
+    def __init__(self, stream, stats, stage, inner=None):
+        self._stream = stream
+        self._stats = stats
+        self._stage = stage
+        self._inner = inner
+        self._count = (stage == 'io')
+        stats._add_stage(stage)
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __iter__(self):
+        return self
+
+    def _timed(self, method, *args):
+        start = self._stats._start()
+        try:
+            return method(*args)
+        finally:
+            self._stats._stop(self._stage, start)
+
+    def __next__(self):
+        return self._timed(next, self._stream)
+
+    def read(self, *args):
+        data = self._timed(self._stream.read, *args)
+        if self._count and data:
+            self._stats._add_bytes(len(data), 'bytes_in')
+        return data
+
+    def read1(self, *args):
+        read1 = getattr(self._stream, 'read1', self._stream.read)
+        data = self._timed(read1, *args)
+        if self._count and data:
+            self._stats._add_bytes(len(data), 'bytes_in')
+        return data
+
+    def readinto(self, buffer):
+        n = self._timed(self._stream.readinto, buffer)
+        if self._count and n:
+            self._stats._add_bytes(n, 'bytes_in')
+        return n
+
+    def readline(self, *args):
+        line = self._timed(self._stream.readline, *args)
+        if self._count and line:
+            self._stats._add_bytes(len(line), 'bytes_in')
+        return line
+
+    def write(self, data):
+        n = self._timed(self._stream.write, data)
+        if self._count:
+            self._stats._add_bytes(len(data) if n is None else n, 'bytes_out')
+        return n
+
+    def flush(self):
+        return self._timed(self._stream.flush)
+
+    def close(self):
+        try:
+            if not self._stream.closed and self._stream.writable():  # flushing
+                self._timed(self._stream.close)
+            else:
+                self._stream.close()
+        finally:
+            if self._inner is not None:
+                self._inner.close()
+
+
+def open_timed(file, stats, mode, encoding, newline='', open_module=None,
+               prefetch=None, buffer_size=None, errors=None):
+    """Open ``file`` in text ``mode`` ('r' or 'w') as chain of timed layers."""
+    assert mode in ('r', 'w')
+    binary = io.open(file, mode + 'b', buffering=_streams.buffering(buffer_size))
+    try:
+        return wrap_timed(binary, stats, mode, encoding, newline=newline,
+                          open_module=open_module, close=True, prefetch=prefetch,
+                          buffer_size=buffer_size, errors=errors)
+    except Exception:
+        binary.close()
+        raise
+
+
+def wrap_timed(binary, stats, mode, encoding, newline='', open_module=None,
+               close=False, prefetch=None, buffer_size=None, **textio_kwargs):
+    """Wrap the ``binary`` file-like object into a chain of timed text layers."""
+    layer = TimedStream(binary, stats, 'io')
+    if open_module is not None:
+        compressed = open_module.open(layer, mode + 'b')
+        layer = TimedStream(compressed, stats, 'compress',
+                            inner=layer if close else None)
+        close = True
+    if prefetch is not None:
+        assert mode == 'r'
+        block_size = buffer_size or _prefetch.BLOCK_SIZE
+        layer = TimedStream(_prefetch.PrefetchStream(layer, prefetch, close=close,
+                                                     block_size=block_size),
+                            stats, 'prefetch')
+    text = io.TextIOWrapper(layer, encoding=encoding, newline=newline,
+                            **textio_kwargs)
+    _streams.set_chunk_size(text, buffer_size)
+    return TimedStream(text, stats, 'decode' if mode == 'r' else 'encode')
+
+
+class StatsReader(object):
+    """Proxy for a CSV reader counting rows and timing the ``'parse'`` stage."""
+
+    def __init__(self, reader, stats):
+        self._reader = reader
+        self.stats = stats
+        stats._add_stage('parse')
+
+    def __getattr__(self, name):
+        return getattr(self._reader, name)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        start = self.stats._start()
+        try:
+            row = next(self._reader)
+        finally:
+            self.stats._stop('parse', start)
+        self.stats._add_rows()
+        return row
+
+
+class StatsWriter(object):
+    """Proxy for a CSV writer counting rows and timing the ``'format'`` stage."""
+
+    def __init__(self, writer, stats):
+        self._writer = writer
+        self.stats = stats
+        stats._add_stage('format')
+
+    def __getattr__(self, name):
+        return getattr(self._writer, name)
+
+    def _timed(self, method, *args):
+        start = self.stats._start()
+        try:
+            return method(*args)
+        finally:
+            self.stats._stop('format', start)
+
+    def writeheader(self):
+        result = self._timed(self._writer.writeheader)
+        self.stats._add_rows()
+        return result
+
+    def writerow(self, row):
+        result = self._timed(self._writer.writerow, row)
+        self.stats._add_rows()
+        return result
+
+    def writerows(self, rows, size=1000):
+        if self.stats._every_rows:
+            size = min(size, self.stats._every_rows)
+        rows = iter(rows)
+        while True:
+            chunk = list(itertools.islice(rows, size))
+            if not chunk:
+                break
+            self._timed(self._writer.writerows, chunk)
+            self.stats._add_rows(len(chunk))
@@ -4,6 +4,8 @@ from __future__ import unicode_literals
 
 import csv
 import io
+import itertools
+import operator
 
 from ._common import (PY2, ENCODING, DIALECT,
                       none_encoding, is_8bit_clean, csv_args)
@@ -16,10 +18,13 @@ else:
     from unittest import mock
 
 __all__ = ['writer', 'DictWriter',
-           'UnicodeTextWriter', 'UnicodeBytesWriter']
+           'UnicodeTextWriter', 'UnicodeBytesWriter',
+           'QuoteFreeWriter']
 
+BLOCK_ROWS = 1000
 
-def writer(stream, dialect=DIALECT, encoding=False, **fmtparams):
+
+def writer(stream, dialect=DIALECT, encoding=False, fast=False, **fmtparams):
     r"""CSV writer for rows where string values are :func:`py:unicode` strings (PY3: :class:`py3:str`).
 
     Args:
@@ -27,6 +32,8 @@ def writer(stream, dialect=DIALECT, encoding=False, **fmtparams):
         dialect: Dialect argument for the underlying :func:`py:csv.writer`.
         encoding: If not ``False`` (default): name of the encoding used to
             encode the output lines.
+        fast (bool): Return a :class:`csv23.writers.QuoteFreeWriter` formatting
+            blocks of rows that need no quoting with :meth:`py:str.join`.
         \**fmtparams: Keyword arguments (formatting parameters) for the
             underlying :func:`py:csv.writer`.
 
@@ -46,25 +53,75 @@ def writer(stream, dialect=DIALECT, encoding=False, **fmtparams):
         NotImplementedError: If ``encoding`` is not 8-bit clean.
     """
     if encoding is False:
-        return UnicodeTextWriter(stream, dialect, **fmtparams)
-    if encoding is None:
-        encoding = none_encoding()
-    if not is_8bit_clean(encoding):
-        raise NotImplementedError
-    return UnicodeBytesWriter(stream, dialect, encoding, **fmtparams)
+        result = UnicodeTextWriter(stream, dialect, **fmtparams)
+    else:
+        if encoding is None:
+            encoding = none_encoding()
+        if not is_8bit_clean(encoding):
+            raise NotImplementedError
+        result = UnicodeBytesWriter(stream, dialect, encoding, **fmtparams)
+    if fast:
+        result = QuoteFreeWriter(result, stream,
+                                 encoding=encoding if encoding is not False else None)
+    return result
 
 
 @register_writer('dict', 'bytes', 'text')
 class DictWriter(csv.DictWriter):
-    """:func:`csv23.writer` for dicts where string values are :func:`py:unicode` strings (PY3: :class:`py3:str`)."""
+    """:func:`csv23.writer` for dicts where string values are :func:`py:unicode` strings (PY3: :class:`py3:str`).
+
+    ``writerows()`` extracts the values of blocks of rows with :func:`py:operator.itemgetter`
+    (if they are all plain :class:`py:dict` objects with all ``fieldnames``, otherwise
+    with ``.get(key, restval)``) and passes them to the ``writerows()`` of the
+    :func:`csv23.writer`. With
+    ``extrasaction='raise'``, every ``check_extras``-th row of each block is checked
+    for keys not in ``fieldnames`` (``None`` or ``0`` to skip the check).
+    """
 
     def __init__(self, f, fieldnames, restval='', extrasaction='raise',
-                 dialect=DIALECT, encoding=False, **kwds):
+                 dialect=DIALECT, encoding=False, check_extras=1, **kwds):
         # NOTE: csv.DictWrier is an old-style class on PY2
         csv.DictWriter.__init__(self, mock.mock_open()(), fieldnames, restval,
                                 extrasaction)
+        if check_extras is not None and not (isinstance(check_extras, int)
+                                             and check_extras >= 0):
+            raise ValueError('check_extras must be None or a non-negative int: %r'
+                             % check_extras)
+        self.check_extras = check_extras
         self.writer = writer(f, dialect, encoding, **kwds)
 
+    def writerows(self, rowdicts):
+        fieldnames = list(self.fieldnames)
+        if len(fieldnames) == 0:
+            getter = lambda r: ()  # noqa: E731
+        elif len(fieldnames) == 1:
+            key, = fieldnames
+            getter = lambda r: (r[key],)  # noqa: E731
+        else:
+            getter = operator.itemgetter(*fieldnames)
+        restval = self.restval
+        check = self.check_extras if self.extrasaction == 'raise' else None
+        issuperset = set(fieldnames).issuperset
+        only_dicts = {dict}.issuperset
+        rowdicts = iter(rowdicts)
+        while True:
+            block = list(itertools.islice(rowdicts, BLOCK_ROWS))
+            if not block:
+                break
+            if check and not all(map(issuperset, block[::check])):
+                for r in block[::check]:
+                    self._dict_to_list(r)  # raises ValueError
+            rows = None
+            # NOTE: r[key] would call __missing__ of dict subclasses (e.g. defaultdict)
+            if only_dicts(map(type, block)):
+                try:
+                    rows = list(map(getter, block))
+                except KeyError:
+                    pass
+            if rows is None:  # fill in restval
+                rows = [[r.get(k, restval) for k in fieldnames] for r in block]
+            self.writer.writerows(rows)
+
 
 class Writer(object):
     """Proxy for ``csv.writer``."""
@@ -166,8 +223,96 @@ else:
 
         def writerow(self, row):
             self._writer.writerow(row)
+            return self._flush()
+
+        def writerows(self, rows):
+            if has_issue12178(self.dialect):  # escaping writerow()
+                return super(UnicodeBytesWriter, self).writerows(rows)
+            rows = iter(rows)
+            while True:
+                self._writer.writerows(itertools.islice(rows, BLOCK_ROWS))
+                # NOTE: every row writes at least the lineterminator
+                if not self._buffer.tell():
+                    break
+                self._flush()
+
+        def _flush(self):
             line = self._buffer.getvalue().encode(self._encoding)
             # NOTE: self._buffer.truncate(0) would prepend zero-bytes
             self._buffer.seek(0)
             self._buffer.truncate()
             return self._stream.write(line)
+
+
+class QuoteFreeWriter(object):
+    """Proxy for a CSV writer formatting blocks of rows that need no quoting with ``str.join``.
+
+    Args:
+        writer: CSV writer (:func:`csv23.writer` result) writing into ``stream``.
+        stream: File-like object (in binary mode if ``encoding`` is given).
+        encoding: If not ``None``: name of the encoding used to encode the output lines.
+        block_rows (int): Number of rows checked and formatted at once.
+
+    Notes:
+        - Each block of rows is checked once for ``delimiter``, ``quotechar``,
+          ``escapechar``, and line break characters. If there are none, it is written
+          as ``lineterminator.join(delimiter.join(row) ...)``, otherwise by ``writer``.
+        - Blocks with non-string values (e.g. :class:`py:int` or ``None``) are
+          also written by ``writer``, which formats them faster.
+        - Only dialects with ``QUOTE_MINIMAL`` (without ``skipinitialspace``
+          and not delimited by space) use the fast path.
+    """
+
+    def __init__(self, writer, stream, encoding=None, block_rows=BLOCK_ROWS):
+        self._writer = writer
+        self._stream = stream
+        self._encoding = encoding
+        self._block_rows = block_rows
+        d = writer.dialect
+        self._delimiter = d.delimiter
+        self._lineterminator = d.lineterminator
+        self._specials = [c for c in {d.delimiter, d.quotechar, d.escapechar,
+                                      '\r', '\n'}.union(d.lineterminator) if c]
+        self._enabled = (d.quoting == csv.QUOTE_MINIMAL and not d.skipinitialspace
+                         and d.delimiter != ' ')
+
+    def __getattr__(self, name):
+        return getattr(self._writer, name)
+
+    @property
+    def dialect(self):
+        return self._writer.dialect
+
+    def writerow(self, row):
+        return self._write([row])
+
+    def writerows(self, rows):
+        rows = iter(rows)
+        while True:
+            block = list(itertools.islice(rows, self._block_rows))
+            if not block:
+                break
+            self._write(block)
+
+    def _write(self, rows):
+        if not self._enabled:
+            return self._fallback(rows)
+        rows = [r if isinstance(r, (list, tuple)) else list(r) for r in rows]
+        try:
+            values = ''.join(itertools.chain.from_iterable(rows))
+        except TypeError:  # NOTE: csv.writer formats non-string values faster
+            return self._fallback(rows)
+        # NOTE: a single empty field is written quoted to distinguish it from []
+        if (any(c in values for c in self._specials)
+                or [''] in rows or ('',) in rows):
+            return self._fallback(rows)
+        data = self._lineterminator.join(map(self._delimiter.join, rows))
+        data += self._lineterminator
+        if self._encoding is not None:
+            data = data.encode(self._encoding)
+        return self._stream.write(data)
+
+    def _fallback(self, rows):
+        if len(rows) == 1:
+            return self._writer.writerow(rows[0])
+        return self._writer.writerows(rows)
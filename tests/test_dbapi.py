@@ -0,0 +1,183 @@
+import io
+import sqlite3
+
+import pytest
+
+from csv23 import read_csv, write_csv, to_sqlite, write_cursor
+from csv23.dbapi import FAST_PRAGMAS
+
+HEADER = ['id', 'name']
+
+ROWS = [[str(i), 'sp\xe4m %d' % i] for i in range(25)] + [['25', 'eggs\r\nham']]
+
+
+@pytest.fixture
+def src(tmp_path):
+    return write_csv(tmp_path / 'spam.csv.gz', ROWS, header=HEADER, autocompress=True)
+
+
+@pytest.mark.parametrize('pragmas', [None, FAST_PRAGMAS, {'main.cache_size': -4000,
+                                                          'foreign_keys': True}])
+@pytest.mark.parametrize('batch_size', [1, 7, 1000])
+def test_to_sqlite(tmp_path, src, batch_size, pragmas):
+    db = tmp_path / 'spam.sqlite3'
+
+    n = to_sqlite(src, db, 'spam "table"', batch_size=batch_size, pragmas=pragmas,
+                  autocompress=True)
+
+    assert n == len(ROWS)
+    with sqlite3.connect(str(db)) as conn:
+        assert conn.execute('PRAGMA journal_mode').fetchone() == ('delete',)
+        cursor = conn.execute('SELECT * FROM "spam ""table""" ORDER BY rowid')
+        assert [d[0] for d in cursor.description] == HEADER
+        assert [list(r) for r in cursor] == ROWS
+    conn.close()
+
+
+@pytest.mark.parametrize('schema', [{'id': 'INTEGER', 'name': 'TEXT'},
+                                    [('id', 'INTEGER'), ('name', 'TEXT')]])
+@pytest.mark.parametrize('header', [True, False])
+def test_to_sqlite_schema(tmp_path, src, schema, header):
+    conn = sqlite3.connect(':memory:')
+
+    to_sqlite(src, conn, 'spam', schema=schema, header=header, autocompress=True)
+    to_sqlite(src, conn, 'spam', schema=schema, header=header, if_exists='append',
+              autocompress=True)
+
+    rows = conn.execute('SELECT * FROM spam ORDER BY rowid').fetchall()
+    expected = [(int(i), name) for i, name in ROWS]
+    if not header:
+        expected.insert(0, tuple(HEADER))
+    assert rows == expected * 2
+    assert not conn.in_transaction
+
+
+def test_to_sqlite_if_exists(tmp_path, src):
+    conn = sqlite3.connect(':memory:')
+    to_sqlite(src, conn, 'spam', autocompress=True)
+
+    with pytest.raises(sqlite3.OperationalError, match=r'already exists'):
+        to_sqlite(src, conn, 'spam', autocompress=True)
+
+    assert to_sqlite(src, conn, 'spam', if_exists='replace', autocompress=True) == len(ROWS)
+    assert conn.execute('SELECT count(*) FROM spam').fetchone() == (len(ROWS),)
+
+
+def test_to_sqlite_rollback(tmp_path):
+    src = write_csv(tmp_path / 'spam.csv', [['1', 'spam'], ['2']], header=HEADER)
+    conn = sqlite3.connect(':memory:')
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        to_sqlite(src, conn, 'spam')
+
+    assert conn.execute("SELECT * FROM sqlite_master WHERE name = 'spam'").fetchall() == []
+
+
+def test_to_sqlite_open_transaction(tmp_path, src):
+    conn = sqlite3.connect(':memory:')
+    conn.execute('CREATE TABLE eggs (id INTEGER)')
+    conn.execute('INSERT INTO eggs VALUES (1)')
+    assert conn.in_transaction
+
+    assert to_sqlite(src, conn, 'spam', autocompress=True) == len(ROWS)
+    assert conn.in_transaction
+
+    bad = write_csv(tmp_path / 'bad.csv', [['1', 'spam'], ['2']], header=HEADER)
+    with pytest.raises(sqlite3.ProgrammingError):
+        to_sqlite(bad, conn, 'bad')
+
+    assert conn.in_transaction
+    assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'bad'").fetchall() == []
+    assert conn.execute('SELECT count(*) FROM spam').fetchone() == (len(ROWS),)
+
+    conn.rollback()
+    assert conn.execute('SELECT count(*) FROM eggs').fetchone() == (0,)
+    assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'spam'").fetchall() == []
+
+
+@pytest.mark.parametrize('kwargs, match', [
+    ({'if_exists': 'ignore'}, r'if_exists'),
+    ({'batch_size': 0}, r'batch_size'),
+    ({'header': False}, r'schema'),
+    ({'pragmas': {'synchronous = OFF; DROP TABLE spam; --': 0}}, r'PRAGMA name'),
+    ({'pragmas': {'synchronous': 'OFF; DROP TABLE spam'}}, r'PRAGMA synchronous value'),
+    ({'pragmas': {'cache_size': 1.5}}, r'PRAGMA cache_size value')])
+def test_to_sqlite_invalid(tmp_path, kwargs, match):
+    with pytest.raises(ValueError, match=match):
+        to_sqlite(tmp_path / 'spam.csv', ':memory:', 'spam', **kwargs)
+
+
+def test_to_sqlite_empty(tmp_path):
+    src = write_csv(tmp_path / 'spam.csv', [])
+
+    with pytest.raises(ValueError, match=r'missing header'):
+        to_sqlite(src, ':memory:', 'spam')
+
+
+@pytest.fixture
+def cursor():
+    conn = sqlite3.connect(':memory:')
+    conn.execute('CREATE TABLE spam (id INTEGER, name TEXT, price REAL)')
+    conn.executemany('INSERT INTO spam VALUES (?, ?, ?)',
+                     [(i, 'sp\xe4m\r\n%d' % i, None if i % 3 else i / 2) for i in range(25)])
+    yield conn.execute('SELECT * FROM spam ORDER BY id')
+    conn.close()
+
+
+@pytest.mark.parametrize('batch_size', [1, 7, 1000])
+@pytest.mark.parametrize('filename', ['spam.csv', 'spam.csv.gz'])
+def test_write_cursor(tmp_path, cursor, filename, batch_size):
+    target = tmp_path / filename
+
+    result = write_cursor(target, cursor, batch_size=batch_size, autocompress=True)
+
+    assert result == target
+    assert read_csv(target, autocompress=True, as_list=True) == (
+        [['id', 'name', 'price']]
+        + [[str(i), 'sp\xe4m\r\n%d' % i, '' if i % 3 else str(i / 2)] for i in range(25)])
+
+
+def test_write_cursor_batches(cursor):
+    class Cursor(object):
+        description = cursor.description
+
+        def __init__(self):
+            self.sizes = []
+
+        def fetchmany(self, size):
+            self.sizes.append(size)
+            return cursor.fetchmany(size)
+
+    c = Cursor()
+
+    result = write_cursor(None, c, batch_size=10, header=False, encoding=None)
+
+    assert len(read_csv(io.StringIO(result, newline=''), encoding=None, as_list=True)) == 25
+    assert c.sizes == [10, 10, 10, 10]
+
+
+def test_write_cursor_invalid(cursor):
+    with pytest.raises(ValueError, match=r'batch_size'):
+        write_cursor(None, cursor, batch_size=0)
+
+    cursor = cursor.connection.execute('DELETE FROM spam')
+    with pytest.raises(ValueError, match=r'result set'):
+        write_cursor(None, cursor)
+
+
+def test_to_sqlite_infer(tmp_path):
+    src = write_csv(tmp_path / 'spam.csv',
+                    [['1', '1.5', 'true', 'spam'], ['2', '', 'False', '']],
+                    header=['id', 'price', 'ok', 'name'])
+    conn = sqlite3.connect(':memory:')
+
+    to_sqlite(src, conn, 'spam', schema='infer')
+
+    sql, = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'spam'").fetchone()
+    assert sql == ('CREATE TABLE "spam" ("id" INTEGER NOT NULL, "price" REAL,'
+                   ' "ok" INTEGER NOT NULL, "name" TEXT)')
+    assert conn.execute('SELECT * FROM spam').fetchall() == [(1, 1.5, 1, 'spam'),
+                                                             (2, None, 0, '')]
+
+    with pytest.raises(ValueError, match=r'infer'):
+        to_sqlite(io.BytesIO(b'id\r\n1\r\n'), conn, 'eggs', schema='infer')
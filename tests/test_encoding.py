@@ -5,6 +5,7 @@ from __future__ import unicode_literals
 import pytest
 
 import csv23._dispatch
+from csv23._common import BUFFER_SIZE
 from csv23.openers import open_reader, open_writer
 from csv23.readers import reader
 from csv23.writers import writer
@@ -27,7 +28,8 @@ def test_open_func_encoding_none(mocker, mock_open, stream,
         assert f is mock_cls.return_value
         mock_cls.assert_called_once_with(mock_open.return_value, dialect='excel')
     mock_open.assert_called_once_with(stream, encoding=nonclean_none_encoding,
-                                      mode=mode, newline='')
+                                      mode=mode, newline='',
+                                      buffering=BUFFER_SIZE)
 
 
 @pytest.mark.parametrize(
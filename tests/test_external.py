@@ -0,0 +1,124 @@
+import io
+import operator
+
+import pytest
+
+from csv23 import read_csv, write_csv, sort_csv, join_csv
+
+HEADER = ['id', 'name']
+
+ROWS = [[str(i % 7), 'sp\xe4m %d' % i] for i in range(50)] + [['3', 'eggs\r\nham']]
+
+
+@pytest.fixture
+def src(tmp_path):
+    return write_csv(tmp_path / 'src.csv', ROWS, header=HEADER)
+
+
+@pytest.mark.parametrize('memory_limit', [1, 2 ** 10, 2 ** 20])
+@pytest.mark.parametrize('key, expected_key', [
+    ('id', operator.itemgetter(0)),
+    ([1, 'id'], operator.itemgetter(1, 0)),
+    (None, None),
+    (lambda r: -int(r[0]), lambda r: -int(r[0]))])
+def test_sort_csv(mocker, tmp_path, src, key, expected_key, memory_limit):
+    mocker.patch('csv23.external.MERGE_FANIN', 2)
+    dst = tmp_path / 'dst.csv'
+
+    result = sort_csv(src, dst, key=key, memory_limit=memory_limit, tmpdir=tmp_path)
+
+    assert result == dst
+    assert read_csv(dst, as_list=True) == [HEADER] + sorted(ROWS, key=expected_key)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['dst.csv', 'src.csv']
+
+
+def test_sort_csv_workers(tmp_path, src):
+    dst = tmp_path / 'dst.csv.gz'
+
+    sort_csv(src, dst, key='id', reverse=True, memory_limit=2 ** 10,
+             workers=2, autocompress=True)
+
+    expected = sorted(ROWS, key=operator.itemgetter(0), reverse=True)
+    assert read_csv(dst, as_list=True, autocompress=True) == [HEADER] + expected
+
+
+def test_sort_csv_no_header(tmp_path, src):
+    dst = tmp_path / 'dst.csv'
+
+    sort_csv(src, dst, header=False, memory_limit=2 ** 10)
+
+    assert read_csv(dst, as_list=True) == sorted([HEADER] + ROWS)
+
+
+def test_sort_csv_empty(tmp_path):
+    src = write_csv(tmp_path / 'src.csv', [])
+    dst = tmp_path / 'dst.csv'
+
+    sort_csv(src, dst)
+
+    assert dst.read_bytes() == b''
+
+
+def test_sort_csv_invalid_key(src, tmp_path):
+    with pytest.raises(ValueError, match=r'spam'):
+        sort_csv(src, tmp_path / 'dst.csv', key='spam')
+
+
+LEFT = [['id', 'kind', 'value']] + [[str(i % 5), 'k%d' % (i % 2), 'v%d' % i] for i in range(40)]
+
+RIGHT = [['kind', 'id', 'label']] + [[k, str(i), 'l\xe4bel\r\n%s%d' % (k, i)]
+                                     for i in range(4) for k in ('k0', 'k1')]
+
+
+def expected_join(how):
+    index = {(r[1], r[0]): r[2:] for r in RIGHT[1:]}
+    result = []
+    for row in LEFT[1:]:
+        extra = index.get((row[0], row[1]))
+        if extra is not None:
+            result.append(row + extra)
+        elif how == 'left':
+            result.append(row + [''])
+    return result
+
+
+@pytest.mark.parametrize('memory_limit', [1, 2 ** 20])
+@pytest.mark.parametrize('partitions', [None, 3])
+@pytest.mark.parametrize('how', ['inner', 'left'])
+@pytest.mark.parametrize('variant', ['paths', 'stream', 'small_left'])
+def test_join_csv(mocker, tmp_path, how, memory_limit, partitions, variant):
+    if partitions is not None:
+        mocker.patch('csv23.external._partitions', return_value=partitions)
+    left = write_csv(tmp_path / 'left.csv', LEFT[1:], header=LEFT[0])
+    unmatched = [['k2', str(i), 'spam' * 10] for i in range(20)]
+    right = write_csv(tmp_path / 'right.csv',
+                      RIGHT[1:] + (unmatched if variant == 'small_left' else []),
+                      header=RIGHT[0])
+    dst = tmp_path / 'dst.csv'
+    if variant == 'stream':  # unknown size: building from the right side
+        right = io.BytesIO(right.read_bytes())
+
+    result = join_csv(left, right, dst, on=['id', 'kind'], how=how,
+                      memory_limit=memory_limit, tmpdir=tmp_path)
+
+    assert result == dst
+    rows = read_csv(dst, as_list=True)
+    assert rows[0] == ['id', 'kind', 'value', 'label']
+    if memory_limit == 1 or (variant == 'small_left' and how == 'inner'):
+        rows[1:] = sorted(rows[1:], key=lambda r: int(r[2][1:]))
+    assert rows[1:] == expected_join(how)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['dst.csv', 'left.csv', 'right.csv']
+
+
+def test_join_csv_invalid(tmp_path):
+    left = write_csv(tmp_path / 'left.csv', LEFT)
+    right = write_csv(tmp_path / 'right.csv', [])
+
+    with pytest.raises(ValueError, match=r'how'):
+        join_csv(left, left, None, on='id', how='outer')
+
+    with pytest.raises(ValueError, match=r'missing header'):
+        join_csv(left, right, None, on='id')
+
+    with pytest.raises(ValueError, match=r'spam'):
+        join_csv(left, left, None, on='spam')
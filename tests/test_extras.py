@@ -1,10 +1,14 @@
 from __future__ import unicode_literals
 
 import collections
+import dataclasses
+import io
 
 import pytest
 
-from csv23.extras import NamedTupleReader, NamedTupleWriter
+from csv23.extras import (NamedTupleReader, NamedTupleWriter,
+                          DataclassReader, DataclassWriter)
+from csv23.openers import open_reader, open_writer
 
 
 def test_NamedTupleReader():  # noqa: N802
@@ -93,3 +97,137 @@ def test_NamedTupleWriter(mocker, rows, lines):
         writer.writerows(rows)
     expected = [mocker.call.write(l) for l in lines] + [mocker.call.close()]  # noqa: E741
     assert f.method_calls == expected
+
+
+@pytest.mark.parametrize('rows, expected', [
+    ([], ''),
+    ([Row('spam', 1)] * 3, 'column_1,column_2\r\n' + 'spam,1\r\n' * 3)])
+def test_NamedTupleWriter_writerows(rows, expected):  # noqa: N802
+    with io.StringIO(newline='') as f:
+        writer = NamedTupleWriter(f)
+        writer.writerows(iter(rows))
+        writer.writerows(iter(rows))
+        assert f.getvalue() == expected + expected.partition('\r\n')[2]
+
+
+def test_namedtuple_reader_intern():
+    lines = ['id,status\r\n', '1,ok\r\n', '2,ok\r\n']
+    codes = {}
+    rows = list(NamedTupleReader(lines, intern=['status'], categories=codes))
+    assert [r.status for r in rows] == [0, 0]
+    assert codes == {'status': ['ok']}
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class Point:
+    x: str
+    y: str
+    label: str = 'origin'
+    area: float = dataclasses.field(default=0.0, init=False)
+
+
+@dataclasses.dataclass
+class Single:
+    value: str
+
+
+@pytest.mark.parametrize('lines, expected', [
+    (['x,y,label\r\n', '1,2,spam\r\n'], [Point('1', '2', 'spam')]),
+    (['label,spam,y,x\r\n', 'eggs,ham,2,1\r\n'], [Point('1', '2', 'eggs')]),
+    (['y,x\r\n', '2,1\r\n', '4,3\r\n'], [Point('1', '2'), Point('3', '4')])])
+def test_DataclassReader(lines, expected):  # noqa: N802
+    reader = DataclassReader(lines, row_cls=Point)
+    assert reader.row_cls is Point
+
+    assert list(reader) == expected
+    assert reader.line_num == len(lines)
+
+
+def test_DataclassReader_invalid():  # noqa: N802
+    with pytest.raises(TypeError, match=r'requires row_cls'):
+        DataclassReader([])
+
+    with pytest.raises(TypeError, match=r'dataclass or attrs class'):
+        DataclassReader([], row_cls=Row)
+
+    with pytest.raises(RuntimeError, match=r'missing header'):
+        next(DataclassReader([], row_cls=Point))
+
+    with pytest.raises(TypeError, match=r'missing 1 required'):
+        next(DataclassReader(['x\r\n', '1\r\n'], row_cls=Point))
+
+    with pytest.raises(ValueError, match=r'line 3 has 1 fields, header has 2'):
+        list(DataclassReader(['y,x\r\n', '2,1\r\n', '4\r\n'], row_cls=Point))
+
+
+@dataclasses.dataclass(kw_only=True)
+class KwPoint:
+    x: str
+    y: str = '0'
+
+
+@pytest.mark.parametrize('lines, expected', [
+    (['x,y\r\n', '1,2\r\n'], [KwPoint(x='1', y='2')]),
+    (['x\r\n', '1\r\n'], [KwPoint(x='1')])])
+def test_DataclassReader_kw_only(lines, expected):  # noqa: N802
+    assert list(DataclassReader(lines, row_cls=KwPoint)) == expected
+
+
+@pytest.mark.parametrize('row_cls, header, rows, expected', [
+    (None, True, [Point('1', '2', 'spam, eggs')],
+     'x,y,label,area\r\n1,2,"spam, eggs",0.0\r\n'),
+    (Point, True, [], 'x,y,label,area\r\n'),
+    (None, True, [], ''),
+    (Point, False, [Point('1', '2')] * 2, '1,2,origin,0.0\r\n' * 2),
+    (None, ['value'], [Single('spam')] * 2, 'value\r\nspam\r\nspam\r\n')])
+def test_DataclassWriter(row_cls, header, rows, expected):  # noqa: N802
+    with io.StringIO(newline='') as f:
+        writer = DataclassWriter(f, row_cls=row_cls, header=header)
+        assert writer.dialect.delimiter == ','
+        writer.writerows(iter(rows))
+        writer.writerows(iter(rows))
+        again = expected.partition('\r\n')[2] if header else expected
+        assert f.getvalue() == expected + again
+
+
+def test_DataclassWriter_writerow():  # noqa: N802
+    with io.BytesIO() as f:
+        writer = DataclassWriter(f, encoding='latin-1')
+        writer.writerow(Single('sp\xe4m'))
+        writer.writerow(Single('eggs'))
+        assert f.getvalue() == b'value\r\nsp\xe4m\r\neggs\r\n'
+
+
+def test_DataclassWriter_invalid():  # noqa: N802
+    with pytest.raises(TypeError, match=r'dataclass or attrs class'):
+        DataclassWriter(io.StringIO(), row_cls=Row)
+
+
+def test_attrs_rows():
+    attr = pytest.importorskip('attr')
+
+    @attr.s(slots=True)
+    class Item(object):
+        name = attr.ib()
+        _price = attr.ib(default='0')
+        note = attr.ib(default='', kw_only=True)
+
+    with io.StringIO(newline='') as f:
+        DataclassWriter(f).writerows([Item('spam', '1'), Item('eggs')])
+        assert f.getvalue() == '_price,note\r\n'.join(['name,', 'spam,1,\r\neggs,0,\r\n'])
+        f.seek(0)
+        assert list(DataclassReader(f, row_cls=Item)) == [Item('spam', '1'), Item('eggs')]
+
+    assert list(DataclassReader(['name\r\n', 'ham\r\n'], row_cls=Item)) == [Item('ham')]
+
+
+def test_rowtype_dataclass(filepath):
+    rows = [Point('1', '2', 'sp\xe4m'), Point('3', '4')]
+
+    with open_writer(str(filepath), rowtype='dataclass') as writer:
+        assert isinstance(writer, DataclassWriter)
+        writer.writerows(rows)
+
+    with open_reader(str(filepath), rowtype='dataclass', row_cls=Point) as reader:
+        assert isinstance(reader, DataclassReader)
+        assert list(reader) == rows
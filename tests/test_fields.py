@@ -0,0 +1,72 @@
+import csv
+import gc
+import io
+import os
+
+import pytest
+
+from csv23 import _fields
+from csv23._fields import LargeField, LargeFieldReader
+
+TEXTS = ['',
+         'spam,eggs\r\n',
+         'spam,"%s"\r\nham,eggs\r\n' % ('x' * 100),
+         'spam,"sp""%s""am"\r\n' % ('x' * 100),
+         '"%s\r\n%s",eggs\n\r\nham' % ('x' * 50, 'y' * 50),
+         '%s,\\,%s\r\n"a"b,"\\"\r\n' % ('x' * 50, 'y' * 50),
+         ' "%s" ,  x\r"\r"\n' % ('x' * 50),
+         '\r\n\r\n\n\r"%s' % ('x' * 100)]
+
+DIALECTS = [{}, {'escapechar': '\\'}, {'skipinitialspace': True, 'doublequote': False},
+            {'quoting': csv.QUOTE_NONE, 'escapechar': '\\'}, {'delimiter': ';'}]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2 ** 16])
+@pytest.mark.parametrize('limit, large_fields', [(1, 'slice'), (10, 'spill'), (10, 'slice')])
+@pytest.mark.parametrize('fmtparams', DIALECTS)
+@pytest.mark.parametrize('text', TEXTS)
+def test_large_field_reader(mocker, tmp_path, text, fmtparams, large_fields, limit, chunk_size):
+    mocker.patch.object(_fields, 'CHUNK_SIZE', chunk_size)
+    path = tmp_path / 'spam.csv'
+    path.write_text(text, encoding='utf-8', newline='')
+    expected = csv.reader(io.StringIO(text, newline=''), **fmtparams)
+    expected_rows = list(expected)
+
+    with io.open(path, encoding='utf-8', newline='') as f:
+        reader = LargeFieldReader(f, 'excel', limit, large_fields, 'utf-8', path, **fmtparams)
+        rows = list(reader)
+
+    assert [[v.read() if isinstance(v, LargeField) else v for v in r]
+            for r in rows] == expected_rows
+    assert all(len(v) <= limit for r in rows for v in r if not isinstance(v, LargeField))
+    assert reader.line_num == expected.line_num
+
+
+def test_large_field_slice_spill(tmp_path):
+    path = tmp_path / 'spam.csv'
+    path.write_bytes('1,"sp\xe4m%s"\r\n2,"s""%s"\r\n'.replace('%s', 'x' * 20)
+                     .encode('utf-8'))
+
+    with io.open(path, encoding='utf-8', newline='') as f:
+        (_, sliced), (_, spilled) = LargeFieldReader(f, 'excel', 10, 'slice', 'utf-8', path)
+
+    assert (sliced.path, sliced.offset, sliced.length) == (path, 3, 25)
+    assert not sliced.temporary
+    assert sliced.read() == 'sp\xe4m' + 'x' * 20
+    assert spilled.temporary and spilled.path != path
+    assert spilled.read() == 's"' + 'x' * 20
+
+    spill_path = spilled.path
+    del spilled
+    gc.collect()
+    assert not os.path.exists(spill_path)
+
+
+@pytest.mark.parametrize('max_field_size, large_fields, encoding, match', [
+    (0, 'spill', None, r'max_field_size'),
+    ('1', 'spill', None, r'max_field_size'),
+    (1, 'mmap', None, r'large_fields'),
+    (1, 'slice', 'utf-16', r'8-bit clean')])
+def test_check_large_fields_invalid(max_field_size, large_fields, encoding, match):
+    with pytest.raises(ValueError, match=match):
+        _fields.check_large_fields(max_field_size, large_fields, encoding)
@@ -1,5 +1,8 @@
 from __future__ import unicode_literals
 
+import csv
+import re
+
 import pytest
 
 from csv23 import open_csv, iterrows
@@ -40,3 +43,218 @@ def test_iterrows(filepath, encoding, line=LINE, expected=ROW):
 
     with pytest.raises(StopIteration):
         next(rows)
+
+
+@pytest.mark.parametrize('rowtype', ['list', 'dict'])
+@pytest.mark.parametrize('prefilter', ['spam', b'spam', re.compile(r'sp[a]m'),
+                                       re.compile(br'sp[a]m')])
+def test_iterrows_prefilter(filepath, rowtype, prefilter):
+    filepath.write_bytes(b'key,value\r\n'
+                         b'1,spam\r\n'
+                         b'2,eggs\r\n'
+                         b'3,"eggs\r\nspam"\r\n'
+                         b'4,"eggs\r\neggs"\r\n'
+                         b'5,spam\r\n')
+
+    rows = iterrows(str(filepath), rowtype=rowtype, prefilter=prefilter)
+
+    expected = [['1', 'spam'], ['3', 'eggs\r\nspam'], ['5', 'spam']]
+    if rowtype == 'dict':
+        expected = [dict(zip(['key', 'value'], e)) for e in expected]
+    else:
+        expected.insert(0, ['key', 'value'])
+    assert list(rows) == expected
+
+
+def test_iterrows_prefilter_invalid(filepath):
+    with pytest.raises(TypeError, match=r'prefilter'):
+        next(iterrows(str(filepath), prefilter=42))
+
+
+@pytest.mark.parametrize('rowtype', ['list', 'dict', 'namedtuple'])
+@pytest.mark.parametrize('encoding', ['utf-8', 'utf-16'])
+def test_iterrows_checkpoint_resume(filepath, rowtype, encoding):
+    filepath.write_text('key,value\r\n'
+                        '1,"späm\r\nspam"\r\n'
+                        '2,eggs\r\n'
+                        '3,ham\r\n', encoding=encoding, newline='')
+
+    rows = iterrows(str(filepath), encoding=encoding, rowtype=rowtype, checkpoints=True)
+    assert rows.checkpoint() == (0, 0, None)
+    first = [next(rows) for _ in range(2 if rowtype == 'list' else 1)]
+    token = rows.checkpoint()
+    rows.close()
+
+    assert token.line_num == 3
+    assert token.header == ['key', 'value']
+    assert rows.checkpoint() == token
+
+    resumed = iterrows(str(filepath), encoding=encoding, rowtype=rowtype,
+                       resume=list(token))
+    rest = list(resumed)
+
+    assert first + rest == list(iterrows(str(filepath), encoding=encoding, rowtype=rowtype))
+    assert len(rest) == 2
+    assert resumed.checkpoint().line_num == 5
+    if encoding == 'utf-8':
+        assert resumed.checkpoint().offset == len(filepath.read_bytes())
+
+
+def test_iterrows_checkpoint_invalid(filepath):
+    with pytest.raises(RuntimeError, match=r'checkpoints=True'):
+        iterrows(str(filepath)).checkpoint()
+
+    with pytest.raises(ValueError, match=r'prefilter'):
+        next(iterrows(str(filepath), prefilter='spam', checkpoints=True))
+
+
+@pytest.mark.parametrize('stats', [None, True])
+def test_iterrows_prefetch(filepath, stats):
+    filepath.write_bytes(b'key,value\r\n1,"sp\xc3\xa4m\r\n"\r\n')
+
+    rows = iterrows(str(filepath), prefetch=1, stats=stats)
+
+    assert list(rows) == [['key', 'value'], ['1', 'sp\xe4m\r\n']]
+
+    with pytest.raises(ValueError, match=r'prefetch'):
+        next(iterrows(str(filepath), prefetch=1, checkpoints=True))
+
+
+QUARANTINE = (b'key,value\r\n'
+              b'1,spam\r\n'
+              b'2\r\n'
+              b'3,"eggs"ham\r\n'
+              b'4,sp\xe4m\r\n'
+              b'5,"eggs\r\nham"\r\n')
+
+
+@pytest.mark.parametrize('rowtype', ['list', 'dict', 'namedtuple'])
+@pytest.mark.parametrize('stats', [None, True])
+def test_iterrows_quarantine(filepath, rowtype, stats):
+    filepath.write_bytes(QUARANTINE)
+    bad = []
+
+    rows = list(iterrows(str(filepath), rowtype=rowtype, stats=stats, strict=True,
+                         on_error='quarantine', quarantine=bad.append))
+
+    expected = [['1', 'spam'], ['5', 'eggs\r\nham']]
+    if rowtype == 'list':
+        assert rows == [['key', 'value']] + expected
+    elif rowtype == 'dict':
+        assert rows == [dict(zip(['key', 'value'], e)) for e in expected]
+    else:
+        assert [list(r) for r in rows] == expected
+    assert [(b.offset, b.line_num) for b in bad] == [(19, 3), (22, 4), (35, 5)]
+    assert [b.error for b in bad][::2] == ['expected 2 fields, saw 1', 'undecodable bytes']
+    assert [b.text for b in bad] == ['2\r\n', '3,"eggs"ham\r\n', '4,sp\udce4m\r\n']
+    data = filepath.read_bytes()
+    assert [data[b.offset:].startswith(b.text.encode('utf-8', 'surrogateescape'))
+            for b in bad] == [True] * 3
+
+
+@pytest.mark.parametrize('rowtype', ['list', 'dict', 'namedtuple'])
+def test_iterrows_quarantine_multiline(filepath, rowtype):
+    filepath.write_bytes(b'a,b\r\n1,"xxxxxxxx\r\nyyyyyyyyy\r\nzz",3\r\n4,5\r\n')
+    bad = []
+    limit = csv.field_size_limit(10)
+    try:
+        with open_csv(str(filepath), rowtype=rowtype,
+                      on_error='quarantine', quarantine=bad.append) as reader:
+            rows = list(reader)
+            line_num = reader.line_num
+    finally:
+        csv.field_size_limit(limit)
+
+    expected = [['4', '5']]
+    if rowtype == 'list':
+        assert rows == [['a', 'b']] + expected
+    elif rowtype == 'dict':
+        assert rows == [dict(zip(['a', 'b'], e)) for e in expected]
+    else:
+        assert [list(r) for r in rows] == expected
+    assert line_num == 5
+    assert bad == [(5, 2, 'field larger than field limit (10)',
+                    '1,"xxxxxxxx\r\nyyyyyyyyy\r\nzz",3\r\n')]
+
+
+def test_iterrows_quarantine_file(tmp_path, filepath):
+    filepath.write_bytes(QUARANTINE)
+    quarantine = tmp_path / 'quarantine.csv'
+
+    rows = list(iterrows(str(filepath), rowtype='dict', fieldnames=['key', 'value'],
+                         on_error='quarantine', quarantine=quarantine))
+
+    assert len(rows) == 4
+    assert quarantine.read_bytes() == (b'offset,line_num,error,text\r\n'
+                                       b'19,3,"expected 2 fields, saw 1","2\r\n"\r\n'
+                                       b'35,5,undecodable bytes,"4,sp\xe4m\r\n"\r\n')
+
+
+def test_iterrows_quarantine_invalid(filepath):
+    with pytest.raises(ValueError, match=r'on_error'):
+        next(iterrows(str(filepath), on_error='ignore'))
+
+    with pytest.raises(ValueError, match=r'requires a quarantine'):
+        next(iterrows(str(filepath), on_error='quarantine'))
+
+    with pytest.raises(ValueError, match=r'prefilter'):
+        next(iterrows(str(filepath), prefilter='spam',
+                      on_error='quarantine', quarantine=print))
+
+
+@pytest.mark.parametrize('rowtype', ['list', 'dict', 'namedtuple'])
+@pytest.mark.parametrize('large_fields', ['spill', 'slice'])
+def test_iterrows_max_field_size(filepath, rowtype, large_fields):
+    blob = 'x' * 1000
+    filepath.write_bytes(('key,value\r\n1,"%s"\r\n2,eggs\r\n' % blob).encode('utf-8'))
+
+    rows = list(iterrows(str(filepath), rowtype=rowtype, max_field_size=100,
+                         large_fields=large_fields))
+
+    values = [r[1] if rowtype == 'list' else r['value'] if rowtype == 'dict' else r.value
+              for r in rows]
+    assert [v if isinstance(v, str) else v.read() for v in values][-2:] == [blob, 'eggs']
+    assert (values[-2].path == str(filepath)) == (large_fields == 'slice')
+
+
+def test_iterrows_max_field_size_invalid(filepath):
+    with pytest.raises(ValueError, match=r'max_field_size'):
+        next(iterrows(str(filepath), max_field_size=0))
+
+    with pytest.raises(ValueError, match=r'prefilter'):
+        next(iterrows(str(filepath), max_field_size=100, prefilter='spam'))
+
+    with pytest.raises(ValueError, match=r'prefetch'):
+        next(iterrows(str(filepath), max_field_size=100, large_fields='slice', prefetch=1))
+
+
+@pytest.mark.parametrize('rowtype', ['list', 'dict', 'namedtuple'])
+@pytest.mark.parametrize('on_error', ['raise', 'quarantine'])
+def test_iterrows_intern(filepath, rowtype, on_error):
+    bad_line = b'2\r\n' if on_error == 'quarantine' else b''
+    filepath.write_bytes(b'id,status\r\n1,ok\r\n' + bad_line + b'3,ok\r\n4,fail\r\n')
+    codes, bad = {}, []
+    kwargs = {'quarantine': bad.append} if on_error == 'quarantine' else {}
+
+    rows = list(iterrows(str(filepath), rowtype=rowtype, on_error=on_error,
+                         intern=['status'], categories=codes, **kwargs))
+
+    if rowtype == 'list':
+        assert rows[0] == ['id', 'status']
+        status = [r[1] for r in rows[1:]]
+    else:
+        status = [r['status'] if rowtype == 'dict' else r.status for r in rows]
+    assert status == [0, 0, 1]
+    assert codes == {'status': ['ok', 'fail']}
+    assert [b.line_num for b in bad] == ([3] if bad_line else [])
+
+
+def test_iterrows_intern_invalid(filepath):
+    with pytest.raises(ValueError, match=r'intern'):
+        next(iterrows(str(filepath), intern='spam'))
+
+    with pytest.raises(ValueError, match=r'checkpoints'):
+        next(iterrows(str(filepath), intern='auto', checkpoints=True))
+
+    with pytest.raises(ValueError, match=r'max_field_size'):
+        next(iterrows(str(filepath), intern='auto', max_field_size=100))
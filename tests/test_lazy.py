@@ -0,0 +1,178 @@
+from __future__ import unicode_literals
+
+import csv
+import io
+
+import pytest
+
+from csv23 import iterrows
+from csv23.lazy import LazyReader, LazyRow, LazyWriter
+from csv23.openers import open_reader, open_writer
+
+TEXT = ('id,status,comment\r\n'
+        '1,ok,spam\r\n'
+        '2,fail,"eggs, ""ham""\r\nand spam"\r\n'
+        '\r\n'
+        '3,ok,\r\n')
+
+DIALECTS = [{}, {'escapechar': '\\'}, {'skipinitialspace': True, 'doublequote': False},
+            {'quoting': csv.QUOTE_NONE, 'escapechar': '\\'}, {'delimiter': ';'}]
+
+TEXTS = ['"h"\r\nspam,eggs\r\n',
+         '"h"\r\n"sp""am",1.5,\r\n"a\r\nb",\\"x,\' y\'\n',
+         '"h"\r\n a; "b"\r\r\n"c\\\r\nd"\\,e\r\n',
+         '"h"\r\n"unterminated,\r\nspam',
+         '"h"\r\nspam,"eggs"ham,"",\r\n']
+
+
+def test_lazy_reader():
+    with io.StringIO(TEXT, newline='') as f:
+        reader = LazyReader(f)
+        assert reader.fieldnames is None
+        rows = list(reader)
+
+    assert reader.fieldnames == ['id', 'status', 'comment']
+    assert reader.line_num == 6
+    assert rows == list(csv.reader(io.StringIO(TEXT, newline='')))[1:]
+    assert [r.text for r in rows] == ['1,ok,spam\r\n',
+                                      '2,fail,"eggs, ""ham""\r\nand spam"\r\n',
+                                      '\r\n', '3,ok,\r\n']
+    assert rows[1].raw == '2,fail,"eggs, ""ham""\r\nand spam"'
+    assert rows[0].fieldnames is reader.fieldnames
+
+
+def test_lazy_row_access():
+    row = next(LazyReader(['a,b,c\r\n', '1,"x,y",' + ','.join('z' * 10) + '\r\n']))
+    assert isinstance(row, LazyRow)
+
+    assert row['b'] == 'x,y'
+    assert row._spans == [(0, 1), (2, 7)]  # scanned up to the accessed field
+    assert row[0] == '1' and row['a'] == '1'
+    assert row.get('spam') is None
+    assert row.get('c') == 'z'
+    assert len(row) == 12
+    assert row[-1] == 'z'
+    assert row[1:3] == ['x,y', 'z']
+    assert 'x,y' in row
+    assert row != ['1']
+
+    with pytest.raises(IndexError):
+        row[12]
+    with pytest.raises(KeyError):
+        row['spam']
+
+
+@pytest.mark.parametrize('fmtparams', DIALECTS)
+@pytest.mark.parametrize('text', TEXTS)
+def test_lazy_reader_like_csv_reader(text, fmtparams):
+    expected = csv.reader(io.StringIO(text, newline=''), **fmtparams)
+    expected_rows = list(expected)[1:]
+
+    reader = LazyReader(io.StringIO(text, newline=''), **fmtparams)
+    rows = list(reader)
+
+    assert [r[-1] if len(r) else None for r in rows] == [r[-1] if r else None
+                                                         for r in expected_rows]
+    assert [list(r) for r in rows] == expected_rows
+    assert reader.line_num == expected.line_num
+
+
+def test_lazy_reader_nonnumeric():
+    text = '"h"\r\n1.5,"x",\r\n'
+    expected = list(csv.reader(io.StringIO(text, newline=''), quoting=csv.QUOTE_NONNUMERIC))
+
+    row, = LazyReader(io.StringIO(text, newline=''), quoting=csv.QUOTE_NONNUMERIC)
+
+    assert row[0] == 1.5
+    assert list(row) == expected[1]
+
+
+def test_lazy_reader_invalid():
+    with pytest.raises(ValueError, match=r'lineterminator'):
+        LazyReader([], quoting=csv.QUOTE_NONE, lineterminator='\x1e')
+
+
+@pytest.mark.parametrize('fmtparams, verbatim', [
+    ({}, True),
+    ({'lineterminator': '\n'}, True),
+    ({'quoting': csv.QUOTE_ALL}, False)])
+def test_lazy_writer(fmtparams, verbatim):
+    rows = list(LazyReader(io.StringIO(TEXT, newline='')))
+
+    with io.StringIO(newline='') as f:
+        writer = LazyWriter(f, **fmtparams)
+        writer.writerows(rows[:2])
+        writer.writerow(['4', 'ok', 'ham'])
+        result = f.getvalue()
+
+    with io.StringIO(newline='') as f:
+        csv.writer(f, **fmtparams).writerows([rows[0].fieldnames] + [list(r) for r in rows[:2]]
+                                             + [['4', 'ok', 'ham']])
+        expected = f.getvalue()
+
+    assert result == expected
+    if verbatim:
+        assert rows[1].raw in result
+
+
+@pytest.mark.parametrize('header', [None, ['a', 'b']])
+def test_lazy_writer_lists(header):
+    with io.StringIO(newline='') as f:
+        writer = LazyWriter(f, header=header)
+        writer.writerow(['1', 'spam, eggs'])
+        writer.writerows([('2', 'ham')])
+        result = f.getvalue()
+
+    assert result == ('a,b\r\n' if header else '') + '1,"spam, eggs"\r\n2,ham\r\n'
+
+
+@pytest.mark.parametrize('header, expected', [(None, ''), (['a', 'b'], 'a,b\r\n')])
+def test_lazy_writer_no_rows(header, expected):
+    with io.StringIO(newline='') as f:
+        LazyWriter(f, header=header).writerows([])
+        assert f.getvalue() == expected
+
+
+def test_lazy_writer_header_lazy_rows():
+    rows = list(LazyReader(io.StringIO(TEXT, newline='')))
+
+    with io.StringIO(newline='') as f:
+        LazyWriter(f, header=['ID', 'STATUS', 'COMMENT']).writerows(rows[:1])
+        assert f.getvalue() == 'ID,STATUS,COMMENT\r\n1,ok,spam\r\n'
+
+
+@pytest.mark.parametrize('encoding', ['utf-8', 'latin-1'])
+def test_rowtype_lazy(filepath, encoding):
+    filepath.write_text(TEXT.replace('spam', 'sp\xe4m'), encoding=encoding, newline='')
+    target = filepath.with_name('filtered.csv')
+
+    with open_reader(str(filepath), encoding=encoding, rowtype='lazy') as reader, \
+         open_writer(str(target), encoding=encoding, rowtype='lazy') as writer:
+        assert isinstance(reader, LazyReader)
+        assert isinstance(writer, LazyWriter)
+        writer.writerows(r for r in reader if r.get('status') == 'ok')
+
+    assert target.read_bytes() == (b'id,status,comment\r\n1,ok,sp\xe4m\r\n3,ok,\r\n'
+                                   .decode('latin-1').encode(encoding))
+
+
+def test_iterrows_lazy_resume(filepath):
+    filepath.write_text(TEXT, encoding='utf-8', newline='')
+
+    rows = iterrows(str(filepath), rowtype='lazy', checkpoints=True)
+    assert next(rows) == ['1', 'ok', 'spam']
+    token = rows.checkpoint()
+    rows.close()
+
+    assert token.header == ['id', 'status', 'comment']
+    rows = list(iterrows(str(filepath), rowtype='lazy', resume=token))
+    assert rows == [['2', 'fail', 'eggs, "ham"\r\nand spam'], [], ['3', 'ok', '']]
+    assert rows[0]['comment'] == 'eggs, "ham"\r\nand spam'
+
+
+@pytest.mark.parametrize('kwargs', [{'on_error': 'quarantine', 'quarantine': print},
+                                    {'max_field_size': 100},
+                                    {'intern': 'auto'}])
+def test_open_reader_lazy_invalid(kwargs):
+    with pytest.raises(ValueError, match=r"rowtype='lazy'"):
+        open_reader('spam.csv', rowtype='lazy', **kwargs)
@@ -0,0 +1,63 @@
+import pathlib
+
+import pytest
+
+from csv23 import write_csv, read_many
+
+HEADER = ['id', 'name']
+
+
+@pytest.fixture
+def files(tmp_path):
+    result = []
+    for i in range(7):
+        suffix = ['.csv', '.csv.gz', '.csv.bz2'][i % 3]
+        rows = [[str(i), 'sp\xe4m\r\n%d' % j] for j in range(i)]
+        result.append(write_csv(tmp_path / ('spam-%d%s' % (i, suffix)), rows,
+                                header=HEADER, autocompress=True))
+    return result
+
+
+@pytest.mark.parametrize('processes', [False, True])
+@pytest.mark.parametrize('workers', [1, 3])
+def test_read_many(files, workers, processes):
+    rows = read_many(files, workers=workers, processes=processes, autocompress=True)
+
+    assert next(rows) == HEADER
+    assert list(rows) == [[str(i), 'sp\xe4m\r\n%d' % j] for i in range(7) for j in range(i)]
+
+
+@pytest.mark.parametrize('kind', ['glob', 'directory'])
+def test_read_many_unordered_source(tmp_path, files, kind):
+    paths = str(tmp_path / 'spam-*.csv*') if kind == 'glob' else tmp_path
+
+    result = read_many(paths, workers=2, ordered=False, source=True,
+                       autocompress=True, as_list=True)
+
+    assert result[0][1] == HEADER
+    assert len(result) == 1 + sum(range(7))
+    assert all(isinstance(path, pathlib.Path) for path, _ in result)
+    assert sorted(tuple(row) for path, row in result[1:]) == \
+        sorted((str(i), 'sp\xe4m\r\n%d' % j) for i in range(7) for j in range(i))
+    assert all(path.name.startswith('spam-%s' % row[0]) for path, row in result[1:])
+
+
+def test_read_many_no_header(tmp_path, files):
+    empty = write_csv(tmp_path / 'empty.csv', [])
+
+    result = read_many([empty] + files[:2], header=False, autocompress=True, as_list=True)
+
+    assert result == [HEADER, HEADER, ['1', 'sp\xe4m\r\n0']]
+
+
+def test_read_many_header_mismatch(tmp_path, files):
+    write_csv(tmp_path / 'spam-9.csv', [['9', 'eggs']], header=['id', 'eggs'])
+
+    with pytest.raises(ValueError, match=r'spam-9\.csv'):
+        read_many(str(tmp_path / '*.csv'), as_list=True)
+
+
+def test_read_many_autocompress_default(files):
+    with pytest.warns(UserWarning, match=r'autocompress=False'):
+        with pytest.raises(UnicodeDecodeError):
+            read_many(files[:2], workers=1, as_list=True)
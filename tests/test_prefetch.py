@@ -0,0 +1,52 @@
+import io
+
+import pytest
+
+from csv23._prefetch import PrefetchStream
+
+DATA = bytes(range(256)) * 10
+
+
+@pytest.mark.parametrize('blocks, block_size', [(1, 1), (2, 7), (4, 4096)])
+def test_prefetch_stream(blocks, block_size):
+    raw = io.BytesIO(DATA)
+
+    with PrefetchStream(raw, blocks, block_size=block_size) as f:
+        assert f.readable()
+        assert f.read(3) == DATA[:3]
+        data = f.read1(5)
+        assert 0 < len(data) <= 5
+        assert f.read() == DATA[3 + len(data):]
+        assert f.read() == b''
+
+    assert raw.closed
+
+
+def test_prefetch_stream_readinto_close_early():
+    raw = io.BytesIO(DATA)
+    f = PrefetchStream(raw, 1, block_size=16, close=False)
+    buf = bytearray(20)
+
+    assert f.readinto(buf) == 20
+    assert bytes(buf) == DATA[:20]
+
+    f.close()
+    assert f.closed
+    assert not raw.closed
+
+
+def test_prefetch_stream_error():
+    class Raw(io.BytesIO):
+        def read(self, size=-1):
+            raise OSError('spam')
+
+    with PrefetchStream(Raw(), 2) as f:
+        with pytest.raises(OSError, match=r'spam'):
+            f.read()
+        assert f.read() == b''
+
+
+@pytest.mark.parametrize('blocks', [0, -1, None])
+def test_prefetch_stream_invalid(blocks):
+    with pytest.raises(ValueError, match=r'prefetch'):
+        PrefetchStream(io.BytesIO(), blocks)
@@ -5,7 +5,9 @@ import pytest
 import warnings
 
 from csv23.openers import open_reader
-from csv23.readers import reader, UnicodeTextReader, UnicodeBytesReader
+from csv23.readers import (reader, DictReader,
+                           UnicodeTextReader, UnicodeBytesReader,
+                           SplitReader, InterningReader)
 
 EXCEL = {}
 
@@ -25,9 +27,8 @@ LINE_FORMAT_ROW = [
     ('spam\r\n', SLASH, ['spam']),
     ('"spam\\\\eggs"\r\n', QSLASH, ['spam\\eggs']),
     ('spam\\\\eggs\r\n', QSLASH, ['spam\\eggs']),
-    pytest.param('spam\x1fspam spam\x1feggs, eggs\x1e', ASCII,
-                 ['spam', 'spam spam', 'eggs, eggs'],
-                 marks=pytest.mark.xfail(reason='FIXME')),
+    ('spam\x1fspam spam\x1feggs, eggs\x1e', ASCII, ['spam', 'spam spam', 'eggs, eggs']),
+    ('spam\x1fspam\r\nspam\x1f\x1e', ASCII, ['spam', 'spam\r\nspam', '']),
 ]
 
 
@@ -56,7 +57,12 @@ def test_open_reader(py2, filepath, encoding, line, fmtparams, expected, n=12):
 def test_reader(py2, inner_encoding, line, fmtparams, expected, n=12):
     encoding = inner_encoding
     if encoding is False:
-        expected_type = UnicodeTextReader if py2 else type(csv.reader([]))
+        if py2:
+            expected_type = UnicodeTextReader
+        elif fmtparams == ASCII:
+            expected_type = SplitReader
+        else:
+            expected_type = type(csv.reader([]))
     else:
         expected_type = UnicodeBytesReader
         try:
@@ -81,3 +87,84 @@ def test_reader(py2, inner_encoding, line, fmtparams, expected, n=12):
     assert list(r) == [expected] * (n - 1)
     with pytest.raises(StopIteration):
         next(r)
+
+
+@pytest.csv23.py3only
+@pytest.mark.parametrize('lines, fmtparams', [
+    (['spam,eggs\r\n', '\r\n', 'spam, "eggs\n', 'spam'], {'quoting': csv.QUOTE_NONE}),
+    (['spam;eggs\n', 'spam;;\n', '\n'], {'delimiter': ';', 'quotechar': None,
+                                         'quoting': csv.QUOTE_NONE}),
+    (['spam\x1feggs\x1e\x1e', 'sp', 'am\x1f\x1eeggs'], ASCII)])
+def test_split_reader(lines, fmtparams):
+    expected = list(csv.reader(lines, **fmtparams)) if fmtparams != ASCII else None
+    r = reader(lines, **fmtparams)
+    assert isinstance(r, SplitReader)
+    rows = list(r)
+    if expected is not None:
+        assert rows == expected
+    else:
+        assert rows == [['spam', 'eggs'], [], ['spam', ''], ['eggs']]
+    assert r.line_num == len(rows)
+    assert r.dialect.escapechar is None
+
+
+def test_split_reader_invalid():
+    with pytest.raises(ValueError, match=r'quoting'):
+        SplitReader([], 'excel')
+
+
+LINES = ['id,country,status\r\n', '1,DE,ok\r\n', '2,FR,ok\r\n',
+         '3,DE,fail\r\n', '4\r\n', '\r\n']
+
+
+@pytest.csv23.py3only
+@pytest.mark.parametrize('intern', ['auto', ['country', 2], [1, 'status']])
+def test_reader_intern(intern):
+    lines = [line.encode('ascii') for line in LINES]
+    rows = list(reader(lines, encoding='ascii', intern=intern, max_distinct=2))
+    assert rows == list(csv.reader(LINES))
+    countries = [r[1] for r in rows[1:4]]
+    assert countries[0] is countries[2]
+    assert rows[4] == ['4']
+
+
+@pytest.csv23.py3only
+def test_reader_intern_categories():
+    codes = {}
+    r = reader(LINES, intern=['country', 'status'], categories=codes)
+    assert isinstance(r, InterningReader)
+    assert next(r) == ['id', 'country', 'status']
+    assert codes == {'country': [], 'status': []}
+    assert list(r) == [['1', 0, 0], ['2', 1, 0], ['3', 0, 1], ['4'], []]
+    assert codes == {'country': ['DE', 'FR'], 'status': ['ok', 'fail']}
+    assert r.line_num == 6
+
+
+@pytest.csv23.py3only
+def test_dict_reader_intern_fieldnames():
+    codes = {}
+    r = DictReader(LINES[1:4], fieldnames=['id', 'country', 'status'],
+                   intern=['status'], categories=codes)
+    assert [row['status'] for row in r] == [0, 0, 1]
+    assert codes == {'status': ['ok', 'fail']}
+
+
+@pytest.csv23.py3only
+def test_reader_intern_max_distinct_categories():
+    r = reader(LINES, intern=['country'], categories={}, max_distinct=1)
+    with pytest.raises(ValueError, match=r"column 'country' has more than 1"):
+        list(r)
+
+
+@pytest.mark.parametrize('kwargs, match', [
+    ({'intern': 'country'}, r'intern'),
+    ({'categories': {}}, r'categories'),
+    ({'intern': 'auto', 'max_distinct': 0}, r'max_distinct')])
+def test_reader_intern_invalid(kwargs, match):
+    with pytest.raises(ValueError, match=match):
+        reader([], **kwargs)
+
+
+def test_reader_intern_unknown_column():
+    with pytest.raises(ValueError, match=r"'spam' not in header"):
+        next(reader(LINES, intern=['spam']))
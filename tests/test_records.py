@@ -0,0 +1,101 @@
+import csv
+import io
+import re
+
+import pytest
+
+from csv23._records import (get_dialect, check_lineterminator, iterblocks,
+                            iterrecords, prefiltered, RecordScanner)
+
+EXCEL = {}
+
+ESCAPE = {'escapechar': '\\'}
+
+SLASH = {'quoting': csv.QUOTE_NONE, 'escapechar': '\\'}
+
+SPACE = {'skipinitialspace': True}
+
+TEXT_FMTPARAMS = [
+    ('spam,eggs\r\n1,2\r\n', EXCEL),
+    ('spam,eggs\n1,2', EXCEL),
+    ('spam,eggs\r1,2\r\r\n', EXCEL),
+    ('"spam\r\nspam",eggs\r\n"1","""2\n"""\r\n', EXCEL),
+    ('sp"am,eggs\r\n"1"x,2\r\n', EXCEL),
+    ('"spam,eggs\r\n1,2\r\n', EXCEL),
+    ('"sp\\"am\r\n",eggs\r\n"1"\\,2\r\n', ESCAPE),
+    ('spam\\\neggs,spam\r\n\\\\\r\n', SLASH),
+    ('spam, "eggs,\r\n"\r\n', SPACE),
+]
+
+
+def split_lines(records):
+    return [l for r in records for l in io.StringIO(r, newline='')]  # noqa: E741
+
+
+@pytest.mark.parametrize('size', [1, 3, 1024])
+@pytest.mark.parametrize('text, fmtparams', TEXT_FMTPARAMS)
+def test_iterrecords(text, fmtparams, size):
+    dialect = get_dialect('excel', fmtparams)
+    expected = list(csv.reader(io.StringIO(text, newline=''), dialect))
+
+    records = list(iterrecords(io.StringIO(text, newline=''), dialect, size=size))
+
+    assert ''.join(records) == text
+    assert len(records) == len(expected)
+    assert list(csv.reader(split_lines(records), dialect)) == expected
+
+
+@pytest.mark.parametrize('size', [1, 3, 1024])
+@pytest.mark.parametrize('text, fmtparams', TEXT_FMTPARAMS)
+def test_record_scanner_count(text, fmtparams, size):
+    dialect = get_dialect('excel', fmtparams)
+    expected = list(csv.reader(io.StringIO(text, newline=''), dialect))
+    scanner = RecordScanner(dialect)
+
+    n, rest = 0, ''
+    for block, final in iterblocks(io.StringIO(text, newline=''), size):
+        block = rest + block
+        count, consumed = scanner.count(block, final)
+        n += count
+        rest = block[consumed:]
+
+    assert not rest
+    assert n == len(expected)
+
+
+@pytest.mark.parametrize('size', [1, 1024])
+def test_prefiltered(size):
+    text = 'key,value\r\n1,spam\r\n2,"spam\r\neggs"\r\n3,eggs\r\n'
+    dialect = get_dialect('excel', {})
+
+    lines = list(prefiltered(io.StringIO(text, newline=''), dialect, 'spam', size=size))
+
+    assert lines == ['key,value\r\n', '1,spam\r\n', '2,"spam\r\n', 'eggs"\r\n']
+
+
+@pytest.mark.parametrize('size', [1, 1024])
+@pytest.mark.parametrize('bar', ['bar', '"bar"'], ids=['unquoted', 'quoted'])
+def test_prefiltered_anchored(size, bar):
+    text = 'id,x\r\nfoo,1\r\n%s,2\r\nfoo,3\r\n' % bar
+    dialect = get_dialect('excel', {})
+
+    lines = list(prefiltered(io.StringIO(text, newline=''), dialect,
+                             re.compile('^foo'), size=size))
+
+    assert lines == ['id,x\r\n', 'foo,1\r\n', 'foo,3\r\n']
+
+
+@pytest.mark.parametrize('dialect, fmtparams, supported', [
+    ('excel', {}, True),
+    ('excel', {'lineterminator': '\n', 'quoting': csv.QUOTE_NONE}, True),
+    ('excel', {'lineterminator': ';'}, True),
+    ('ascii', {}, False),
+    ('ascii', {'escapechar': '\\'}, True)])
+def test_check_lineterminator(dialect, fmtparams, supported):
+    dialect = get_dialect(dialect, fmtparams)
+
+    if supported:
+        check_lineterminator(dialect, 'spam')
+    else:
+        with pytest.raises(ValueError, match=r"lineterminator not supported by spam: '\\x1e'"):
+            check_lineterminator(dialect, 'spam')
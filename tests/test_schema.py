@@ -0,0 +1,68 @@
+import datetime
+import io
+
+import pytest
+
+from csv23 import write_csv, infer_schema
+from csv23.schema import Column
+
+HEADER = ['id', 'price', 'day', 'ok', 'name', 'mixed', 'empty']
+
+ROWS = [[str(i), '%d.5' % i if i % 5 else '', '2026-10-%02d' % (i % 28 + 1),
+         'True' if i % 2 else 'false', 'sp\xe4m\r\n%d' % i, str(i) if i < 500 else 'x', '']
+        for i in range(1000)]
+
+EXPECTED = [Column('id', int, False, 3),
+            Column('price', float, True, 5),
+            Column('day', datetime.date, False, 10),
+            Column('ok', bool, False, 5),
+            Column('name', str, False, 9),
+            Column('mixed', str, False, 3),
+            Column('empty', str, True, 0)]
+
+
+@pytest.mark.parametrize('sample_strategy', ['head', 'stride'])
+@pytest.mark.parametrize('filename', ['spam.csv', 'spam.csv.gz'])
+def test_infer_schema(mocker, tmp_path, filename, sample_strategy):
+    mocker.patch('csv23.schema.SAMPLE_BLOCK_SIZE', 64)
+    target = write_csv(tmp_path / filename, ROWS, header=HEADER, autocompress=True)
+
+    schema = infer_schema(target, sample_strategy=sample_strategy, autocompress=True)
+
+    assert schema == EXPECTED
+
+
+@pytest.mark.parametrize('sample_rows', [16, 100])
+def test_infer_schema_stride(tmp_path, sample_rows):
+    target = write_csv(tmp_path / 'spam.csv', ROWS, header=HEADER)
+
+    head = infer_schema(target, sample_rows=sample_rows)
+    stride = infer_schema(target, sample_rows=sample_rows, sample_strategy='stride')
+
+    assert head[5] == Column('mixed', int, False, len(str(sample_rows - 1)))
+    assert stride[5] == Column('mixed', str, False, 3)
+
+
+def test_infer_schema_invalid():
+    with pytest.raises(ValueError, match=r'sample_strategy'):
+        infer_schema(io.BytesIO(b'spam\r\n'), sample_strategy='tail')
+
+    with pytest.raises(ValueError, match=r'missing header'):
+        infer_schema(io.BytesIO(b''))
+
+
+def test_infer_schema_no_rows():
+    assert infer_schema(io.BytesIO(b'spam,eggs\r\n')) == [Column('spam', str, False, 0),
+                                                        Column('eggs', str, False, 0)]
+
+
+@pytest.mark.parametrize('column, value, expected', [
+    (Column('id', int, True, 1), '', None),
+    (Column('id', int, False, 1), '42', 42),
+    (Column('price', float, False, 1), '1.5', 1.5),
+    (Column('day', datetime.date, False, 10), '2026-10-19', datetime.date(2026, 10, 19)),
+    (Column('ok', bool, False, 5), 'FALSE', False),
+    (Column('name', str, False, 0), '', ''),
+    (Column('name', str, True, 0), '', None)])
+def test_column_parse(column, value, expected):
+    assert column.parse(value) == expected
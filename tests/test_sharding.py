@@ -0,0 +1,120 @@
+import hashlib
+
+import pytest
+
+from csv23 import read_csv, RollingWriter, PartitionedWriter
+
+HEADER = ['id', 'name']
+
+ROWS = [[str(i), 'sp\xe4m\r\n%d' % i] for i in range(25)]
+
+
+@pytest.mark.parametrize('suffix', ['.csv', '.csv.gz', '.csv.bz2', '.csv.xz'])
+@pytest.mark.parametrize('method', ['writerow', 'writerows'])
+def test_rolling_writer_max_rows(tmp_path, suffix, method):
+    pattern = str(tmp_path / ('spam-{:03d}' + suffix))
+
+    with RollingWriter(pattern, max_rows=10, header=HEADER,
+                       autocompress=True, hash_name='sha256') as writer:
+        if method == 'writerow':
+            for row in ROWS:
+                writer.writerow(row)
+        else:
+            writer.writerows(ROWS[:3])
+            writer.writerows(iter(ROWS[3:]))
+
+    manifest = writer.manifest
+    assert [s.path.name for s in manifest] == ['spam-%03d%s' % (i, suffix) for i in range(3)]
+    assert [s.rows for s in manifest] == [10, 10, 5]
+    rows = []
+    for shard in manifest:
+        assert shard.size == shard.path.stat().st_size
+        assert shard.hash == hashlib.sha256(shard.path.read_bytes()).hexdigest()
+        shard_rows = read_csv(shard.path, autocompress=True, as_list=True)
+        assert shard_rows[0] == HEADER
+        rows.extend(shard_rows[1:])
+    assert rows == ROWS
+
+
+@pytest.mark.parametrize('buffer_size', [None, 16])
+def test_rolling_writer_max_bytes(tmp_path, buffer_size):
+    pattern = str(tmp_path / 'spam-{}.csv')
+
+    with RollingWriter(pattern, max_bytes=50, buffer_size=buffer_size) as writer:
+        writer.writerows(ROWS)
+
+    manifest = writer.manifest
+    assert len(manifest) > 1
+    assert all(s.hash is None for s in manifest)
+    assert all(s.size >= 50 for s in manifest[:-1])
+    assert sum(s.rows for s in manifest) == len(ROWS)
+    assert [r for s in manifest for r in read_csv(s.path, as_list=True)] == ROWS
+
+
+def test_rolling_writer_empty(tmp_path):
+    writer = RollingWriter(str(tmp_path / 'spam-{}.csv'), max_rows=10, header=HEADER)
+
+    manifest = writer.close()
+
+    assert [(s.path.name, s.rows) for s in manifest] == [('spam-0.csv', 0)]
+    assert manifest[0].path.read_bytes() == b'id,name\r\n'
+
+
+def test_rolling_writer_invalid(tmp_path):
+    with pytest.raises(ValueError, match=r'max_rows or max_bytes'):
+        RollingWriter(str(tmp_path / 'spam-{}.csv'))
+
+
+@pytest.mark.parametrize('kwargs, match', [
+    ({'max_rows': 0}, r'max_rows must be None or a positive int: 0'),
+    ({'max_rows': -1}, r'max_rows must be None or a positive int: -1'),
+    ({'max_rows': True}, r'max_rows must be None or a positive int: True'),
+    ({'max_rows': 1.5}, r'max_rows must be None or a positive int: 1\.5'),
+    ({'max_bytes': 0}, r'max_bytes must be None or a positive int: 0'),
+    ({'max_rows': 10, 'max_bytes': -1}, r'max_bytes must be None or a positive int: -1')])
+def test_rolling_writer_invalid_limit(tmp_path, kwargs, match):
+    with pytest.raises(ValueError, match=match):
+        RollingWriter(str(tmp_path / 'spam-{}.csv'), **kwargs)
+
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.parametrize('max_open', [1, 2, 64])
+@pytest.mark.parametrize('suffix', ['.csv', '.csv.gz', '.csv.bz2', '.csv.xz'])
+def test_partitioned_writer(tmp_path, suffix, max_open):
+    rows = [[str(i % 3), 'sp\xe4m\r\n%d' % i] for i in range(50)]
+
+    with PartitionedWriter(tmp_path, partition_by='id', filename='part' + suffix,
+                           header=HEADER, autocompress=True, hash_name='md5',
+                           max_open=max_open, buffer_rows=4, max_buffered=6) as writer:
+        writer.writerows(rows)
+
+    manifest = writer.manifest
+    assert sorted(manifest) == ['0', '1', '2']
+    for key, shard in manifest.items():
+        assert shard.path == tmp_path / ('id=%s' % key) / ('part' + suffix)
+        assert shard.rows == len([r for r in rows if r[0] == key])
+        assert shard.size == shard.path.stat().st_size
+        assert shard.hash == hashlib.md5(shard.path.read_bytes()).hexdigest()
+        assert read_csv(shard.path, autocompress=True, as_list=True) == \
+            [HEADER] + [r for r in rows if r[0] == key]
+
+
+@pytest.mark.parametrize('partition_by, expected', [
+    (0, ['%2E%2E', '_', 'a%2Fb', 'a%5Fb']),
+    (lambda r: r[0], ['%2E%2E', '_', 'a%2Fb', 'a%5Fb'])])
+def test_partitioned_writer_keys(tmp_path, partition_by, expected):
+    rows = [['a/b', 'x'], ['..', 'y'], ['', 'z'], ['a_b', 'w']]
+
+    with PartitionedWriter(tmp_path, partition_by=partition_by) as writer:
+        for row in rows:
+            writer.writerow(row)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == expected
+    assert sorted(s.rows for s in writer.manifest.values()) == [1, 1, 1, 1]
+    assert all(s.hash is None for s in writer.manifest.values())
+
+
+def test_partitioned_writer_invalid(tmp_path):
+    with pytest.raises(ValueError, match=r'spam'):
+        PartitionedWriter(tmp_path, partition_by='spam', header=HEADER)
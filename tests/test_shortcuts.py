@@ -1,4 +1,6 @@
 import contextlib
+import csv
+import dataclasses
 import functools
 import hashlib
 import io
@@ -15,7 +17,8 @@ if pytest.csv23.PY2:
 else:
     import pathlib
 
-from csv23.shortcuts import read_csv, write_csv
+from csv23.shortcuts import read_csv, write_csv, count_rows, tail
+from csv23.stats import Stats
 
 ROWS = [[u'sp\xe4m', 'eggs']]
 
@@ -342,3 +345,401 @@ def test_autocompress_warning(tmp_path):
 
     with pytest.warns(UserWarning, match=r'suffix'):
         read_csv(filename)
+
+
+@pytest.csv23.py3only
+@pytest.mark.parametrize(
+    'src, encoding, prefilter, expected',
+    [(H_BYTES + BYTES + b'spam,spam\r\n', ENCODING, 'eggs', [HEADER] + ROWS),
+     (H_BYTES + BYTES, ENCODING, u'sp\xe4m'.encode(ENCODING), [HEADER] + ROWS),
+     (H_STRING + STRING, None, 'nonmatch', [HEADER]),
+     (H_STRING + STRING, None, b'eggs', (TypeError, r'need encoding'))])
+def test_read_csv_prefilter(src, encoding, prefilter, expected):
+    buf = (io.BytesIO if isinstance(src, bytes) else io.StringIO)(src)
+
+    kwargs = {'encoding': encoding, 'prefilter': prefilter, 'as_list': True}
+
+    if isinstance(expected, tuple):
+        with pytest.raises(expected[0], match=expected[1]):
+            read_csv(buf, **kwargs)
+        return
+
+    assert read_csv(buf, **kwargs) == expected
+
+
+@pytest.csv23.py3only
+@pytest.mark.parametrize(
+    'src, encoding, expected',
+    [(b'', ENCODING, 0),
+     (BYTES, ENCODING, 1),
+     (H_BYTES + BYTES, ENCODING, 2),
+     (H_BYTES + b'"spam\r\nspam",eggs\r\n', ENCODING, 2),
+     (H_BYTES + b'spam,eggs', ENCODING, 2),
+     ((H_STRING + STRING).encode('utf-16'), 'utf-16', 2),
+     (H_STRING + '"\nspam\n",eggs\n', None, 2),
+     (BYTES, None, (TypeError, r'need encoding')),
+     (STRING, ENCODING, (TypeError, r'bytes-like object expected'))])
+def test_count_rows_iobase(src, encoding, expected):
+    buf = (io.BytesIO if isinstance(src, bytes) else io.StringIO)(src)
+
+    if isinstance(expected, tuple):
+        with pytest.raises(expected[0], match=expected[1]):
+            count_rows(buf, encoding=encoding)
+        return
+
+    assert count_rows(buf, encoding=encoding) == expected
+    assert not buf.closed
+
+
+@pytest.csv23.py3only
+@pytest.mark.parametrize('filename', ['spam.csv', 'spam.csv.gz', 'spam.csv.xz'])
+def test_count_rows_filename(tmp_path, filename):
+    rows = [['spam', 'eggs\r\neggs'], ['"spam"', 'eggs']] * 100
+    target = write_csv(tmp_path / filename, rows, header=HEADER, autocompress=True)
+
+    assert count_rows(target, autocompress=True) == len(rows) + 1
+
+
+TAIL_ROWS = [[str(i), v] for i, v in enumerate(['spam', 'eggs\r\neggs', '"spam"',
+                                                'spam, eggs', ''] * 200)]
+
+
+@pytest.csv23.py3only
+@pytest.mark.parametrize('n', [0, 1, 7, 999, 1000, 1001])
+@pytest.mark.parametrize(
+    'filename, encoding',
+    [('spam.csv', ENCODING),
+     ('spam.csv', 'utf-16'),
+     ('spam.csv.gz', ENCODING)])
+def test_tail(mocker, tmp_path, filename, encoding, n):
+    target = write_csv(tmp_path / filename, TAIL_ROWS, header=HEADER,
+                       encoding=encoding, autocompress=True)
+
+    mocker.patch('csv23.shortcuts.TAIL_BLOCK_SIZE', 16)
+
+    header, rows = tail(target, n, encoding=encoding, autocompress=True)
+
+    assert header == HEADER
+    assert rows == (TAIL_ROWS[-n:] if n else [])
+
+
+@pytest.csv23.py3only
+@pytest.mark.parametrize(
+    'src, expected',
+    [(b'', (None, [])),
+     (H_BYTES, (HEADER, [])),
+     (H_BYTES + BYTES, (HEADER, ROWS)),
+     (H_BYTES + b'spam,eggs', (HEADER, [['spam', 'eggs']]))])
+def test_tail_iobase(src, expected):
+    assert tail(io.BytesIO(src), encoding=ENCODING) == expected
+
+
+class EscapeDialect(csv.excel):
+
+    escapechar = '\\'
+
+
+@pytest.csv23.py3only
+@pytest.mark.parametrize('n', [1, 2, 7, 226, 1999, 2000, 2001])
+@pytest.mark.parametrize('dialect', ['excel', EscapeDialect])
+def test_tail_quoted_newlines(mocker, n, dialect):
+    rows = [[str(i), 'msg line\nmore, text'] for i in range(2000)]
+    with io.BytesIO() as f:
+        write_csv(f, rows, header=['id', 'msg'], dialect=dialect, encoding=ENCODING)
+        src = f.getvalue()
+
+    mocker.patch('csv23.shortcuts.TAIL_BLOCK_SIZE', 16)
+
+    header, result = tail(io.BytesIO(src), n, dialect=dialect, encoding=ENCODING)
+
+    assert header == ['id', 'msg']
+    assert result == rows[-n:]
+
+
+@pytest.csv23.py3only
+@pytest.mark.parametrize('func, kwargs, name', [
+    (count_rows, {}, r'count_rows\(\)'),
+    (tail, {'n': 1}, r'tail\(\)'),
+    (read_csv, {'prefilter': '3'}, r'prefilter')])
+def test_records_lineterminator_invalid(func, kwargs, name):
+    src = b'a\x1fb\x1e1\x1f2\x1e3\x1f4\x1e'
+    assert read_csv(io.BytesIO(src), dialect='ascii', encoding='ascii',
+                    as_list=True) == [['a', 'b'], ['1', '2'], ['3', '4']]
+
+    with pytest.raises(ValueError, match=r'lineterminator not supported by %s' % name):
+        func(io.BytesIO(src), dialect='ascii', encoding='ascii', **kwargs)
+
+
+@pytest.csv23.py3only
+@pytest.mark.parametrize('fsync', [None, 'end', 8])
+@pytest.mark.parametrize('filename', ['spam.csv', 'spam.csv.bz2', 'spam.csv.gz', 'spam.csv.xz'])
+def test_write_csv_atomic(mocker, tmp_path, filename, fsync):
+    target = tmp_path / filename
+    fsync_mock = mocker.patch('os.fsync', autospec=True)
+    rows = ROWS * 10
+
+    result = write_csv(target, rows, header=HEADER, autocompress=True,
+                       atomic=True, fsync=fsync)
+
+    assert result == target
+    assert os.listdir(str(tmp_path)) == [filename]
+    assert read_csv(target, as_list=True, autocompress=True) == [HEADER] + rows
+    if fsync is None:
+        fsync_mock.assert_not_called()
+    elif fsync == 'end':
+        assert fsync_mock.call_count == 2  # file and directory
+    else:
+        assert fsync_mock.call_count > 2
+
+
+@pytest.csv23.py3only
+def test_write_csv_atomic_error(tmp_path):
+    target = tmp_path / 'spam.csv'
+    write_csv(target, ROWS)
+
+    def iterrows():
+        yield HEADER
+        raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        write_csv(target, iterrows(), atomic=True)
+
+    assert os.listdir(str(tmp_path)) == ['spam.csv']
+    assert target.read_bytes() == BYTES
+
+
+@pytest.csv23.py3only
+@pytest.mark.parametrize('fsync', ['every_n_bytes', 0, True, False])
+def test_write_csv_fsync_invalid(fsync):
+    with pytest.raises(ValueError, match=r'fsync'):
+        write_csv(None, ROWS, fsync=fsync)
+
+
+@pytest.csv23.py3only
+@pytest.mark.parametrize('stats', [None, True])
+@pytest.mark.parametrize('filename', ['spam.csv', 'spam.csv.gz', 'spam.csv.bz2', 'spam.csv.xz'])
+def test_read_csv_prefetch(tmp_path, filename, stats):
+    rows = [[str(i), u'sp\xe4m\r\n'] for i in range(1000)]
+    target = write_csv(tmp_path / filename, rows, header=HEADER, autocompress=True)
+
+    result = read_csv(target, autocompress=True, prefetch=2, stats=stats)
+
+    assert next(result) == HEADER
+    assert list(result) == rows
+
+    with target.open('rb') as f:
+        if filename == 'spam.csv':
+            assert read_csv(f, prefetch=1, stats=stats, as_list=True) == [HEADER] + rows
+            assert not f.closed
+
+
+@pytest.csv23.py3only
+def test_read_csv_prefetch_text():
+    with io.StringIO(STRING, newline='') as f:
+        assert read_csv(f, encoding=None, prefetch=2, as_list=True) == ROWS
+        assert not f.closed
+
+
+@pytest.csv23.py3only
+@pytest.mark.parametrize('stats', [None, True])
+@pytest.mark.parametrize('buffer_size', [None, 16, 2 ** 20])
+@pytest.mark.parametrize('filename', ['spam.csv', 'spam.csv.gz', 'spam.csv.bz2', 'spam.csv.xz'])
+def test_csv_buffer_size(tmp_path, filename, buffer_size, stats):
+    rows = [[str(i), u'sp\xe4m\r\n'] for i in range(1000)]
+    target = write_csv(tmp_path / filename, rows, header=HEADER, autocompress=True,
+                       stats=stats, buffer_size=buffer_size)
+
+    result = read_csv(target, autocompress=True, stats=stats, buffer_size=buffer_size)
+
+    assert next(result) == HEADER
+    assert list(result) == rows
+
+    with target.open('rb') as f:
+        if filename == 'spam.csv':
+            assert read_csv(f, buffer_size=buffer_size, as_list=True) == [HEADER] + rows
+            assert not f.closed
+
+
+@pytest.csv23.py3only
+@pytest.mark.parametrize('chunksize', [1, 2, 3, 1000])
+def test_read_csv_chunksize(tmp_path, chunksize):
+    rows = [[str(i), 'spam'] for i in range(10)]
+    target = write_csv(tmp_path / 'spam.csv', rows)
+
+    chunks = list(read_csv(target, chunksize=chunksize))
+
+    assert all(len(c) == chunksize for c in chunks[:-1])
+    assert 0 < len(chunks[-1]) <= chunksize
+    assert [r for c in chunks for r in c] == rows
+    assert read_csv(target, chunksize=chunksize, as_list=True) == chunks
+
+
+@pytest.csv23.py3only
+@pytest.mark.parametrize('chunksize', [0, -1, 1.5, '2'])
+def test_read_csv_chunksize_invalid(chunksize):
+    with pytest.raises(ValueError, match=r'chunksize'):
+        read_csv(io.BytesIO(BYTES), chunksize=chunksize)
+
+
+@pytest.csv23.py3only
+@pytest.mark.parametrize('kind', ['path', 'bytes', 'text', 'prefetch'])
+def test_read_csv_quarantine(tmp_path, kind):
+    data = b'a,b\r\n1,2\r\n3\r\n4,\xff\r\n5,6\r\n'
+    path = tmp_path / 'spam.csv'
+    path.write_bytes(data)
+    kwargs = {}
+    if kind == 'bytes':
+        file = io.BytesIO(data)
+    elif kind == 'text':
+        file, kwargs['encoding'] = io.StringIO(data.decode('latin-1'), newline=''), None
+    else:
+        file = path
+        if kind == 'prefetch':
+            kwargs['prefetch'] = 1
+    bad = []
+
+    rows = read_csv(file, as_list=True, on_error='quarantine', quarantine=bad.append, **kwargs)
+
+    if kind == 'text':
+        assert rows == [['a', 'b'], ['1', '2'], ['4', '\xff'], ['5', '6']]
+        assert bad == [(None, 3, 'expected 2 fields, saw 1', '3\r\n')]
+    else:
+        assert rows == [['a', 'b'], ['1', '2'], ['5', '6']]
+        offsets = [None, None] if kind == 'prefetch' else [10, 13]
+        assert bad == [(offsets[0], 3, 'expected 2 fields, saw 1', '3\r\n'),
+                       (offsets[1], 4, 'undecodable bytes', '4,\udcff\r\n')]
+
+
+@pytest.fixture
+def field_size_limit():
+    limit = csv.field_size_limit()
+    yield csv.field_size_limit
+    csv.field_size_limit(limit)
+
+
+@pytest.csv23.py3only
+@pytest.mark.parametrize('kind', ['path', 'bytes', 'text'])
+def test_read_csv_quarantine_multiline(tmp_path, field_size_limit, kind):
+    data = b'a,b\r\n1,"xxxxxxxx\r\nyyyyyyyyy\r\nzz",3\r\n4,5\r\n'
+    path = tmp_path / 'spam.csv'
+    path.write_bytes(data)
+    kwargs = {'encoding': 'ascii'}
+    if kind == 'bytes':
+        file = io.BytesIO(data)
+    elif kind == 'text':
+        file, kwargs['encoding'] = io.StringIO(data.decode('ascii'), newline=''), None
+    else:
+        file = path
+    bad = []
+    field_size_limit(10)
+
+    rows = read_csv(file, as_list=True, on_error='quarantine', quarantine=bad.append, **kwargs)
+
+    assert rows == [['a', 'b'], ['4', '5']]
+    assert bad == [(None if kind == 'text' else 5, 2, 'field larger than field limit (10)',
+                    '1,"xxxxxxxx\r\nyyyyyyyyy\r\nzz",3\r\n')]
+
+
+@pytest.csv23.py3only
+def test_read_csv_quarantine_invalid():
+    with pytest.raises(ValueError, match=r'on_error'):
+        read_csv(io.BytesIO(BYTES), on_error='skip')
+
+    with pytest.raises(ValueError, match=r'requires on_error'):
+        read_csv(io.BytesIO(BYTES), quarantine=print)
+
+    with pytest.raises(ValueError, match=r'prefilter'):
+        read_csv(io.BytesIO(BYTES), prefilter='spam', on_error='quarantine', quarantine=print)
+
+
+@pytest.csv23.py3only
+@pytest.mark.parametrize('kind', ['path', 'bytes', 'text', 'gzip', 'stats'])
+def test_read_csv_max_field_size(tmp_path, kind):
+    blob = 'sp\xe4m' * 1000
+    path = tmp_path / 'spam.csv'
+    rows = [['1', blob], ['2', 'eggs']]
+    target = write_csv(path.with_suffix('.csv.gz') if kind == 'gzip' else path, rows,
+                       autocompress=True)
+    kwargs = {'stats': Stats()} if kind == 'stats' else {}
+    if kind == 'bytes':
+        file = io.BytesIO(path.read_bytes())
+    elif kind == 'text':
+        file, kwargs['encoding'] = io.StringIO(path.read_text(encoding='utf-8'),
+                                               newline=''), None
+    else:
+        file = target
+        kwargs['autocompress'] = True
+
+    result = read_csv(file, as_list=True, max_field_size=100, **kwargs)
+
+    assert result[1] == ['2', 'eggs']
+    assert result[0][1].temporary
+    assert result[0][1].read() == blob
+
+    if kind in ('path', 'stats'):
+        sliced = read_csv(file, max_field_size=100, large_fields='slice', **kwargs)
+        (_, value), _ = sliced
+        assert not value.temporary
+        assert (value.path, value.offset) == (file, 2)
+        assert value.read() == blob
+
+
+@pytest.csv23.py3only
+def test_read_csv_max_field_size_invalid(tmp_path):
+    with pytest.raises(ValueError, match=r'large_fields'):
+        read_csv(io.BytesIO(BYTES), max_field_size=100, large_fields='mmap')
+
+    with pytest.raises(ValueError, match=r'requires an uncompressed'):
+        read_csv(io.BytesIO(BYTES), max_field_size=100, large_fields='slice')
+
+    with pytest.raises(ValueError, match=r'requires an uncompressed'):
+        read_csv(tmp_path / 'spam.csv.gz', max_field_size=100, large_fields='slice',
+                 autocompress=True)
+
+
+@pytest.csv23.py3only
+def test_read_csv_intern(tmp_path):
+    path = tmp_path / 'spam.csv'
+    write_csv(path, [['1', 'DE'], ['2', 'FR'], ['3', 'DE']], header=['id', 'country'])
+
+    rows = read_csv(path, as_list=True, intern='auto')
+
+    assert rows == [['id', 'country'], ['1', 'DE'], ['2', 'FR'], ['3', 'DE']]
+    assert rows[1][1] is rows[3][1]
+
+    codes = {}
+    chunks = list(read_csv(path, intern=[1], categories=codes, chunksize=2))
+    assert chunks == [[['id', 'country'], ['1', 0]], [['2', 1], ['3', 0]]]
+    assert codes == {1: ['DE', 'FR']}
+
+
+@pytest.csv23.py3only
+def test_read_csv_intern_invalid():
+    with pytest.raises(ValueError, match=r'categories'):
+        read_csv(io.BytesIO(BYTES), categories={})
+
+    with pytest.raises(ValueError, match=r'max_field_size'):
+        read_csv(io.BytesIO(BYTES), intern='auto', max_field_size=100)
+
+
+@pytest.csv23.py3only
+@pytest.mark.parametrize('header, expected', [
+    (None, 'x,y\r\n1,2\r\n3,4\r\n'),
+    (['X', 'Y'], 'X,Y\r\n1,2\r\n3,4\r\n'),
+    (False, '1,2\r\n3,4\r\n')])
+def test_write_csv_dataclass(header, expected):
+    point_cls = dataclasses.make_dataclass('Point', ['x', 'y'], slots=True)
+    rows = [point_cls(1, 2), point_cls(3, 4)]
+    stats = Stats()
+
+    result = write_csv(None, iter(rows), header=header, encoding=None,
+                       rowtype='dataclass', stats=stats)
+
+    assert result == expected
+    assert stats.rows == 2
+
+
+@pytest.csv23.py3only
+def test_write_csv_rowtype_invalid():
+    with pytest.raises(ValueError, match=r'rowtype'):
+        write_csv(None, [], encoding=None, rowtype='dict')
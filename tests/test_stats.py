@@ -0,0 +1,121 @@
+import pytest
+
+from csv23 import open_reader, open_writer, read_csv, write_csv, Stats
+
+ROWS = [['spam', 'eggs'], ['1', '2'], ['3', '4']]
+
+DATA = b'spam,eggs\r\n1,2\r\n3,4\r\n'
+
+
+def test_open_writer_reader_stats(filepath):
+    filename = str(filepath)
+
+    with open_writer(filename, stats=True) as w:
+        assert isinstance(w.stats, Stats)
+        w.writerow(ROWS[0])
+        w.writerows(ROWS[1:])
+        assert w.dialect.delimiter == ','
+
+    assert w.stats.rows == 3
+    assert w.stats.bytes_out == len(DATA)
+    assert w.stats.bytes_in == 0
+    assert sorted(w.stats.times) == ['encode', 'format', 'io']
+    assert filepath.read_bytes() == DATA
+
+    stats = Stats()
+    with open_reader(filename, stats=stats) as r:
+        assert r.stats is stats
+        assert list(r) == ROWS
+        assert r.line_num == 3
+
+    assert stats.rows == 3
+    assert stats.bytes_in == len(DATA)
+    assert sorted(stats.times) == ['decode', 'io', 'parse']
+    assert all(t >= 0 for t in stats.times.values())
+
+
+def test_open_writer_stats_dict(filepath):
+    with open_writer(str(filepath), rowtype='dict', fieldnames=ROWS[0],
+                     stats=True) as w:
+        w.writeheader()
+        w.writerows([dict(zip(ROWS[0], r)) for r in ROWS[1:]])
+
+    assert w.stats.rows == 3
+    assert filepath.read_bytes() == DATA
+
+
+@pytest.mark.parametrize('suffix', ['.csv', '.csv.gz', '.csv.bz2', '.csv.xz'])
+def test_roundtrip_csv_stats(tmp_path, suffix):
+    target = tmp_path / ('spam' + suffix)
+    stats = Stats()
+
+    result = write_csv(target, ROWS[1:], header=ROWS[0],
+                       autocompress=True, stats=stats)
+
+    assert stats.rows == 3
+    assert stats.bytes_out == result.stat().st_size
+    expected = ['compress'] if suffix != '.csv' else []
+    assert sorted(stats.times) == sorted(['encode', 'format', 'io'] + expected)
+
+    stats = Stats()
+
+    assert read_csv(target, autocompress=True, as_list=True, stats=stats) == ROWS
+
+    assert stats.rows == 3
+    assert stats.bytes_in == result.stat().st_size
+    assert sorted(stats.times) == sorted(['decode', 'io', 'parse'] + expected)
+
+
+@pytest.mark.parametrize('atomic', [False, True])
+@pytest.mark.parametrize('suffix', ['.csv', '.csv.gz', '.csv.xz'])
+def test_write_csv_stats_times(tmp_path, suffix, atomic):
+    stats = Stats()
+    rows = [[str(i), 'sp\xe4m' * (i % 10)] for i in range(20000)]
+
+    write_csv(tmp_path / ('spam' + suffix), rows, autocompress=True,
+              atomic=atomic, stats=stats)
+
+    assert all(t >= 0 for t in stats.times.values()), stats.times
+
+
+def test_write_csv_stats_none():
+    stats = Stats()
+    assert write_csv(None, ROWS, stats=stats) == DATA
+    assert stats.rows == 3
+    assert stats.bytes_out == len(DATA)
+
+
+def test_stats_progress(filepath):
+    calls = []
+    stats = Stats(progress=lambda s: calls.append(s.rows), every_rows=2)
+
+    write_csv(filepath, ([str(i)] for i in range(5)), stats=stats)
+
+    assert calls == [2, 4]
+
+    calls = []
+    stats = Stats(progress=lambda s: calls.append(s.bytes_in), every_bytes=4)
+
+    assert len(read_csv(filepath, as_list=True, stats=stats)) == 5
+
+    assert calls == [15]
+
+
+def test_stats_invalid():
+    with pytest.raises(ValueError, match=r'every_rows or every_bytes'):
+        Stats(progress=print)
+
+    with pytest.raises(TypeError, match=r'csv23.Stats'):
+        read_csv('spam.csv', stats=object())
+
+
+def test_stats_prefetch(tmp_path):
+    target = write_csv(tmp_path / 'spam.csv.gz', ROWS, autocompress=True)
+    stats = Stats()
+
+    assert read_csv(target, autocompress=True, prefetch=2, stats=stats, as_list=True) == ROWS
+
+    assert stats.rows == 3
+    assert stats.bytes_in == target.stat().st_size
+    assert sorted(stats.times) == ['compress', 'decode', 'io', 'parse', 'prefetch']
+    assert all(t >= 0 for t in stats.times.values())
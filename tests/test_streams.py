@@ -0,0 +1,61 @@
+import gzip
+import io
+
+import pytest
+
+import csv23
+from csv23._streams import open_text, wrap_text
+
+TEXT = u'sp\xe4m,eggs\r\n' * 100
+
+
+@pytest.mark.parametrize('buffer_size, chunk_size', [(None, 8192), (16, 16), (2 ** 20, 2 ** 20)])
+@pytest.mark.parametrize('open_module', [None, gzip])
+def test_open_text(tmp_path, open_module, buffer_size, chunk_size):
+    path = tmp_path / 'spam.csv'
+
+    with open_text(path, 'w', 'utf-8', open_module=open_module,
+                   buffer_size=buffer_size) as f:
+        assert f._CHUNK_SIZE == chunk_size
+        f.write(TEXT)
+
+    with open_text(path, 'r', 'utf-8', open_module=open_module,
+                   buffer_size=buffer_size) as f:
+        binary = f.buffer if open_module is None else f.buffer._inner
+        assert f.read() == TEXT
+
+    assert binary.closed
+
+
+def test_wrap_text_prefetch_keeps_open():
+    binary = io.BytesIO(TEXT.encode('utf-8'))
+
+    with wrap_text(binary, 'r', 'utf-8', prefetch=2, buffer_size=64) as f:
+        assert f.read() == TEXT
+
+    assert not binary.closed
+
+
+@pytest.mark.parametrize('buffer_size', [0, 1, -1, True, 1.5, '16'])
+@pytest.mark.parametrize('func', ['open_text', 'open_reader', 'open_writer',
+                                  'read_csv', 'write_csv', 'iterrows'])
+def test_buffer_size_invalid(tmp_path, func, buffer_size):
+    target = tmp_path / 'spam.csv'
+    target.write_bytes(b'spam,eggs\r\n')
+    match = r'buffer_size must be None or an int greater than 1: %r' % buffer_size
+    match = match.replace('.', r'\.')
+
+    with pytest.raises(ValueError, match=match):
+        if func == 'open_text':
+            open_text(str(target), 'r', 'utf-8', buffer_size=buffer_size)
+        elif func in ('open_reader', 'open_writer'):
+            with getattr(csv23, func)(str(target), buffer_size=buffer_size):
+                pass
+        elif func == 'write_csv':
+            csv23.write_csv(target, [], buffer_size=buffer_size)
+        elif func == 'iterrows':
+            next(csv23.iterrows(str(target), buffer_size=buffer_size))
+        else:
+            csv23.read_csv(target, buffer_size=buffer_size)
+
+    assert target.read_bytes() == b'spam,eggs\r\n'
@@ -1,14 +1,19 @@
 from __future__ import unicode_literals
 
+import collections
 import csv
 import io
+import itertools
 import sys
 
 import pytest
 
 from csv23._common import is_8bit_clean
 from csv23.openers import open_writer
-from csv23.writers import writer, UnicodeTextWriter, UnicodeBytesWriter
+from csv23 import writers
+from csv23.writers import (writer, DictWriter,
+                           UnicodeTextWriter, UnicodeBytesWriter,
+                           QuoteFreeWriter)
 
 if not pytest.csv23.PY2:
     from csv23.writers import _UnicodeTextWriter
@@ -113,3 +118,89 @@ def test_writer(mocker, py2, filepath, inner_encoding,
 
     assert line == expected * n
     assert written == write_n
+
+
+@pytest.csv23.py3only
+@pytest.mark.parametrize('fmtparams', [EXCEL, QSLASH, SLASH, ASCII,
+                                       {'delimiter': ' '}, {'lineterminator': '\n'}])
+@pytest.mark.parametrize('encoding', [False, 'utf-8'])
+@pytest.mark.parametrize('rows', [
+    [['spam', 'eggs'], ('1', '2.5'), [1, 2.5, None, True], [], [''], [None], ('',)],
+    [['spam', 'eggs, eggs'], ['spam\r\n', '"eggs"'], ['späm', 'spam\\eggs']],
+    [['', ''], [' spam ', 'eggs ']]])
+def test_writer_fast(rows, encoding, fmtparams, block_rows=2):
+    def write(fast):
+        with (io.StringIO(newline='') if encoding is False else io.BytesIO()) as f:
+            w = writer(f, encoding=encoding, fast=fast, **fmtparams)
+            if fast:
+                assert isinstance(w, QuoteFreeWriter)
+                w._block_rows = block_rows
+                assert w.dialect is w._writer.dialect
+            try:
+                w.writerow(rows[0])
+                w.writerows(itertools.chain(rows[1:], [map(str, range(3))]))
+            except csv.Error as e:  # QUOTE_NONE
+                return repr(e)
+            return f.getvalue()
+
+    assert write(fast=True) == write(fast=False)
+
+
+@pytest.csv23.py3only
+@pytest.mark.parametrize('fieldnames', [['spam', 'eggs', 'ham'], ['eggs'], []])
+@pytest.mark.parametrize('encoding', [False, 'utf-8'])
+@pytest.mark.parametrize('fast', [False, True])
+def test_dict_writer_writerows(mocker, fieldnames, encoding, fast):
+    mocker.patch.object(writers, 'BLOCK_ROWS', 2)
+    rows = [{'spam': 'sp\xe4m', 'eggs': 1, 'ham': None},
+            {'eggs': 'eggs, eggs'},
+            {'spam': '', 'eggs': '"', 'ham': 2.5}] * 2
+    rows.append(collections.defaultdict(lambda: 'missing', eggs='defaultdict'))
+    rows.append(collections.OrderedDict([('spam', 'ordered')]))
+
+    def write(cls, **kwargs):
+        with (io.StringIO(newline='') if encoding is False else io.BytesIO()) as f:
+            target = f if encoding is False else io.TextIOWrapper(f, 'utf-8', newline='')
+            w = cls(target if cls is csv.DictWriter else f, fieldnames, restval='-',
+                    extrasaction='ignore', **kwargs)
+            w.writeheader()
+            w.writerows(rows)
+            w.writerows([])
+            if target is not f:
+                target.detach()
+            return f.getvalue()
+
+    assert write(DictWriter, encoding=encoding, fast=fast) == write(csv.DictWriter)
+    assert dict(rows[-2]) == {'eggs': 'defaultdict'}
+
+
+@pytest.csv23.py3only
+@pytest.mark.parametrize('check_extras, raises', [(1, True), (3, False), (2, True),
+                                                  (None, False), (0, False)])
+def test_dict_writer_writerows_check_extras(check_extras, raises):
+    rows = [{'spam': '1'}, {'spam': '2'}, {'spam': '3', 'eggs': '3'}]
+
+    with io.StringIO(newline='') as f:
+        w = DictWriter(f, ['spam'], check_extras=check_extras)
+        if raises:
+            with pytest.raises(ValueError, match=r"fields not in fieldnames: 'eggs'"):
+                w.writerows(rows)
+            assert f.getvalue() == ''
+        else:
+            w.writerows(rows)
+            assert f.getvalue() == '1\r\n2\r\n3\r\n'
+
+
+@pytest.mark.parametrize('check_extras', [-1, '1', 1.0])
+def test_dict_writer_check_extras_invalid(check_extras):
+    with pytest.raises(ValueError, match=r'check_extras'):
+        DictWriter(io.StringIO(), ['spam'], check_extras=check_extras)
+
+
+@pytest.csv23.py3only
+def test_bytes_writer_writerows(mocker):
+    mocker.patch.object(writers, 'BLOCK_ROWS', 2)
+    with io.BytesIO() as f:
+        w = writer(f, encoding='latin-1')
+        w.writerows([['sp\xe4m', 1]] * 5)
+        assert f.getvalue() == b'sp\xe4m,1\r\n' * 5